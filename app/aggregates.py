@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Integer, cast, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from .models import Aircraft, Client, FlightLog, FlightSupply, MonthlyRollup, Supply
+from .repository import flight_filters
+
+
+IVA_RATE = Decimal("0.16")
+CENT = Decimal("0.01")
+
+# Money is summed in SQL as integer cents and turned into Decimal afterwards, so totals never
+# go through float accumulation. quantity and unit_cost have two decimals, so their integer
+# hundredths are exact; each line is rounded half-up to the cent, like the printed rows.
+_qty_hundredths = cast(func.round(FlightSupply.quantity * 100), Integer)
+_cost_hundredths = cast(func.round(FlightSupply.unit_cost * 100), Integer)
+line_cents = (_qty_hundredths * _cost_hundredths + 50) // 100
+_viaticos_cents = cast(func.round(FlightSupply.viaticos * 100), Integer)
+# IMPORTE of a supply line in the consumibles PDF: subtotal plus viáticos
+importe_cents = line_cents + func.coalesce(_viaticos_cents, 0)
+
+
+def cents_to_decimal(cents: Optional[int]) -> Decimal:
+    return (Decimal(int(cents or 0)) / 100).quantize(CENT)
+
+
+def money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+# Whole months inside a range are read from monthly_rollups (a few rows per month); only the
+# leftover days at either end go to flight_logs.
+MonthSpan = Tuple[int, int]  # first and last month index (year * 12 + month - 1), inclusive
+
+
+def _month_index(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def _month_start(index: int) -> date:
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def split_months(start: date, end: date) -> Tuple[Optional[MonthSpan], List[Tuple[date, date]]]:
+    """Split the inclusive range [start, end] into whole months and the partial-month day ranges around them."""
+    first = _month_index(start) + (start.day != 1)
+    last = _month_index(end + timedelta(days=1)) - 1  # last month whose final day is <= end
+    if first > last:
+        return None, [(start, end)] if start <= end else []
+    edges = []
+    if start < _month_start(first):
+        edges.append((start, _month_start(first) - timedelta(days=1)))
+    if _month_start(last + 1) <= end:
+        edges.append((_month_start(last + 1), end))
+    return (first, last), edges
+
+
+def _rollup_filters(months: MonthSpan, aircraft_id: int | None, client_id: int | None) -> list:
+    (y0, m0), (y1, m1) = (divmod(i, 12) for i in months)
+    # row-value range so SQLite walks the (year, month, ...) primary key
+    conds = [tuple_(MonthlyRollup.year, MonthlyRollup.month).between(tuple_(y0, m0 + 1), tuple_(y1, m1 + 1))]
+    if aircraft_id is not None:
+        conds.append(MonthlyRollup.aircraft_id == aircraft_id)
+    if client_id is not None:
+        conds.append(MonthlyRollup.client_id == client_id)
+    return conds
+
+
+class FlightTotals(NamedTuple):
+    flights: int
+    minutes: int
+    landings: int
+
+
+class SupplyTotals(NamedTuple):
+    subtotal: Decimal
+    viaticos: Decimal
+
+    @property
+    def importe(self) -> Decimal:
+        return self.subtotal + self.viaticos
+
+    @property
+    def iva(self) -> Decimal:
+        return (self.importe * IVA_RATE).quantize(CENT, rounding=ROUND_HALF_UP)
+
+    @property
+    def total(self) -> Decimal:
+        return self.importe + self.iva
+
+
+class BreakdownRow(NamedTuple):
+    key: Optional[int]
+    label: str
+    flights: int
+    minutes: int
+    landings: int
+    subtotal: Decimal
+    viaticos: Decimal
+
+
+class SupplyBreakdownRow(NamedTuple):
+    supply_id: int
+    label: str
+    quantity: Decimal
+    subtotal: Decimal
+    viaticos: Decimal
+
+
+def flight_totals(
+    session: Session, start: date, end: date, aircraft_id: int | None = None, client_id: int | None = None
+) -> FlightTotals:
+    months, edges = split_months(start, end)
+    parts = [
+        session.execute(
+            select(func.count(FlightLog.id), func.sum(FlightLog.flight_minutes), func.sum(FlightLog.landings))
+            .where(*flight_filters(a, b, aircraft_id, client_id))
+        ).one()
+        for a, b in edges
+    ]
+    if months:
+        parts.append(session.execute(
+            select(func.sum(MonthlyRollup.flights), func.sum(MonthlyRollup.minutes), func.sum(MonthlyRollup.landings))
+            .where(*_rollup_filters(months, aircraft_id, client_id))
+        ).one())
+    n, minutes, landings = (sum(int(p[i] or 0) for p in parts) for i in range(3))
+    return FlightTotals(n, minutes, landings)
+
+
+def supply_totals(
+    session: Session, start: date, end: date, aircraft_id: int | None = None, client_id: int | None = None
+) -> SupplyTotals:
+    months, edges = split_months(start, end)
+    parts = [
+        session.execute(
+            select(func.sum(line_cents), func.sum(_viaticos_cents))
+            .join(FlightLog, FlightSupply.flight_id == FlightLog.id)
+            .where(*flight_filters(a, b, aircraft_id, client_id))
+        ).one()
+        for a, b in edges
+    ]
+    if months:
+        parts.append(session.execute(
+            select(func.sum(MonthlyRollup.subtotal_cents), func.sum(MonthlyRollup.viaticos_cents))
+            .where(*_rollup_filters(months, aircraft_id, client_id))
+        ).one())
+    sub, via = (sum(int(p[i] or 0) for p in parts) for i in range(2))
+    return SupplyTotals(cents_to_decimal(sub), cents_to_decimal(via))
+
+
+def _supplies_per_flight(conds: list):
+    return (
+        select(
+            FlightSupply.flight_id.label("flight_id"),
+            func.sum(line_cents).label("sub_cents"),
+            func.sum(_viaticos_cents).label("via_cents"),
+        )
+        .where(FlightSupply.flight_id.in_(select(FlightLog.id).where(*conds)))
+        .group_by(FlightSupply.flight_id)
+        .subquery()
+    )
+
+
+def breakdown(
+    session: Session,
+    by: str,
+    start: date,
+    end: date,
+    aircraft_id: int | None = None,
+    client_id: int | None = None,
+) -> List[BreakdownRow]:
+    """Flights, minutes, landings and supply money grouped by "aircraft" or "client"."""
+    if by == "aircraft":
+        key, rkey, label, target = FlightLog.aircraft_id, MonthlyRollup.aircraft_id, Aircraft.registration, Aircraft
+    elif by == "client":
+        key, rkey, label, target = FlightLog.client_id, MonthlyRollup.client_id, Client.name, Client
+    else:
+        raise ValueError(f"Agrupación no soportada: {by}")
+    months, edges = split_months(start, end)
+    rows = []
+    for a, b in edges:
+        conds = flight_filters(a, b, aircraft_id, client_id)
+        sup = _supplies_per_flight(conds)
+        rows.extend(session.execute(
+            select(
+                key,
+                func.coalesce(label, ""),
+                func.count(FlightLog.id),
+                func.sum(FlightLog.flight_minutes),
+                func.sum(FlightLog.landings),
+                func.sum(sup.c.sub_cents),
+                func.sum(sup.c.via_cents),
+            )
+            .select_from(FlightLog)
+            .outerjoin(target, key == target.id)
+            .outerjoin(sup, sup.c.flight_id == FlightLog.id)
+            .where(*conds)
+            .group_by(key)
+        ))
+    if months:
+        rows.extend(session.execute(
+            select(
+                func.nullif(rkey, 0),  # rollups store "no client" as 0
+                func.coalesce(label, ""),
+                func.sum(MonthlyRollup.flights),
+                func.sum(MonthlyRollup.minutes),
+                func.sum(MonthlyRollup.landings),
+                func.sum(MonthlyRollup.subtotal_cents),
+                func.sum(MonthlyRollup.viaticos_cents),
+            )
+            .select_from(MonthlyRollup)
+            .outerjoin(target, rkey == target.id)
+            .where(*_rollup_filters(months, aircraft_id, client_id))
+            .group_by(rkey)
+        ))
+    merged: Dict[Optional[int], list] = {}
+    for k, lbl, *values in rows:
+        acc = merged.setdefault(k, [lbl, 0, 0, 0, 0, 0])
+        for i, v in enumerate(values, 1):
+            acc[i] += int(v or 0)
+    return [
+        BreakdownRow(k, lbl, n, m, l, cents_to_decimal(sc), cents_to_decimal(vc))
+        for k, (lbl, n, m, l, sc, vc) in sorted(merged.items(), key=lambda kv: kv[1][0])
+    ]
+
+
+def supply_breakdown(
+    session: Session, start: date, end: date, aircraft_id: int | None = None, client_id: int | None = None
+) -> List[SupplyBreakdownRow]:
+    stmt = (
+        select(
+            Supply.id,
+            Supply.name,
+            func.coalesce(func.sum(FlightSupply.quantity), 0),
+            func.sum(line_cents),
+            func.sum(_viaticos_cents),
+        )
+        .select_from(FlightSupply)
+        .join(FlightLog, FlightSupply.flight_id == FlightLog.id)
+        .join(Supply, FlightSupply.supply_id == Supply.id)
+        .where(*flight_filters(start, end, aircraft_id, client_id))
+        .group_by(Supply.id)
+        .order_by(Supply.name)
+    )
+    return [
+        SupplyBreakdownRow(sid, name, money(qty), cents_to_decimal(sc), cents_to_decimal(vc))
+        for sid, name, qty, sc, vc in session.execute(stmt)
+    ]
+
+
+class MonthTotals(NamedTuple):
+    year: int
+    month: int
+    flights: int
+    minutes: int
+    landings: int
+    subtotal: Decimal
+    viaticos: Decimal
+
+    @property
+    def importe(self) -> Decimal:
+        return self.subtotal + self.viaticos
+
+
+def monthly_trend(
+    session: Session, start: date, end: date, aircraft_id: int | None = None, client_id: int | None = None
+) -> List[MonthTotals]:
+    """Totals per calendar month for every month touching [start, end], straight from monthly_rollups.
+
+    Months are always whole: a range starting on the 15th still reports that month complete.
+    """
+    stmt = (
+        select(
+            MonthlyRollup.year,
+            MonthlyRollup.month,
+            func.sum(MonthlyRollup.flights),
+            func.sum(MonthlyRollup.minutes),
+            func.sum(MonthlyRollup.landings),
+            func.sum(MonthlyRollup.subtotal_cents),
+            func.sum(MonthlyRollup.viaticos_cents),
+        )
+        .where(*_rollup_filters((_month_index(start), _month_index(end)), aircraft_id, client_id))
+        .group_by(MonthlyRollup.year, MonthlyRollup.month)
+        .order_by(MonthlyRollup.year, MonthlyRollup.month)
+    )
+    return [
+        MonthTotals(y, m, int(n), int(mins), int(l), cents_to_decimal(sc), cents_to_decimal(vc))
+        for y, m, n, mins, l, sc, vc in session.execute(stmt)
+    ]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import REPORTS_DIR
+from .db import get_session
+from .report_cache import evict_reports, fetch_report, month_report_params, month_stamps, report_key, store_report
+from .reporting import ProgressFn, generate_bitacora_pre_post_pdf, generate_consumibles_servicios_pdf
+from .repository import FlightRow, month_flight_groups
+
+
+KINDS = ("pre_post", "consumibles")  # report_cache kinds of the two files _render_group writes, in order
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", text).strip("_") or "SIN_CLIENTE"
+
+
+def _render_group(flights: List[FlightRow], month: int, year: int, client_name: str, matricula: str, out_dir: Path) -> dict:
+    # Runs in a worker process; rows are plain tuples so pickling them is cheap
+    t0 = time.perf_counter()
+    files = [
+        generate_bitacora_pre_post_pdf(flights, month, year, client_name, matricula, out_dir=out_dir),
+        generate_consumibles_servicios_pdf(flights, month, year, client_name, matricula, out_dir=out_dir),
+    ]
+    return {
+        "matricula": matricula,
+        "cliente": client_name,
+        "vuelos": len(flights),
+        "archivos": [str(p) for p in files],
+        "segundos": round(time.perf_counter() - t0, 4),
+    }
+
+
+def run_month_batch(
+    year: int,
+    month: int,
+    workers: Optional[int] = None,
+    out_dir: Optional[Path] = None,
+    progress: Optional[ProgressFn] = None,
+    use_cache: bool = True,
+) -> Path:
+    """Render PRE/POST and consumibles PDFs for every (aircraft, client) pair flown in the month.
+
+    Pairs whose data hasn't changed since both PDFs were last rendered are copied from the report
+    cache instead (use_cache=False renders them all). Returns the path of the JSON manifest written next to the PDFs.
+    """
+    started = datetime.now()
+    t0 = time.perf_counter()
+    out_dir = out_dir or REPORTS_DIR / f"lote_{year}_{month:02d}"
+    with get_session() as s:
+        stamps = month_stamps(s, year, month)
+        groups = month_flight_groups(s, year, month, with_supplies=True)
+    query_secs = time.perf_counter() - t0
+
+    tasks = []
+    keys: Dict[int, List[str]] = {}  # task index -> cache keys of its files
+    cached: List[dict] = []
+    for (aircraft_id, client_id), group in groups.items():
+        first = group[0]
+        matricula = first.registration or str(first.aircraft_id)
+        client_name = first.client_name
+        task = (group, month, year, client_name, matricula, out_dir / _slug(client_name))
+        params = month_report_params(month, year, client_name, matricula)
+        group_keys = [report_key(kind, params, stamps.for_group(aircraft_id, client_id)) for kind in KINDS]
+        files = [fetch_report(key, task[5]) for key in group_keys] if use_cache else [None]
+        if all(files):
+            cached.append({"matricula": matricula, "cliente": client_name, "vuelos": len(group),
+                           "archivos": [str(p) for p in files], "segundos": 0.0, "cache": True})
+            continue
+        keys[len(tasks)] = group_keys
+        tasks.append(task)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    results: List[dict] = []
+    errors: List[dict] = []
+
+    def rendered(i: int, result: dict) -> None:
+        results.append(result)
+        for key, file in zip(keys[i], result["archivos"]):
+            store_report(key, Path(file), evict=False)
+
+    if progress:
+        progress(0, len(tasks))
+    if workers == 1:
+        for i, task in enumerate(tasks):
+            try:
+                rendered(i, _render_group(*task))
+            except Exception as exc:
+                errors.append({"matricula": task[4], "cliente": task[3], "error": str(exc)})
+            if progress:
+                progress(len(results) + len(errors), len(tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_render_group, *task): i for i, task in enumerate(tasks)}
+            try:
+                for fut in as_completed(futures):
+                    i = futures[fut]
+                    task = tasks[i]
+                    try:
+                        rendered(i, fut.result())
+                    except Exception as exc:
+                        errors.append({"matricula": task[4], "cliente": task[3], "error": str(exc)})
+                    if progress:
+                        progress(len(results) + len(errors), len(tasks))
+            except BaseException:
+                # Cancelled through the progress callback: drop what hasn't started yet
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    if results:
+        evict_reports()
+    results += cached
+    results.sort(key=lambda r: (r["matricula"], r["cliente"]))
+    manifest = {
+        "anio": year,
+        "mes": month,
+        "inicio": started.isoformat(timespec="seconds"),
+        "procesos": workers,
+        "vuelos": sum(len(group) for group in groups.values()),
+        "grupos": len(tasks) + len(cached),
+        "desde_cache": len(cached),
+        "segundos_consulta": round(query_secs, 4),
+        "segundos_total": round(time.perf_counter() - t0, 4),
+        "reportes": results,
+        "errores": errors,
+    }
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / "manifiesto.json"
+    path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
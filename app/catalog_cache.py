@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from .db import get_session
+from .models import Aircraft, Client, Concept, Mechanic, ServiceType, Supply
+
+
+# kind -> (model, label attribute); items are kept sorted by (label, id) like the ORDER BY of the list_* helpers
+CATALOGS = {
+    "aircraft": (Aircraft, "registration"),
+    "clients": (Client, "name"),
+    "supplies": (Supply, "name"),
+    "mechanics": (Mechanic, "name"),
+    "service_types": (ServiceType, "name"),
+    "concepts": (Concept, "name"),
+}
+
+Item = Tuple[int, str]  # (id, label)
+Change = Tuple[str, int, Optional[str]]  # (op, id, label); op is insert/update/delete
+Listener = Callable[[str, Optional[List[Change]]], None]  # changes=None means "reload everything"
+
+_PENDING_KEY = "catalog_changes"
+
+
+def _sort_key(item: Item) -> tuple:
+    return (item[1], item[0])
+
+
+class CatalogCache:
+    """Per-kind (id, label) lists for the combo boxes, patched from committed ORM changes."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._items: Dict[str, List[Item]] = {}
+        self._labels: Dict[str, Dict[int, str]] = {}
+        self._listeners: List[Listener] = []
+
+    def subscribe(self, fn: Listener) -> None:
+        self._listeners.append(fn)
+
+    def items(self, kind: str) -> List[Item]:
+        with self._lock:
+            if kind not in self._items:
+                self._load(kind)
+            return list(self._items[kind])
+
+    def position(self, kind: str, item_id: int) -> Optional[int]:
+        with self._lock:
+            if kind not in self._items:
+                self._load(kind)
+            label = self._labels[kind].get(item_id)
+            if label is None:
+                return None
+            return bisect_left(self._items[kind], _sort_key((item_id, label)), key=_sort_key)
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        # For writes that bypass the ORM (bulk Core inserts, raw SQL)
+        kinds = list(CATALOGS) if kind is None else [kind]
+        with self._lock:
+            for k in kinds:
+                self._items.pop(k, None)
+                self._labels.pop(k, None)
+        for k in kinds:
+            self._notify(k, None)
+
+    def apply(self, changes: List[Tuple[str, str, int, Optional[str]]]) -> None:
+        by_kind: Dict[str, List[Change]] = {}
+        for kind, op, item_id, label in changes:
+            by_kind.setdefault(kind, []).append((op, item_id, label))
+        with self._lock:
+            for kind, ops in by_kind.items():
+                if kind in self._items:
+                    self._patch(kind, ops)
+        for kind, ops in by_kind.items():
+            self._notify(kind, ops)
+
+    def _load(self, kind: str) -> None:
+        model, attr = CATALOGS[kind]
+        label_col = getattr(model, attr)
+        with get_session() as s:
+            rows = [(r[0], r[1]) for r in s.execute(select(model.id, label_col).order_by(label_col, model.id))]
+        self._items[kind] = rows
+        self._labels[kind] = dict(rows)
+
+    def _patch(self, kind: str, ops: List[Change]) -> None:
+        items, labels = self._items[kind], self._labels[kind]
+        for op, item_id, label in ops:
+            old = labels.pop(item_id, None)
+            if old is not None:
+                i = bisect_left(items, _sort_key((item_id, old)), key=_sort_key)
+                if i < len(items) and items[i][0] == item_id:
+                    del items[i]
+            if op != "delete" and label is not None:
+                item = (item_id, label)
+                items.insert(bisect_left(items, _sort_key(item), key=_sort_key), item)
+                labels[item_id] = label
+
+    def _notify(self, kind: str, changes: Optional[List[Change]]) -> None:
+        for fn in list(self._listeners):
+            fn(kind, changes)
+
+
+catalog_cache = CatalogCache()
+
+
+# ORM events: collect catalog writes per session and publish them only once the transaction commits
+def _recorder(kind: str, op: str):
+    attr = CATALOGS[kind][1]
+
+    def listener(mapper, connection, target):
+        session = object_session(target)
+        if session is None:
+            return
+        label = None if op == "delete" else getattr(target, attr)
+        session.info.setdefault(_PENDING_KEY, []).append((kind, op, target.id, label))
+
+    return listener
+
+
+for _kind, (_model, _attr) in CATALOGS.items():
+    for _op in ("insert", "update", "delete"):
+        event.listen(_model, f"after_{_op}", _recorder(_kind, _op))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_catalog_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        catalog_cache.apply(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
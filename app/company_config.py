@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, asdict
+import threading
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from .config import DATA_DIR
 
@@ -22,14 +23,33 @@ class CompanyConfig:
     logo_path: str = ""  # Absolute or relative path to an image file
 
 
-def load_company_config() -> CompanyConfig:
+# (file mtime, parsed config) from the last read; report generators call load_company_config()
+# for every PDF, so the file is only parsed again after it changes or is saved from here
+_cache: Optional[Tuple[Optional[int], CompanyConfig]] = None
+_lock = threading.Lock()
+
+
+def _mtime() -> Optional[int]:
     try:
-        if CONFIG_PATH.exists():
-            data = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-            return CompanyConfig(**data)
-    except Exception:
-        pass
-    return CompanyConfig()
+        return CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_company_config() -> CompanyConfig:
+    global _cache
+    mtime = _mtime()
+    with _lock:
+        if _cache is None or _cache[0] != mtime:
+            cfg = CompanyConfig()
+            try:
+                if mtime is not None:
+                    cfg = CompanyConfig(**json.loads(CONFIG_PATH.read_text(encoding="utf-8")))
+            except Exception:
+                pass
+            _cache = (mtime, cfg)
+        # A copy: the settings form edits the object it gets before saving it
+        return replace(_cache[1])
 
 
 def save_company_config(cfg: CompanyConfig) -> None:
@@ -38,3 +58,12 @@ def save_company_config(cfg: CompanyConfig) -> None:
         CONFIG_PATH.write_text(json.dumps(asdict(cfg), ensure_ascii=False, indent=2), encoding="utf-8")
     except Exception as exc:
         raise RuntimeError(f"Error guardando configuración: {exc}")
+    finally:
+        # Don't rely on the mtime alone: coarse filesystem clocks can leave it unchanged
+        invalidate_company_config()
+
+
+def invalidate_company_config() -> None:
+    global _cache
+    with _lock:
+        _cache = None
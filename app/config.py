@@ -10,9 +10,22 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 REPORTS_DIR = BASE_DIR / "reports"
 
-# Ensure directories exist
-DATA_DIR.mkdir(parents=True, exist_ok=True)
-REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+# Nothing is created at import (the install folder may be read-only); each writer makes its
+# folder on first use: init_db the database's, the PDF generators REPORTS_DIR, and so on
 
-DB_PATH = DATA_DIR / "bitacoras.db"
+# BITACORAS_DB points the application at another database file (copies, benchmarks)
+DB_PATH = Path(os.environ.get("BITACORAS_DB", DATA_DIR / "bitacoras.db"))
 DATABASE_URL = f"sqlite:///{DB_PATH.as_posix()}"
+
+# Rotating slow-query log (created on first use) and its threshold in milliseconds
+LOG_DIR = DATA_DIR / "logs"
+SLOW_QUERY_MS = float(os.environ.get("BITACORAS_SLOW_QUERY_MS", "250"))
+
+# SQLite connection profile applied on every connection (see app.db.SQLITE_PROFILES)
+SQLITE_PROFILE = os.environ.get("BITACORAS_SQLITE_PROFILE", "desktop")
+
+# Finished PDFs keyed on report, parameters, data stamps and company header (app/report_cache.py);
+# entries unused for REPORT_CACHE_DAYS are dropped, then the oldest until it fits in REPORT_CACHE_MB
+REPORT_CACHE_DIR = REPORTS_DIR / ".cache"
+REPORT_CACHE_MB = float(os.environ.get("BITACORAS_REPORT_CACHE_MB", "200"))
+REPORT_CACHE_DAYS = float(os.environ.get("BITACORAS_REPORT_CACHE_DAYS", "90"))
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import csv
+import time as _time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Sequence
+
+from sqlalchemy import Engine, Time, func, select
+
+from .aggregates import cents_to_decimal, importe_cents
+from .db import engine as default_engine
+from .models import Aircraft, Client, Concept, FlightLog, FlightSupply, Mechanic, ServiceType, Supply
+from .repository import flight_filters
+
+ProgressFn = Callable[[int, int], None]
+
+YIELD_PER = 2_000
+
+
+class ExportColumn(NamedTuple):
+    header: str
+    expr: object
+    supply: bool = False  # needs the flight_supplies join
+    convert: Optional[Callable] = None
+
+
+# key -> column. Every supply line repeats its flight's columns so each row stands alone when
+# filtered; the importer would read those repeats as new flights, so exports don't re-import as is
+COLUMNS: Dict[str, ExportColumn] = {
+    "id": ExportColumn("ID vuelo", FlightLog.id),
+    "fecha": ExportColumn("Fecha", FlightLog.flight_date),
+    "matricula": ExportColumn("Matrícula", func.coalesce(Aircraft.registration, "")),
+    "cliente": ExportColumn("Cliente", func.coalesce(Client.name, "")),
+    "piloto": ExportColumn("Piloto", FlightLog.pilot),
+    "copiloto": ExportColumn("Copiloto", FlightLog.copilot),
+    "origen": ExportColumn("Origen", FlightLog.origin),
+    "destino": ExportColumn("Destino", FlightLog.destination),
+    "minutos": ExportColumn("Minutos", FlightLog.flight_minutes),
+    "aterrizajes": ExportColumn("Aterrizajes", FlightLog.landings),
+    "tipo_servicio": ExportColumn(
+        "Tipo de servicio", func.coalesce(func.nullif(FlightLog.service_type, ""), ServiceType.name, "")
+    ),
+    "hora_servicio": ExportColumn("Hora de servicio", FlightLog.service_time),
+    "mecanico": ExportColumn("Mecánico", func.coalesce(Mechanic.name, "")),
+    "concepto": ExportColumn("Concepto", func.coalesce(Concept.name, "")),
+    "notas": ExportColumn("Observaciones", FlightLog.notes),
+    "insumo": ExportColumn("Insumo", Supply.name, supply=True),
+    "cantidad": ExportColumn("Cantidad", FlightSupply.quantity, supply=True),
+    "costo_unitario": ExportColumn("Costo unitario", FlightSupply.unit_cost, supply=True),
+    "viaticos": ExportColumn("Viáticos", FlightSupply.viaticos, supply=True),
+    "importe": ExportColumn(
+        "Importe", importe_cents, supply=True, convert=lambda v: None if v is None else cents_to_decimal(v)
+    ),
+}
+DEFAULT_COLUMNS = [k for k in COLUMNS if k != "copiloto"]
+
+
+class ExportResult(NamedTuple):
+    path: Path
+    rows: int
+    seconds: float
+
+
+def export_statement(
+    columns: Sequence[str], start: date, end: date, aircraft_id: int | None = None, client_id: int | None = None
+):
+    """One row per supply line (or per flight without supplies) in date order, only the requested joins."""
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Columnas desconocidas: {', '.join(unknown)}")
+    cols = [COLUMNS[c] for c in columns]
+    stmt = select(*[c.expr for c in cols]).select_from(FlightLog)
+    needed = set(columns)
+    if "matricula" in needed:
+        stmt = stmt.outerjoin(Aircraft, FlightLog.aircraft_id == Aircraft.id)
+    if "cliente" in needed:
+        stmt = stmt.outerjoin(Client, FlightLog.client_id == Client.id)
+    if "tipo_servicio" in needed:
+        stmt = stmt.outerjoin(ServiceType, FlightLog.service_type_id == ServiceType.id)
+    if "mecanico" in needed:
+        stmt = stmt.outerjoin(Mechanic, FlightLog.mechanic_id == Mechanic.id)
+    if "concepto" in needed:
+        stmt = stmt.outerjoin(Concept, FlightLog.concept_id == Concept.id)
+    order = [FlightLog.flight_date, FlightLog.id]
+    if any(c.supply for c in cols):
+        stmt = stmt.outerjoin(FlightSupply, FlightSupply.flight_id == FlightLog.id)
+        stmt = stmt.outerjoin(Supply, FlightSupply.supply_id == Supply.id)
+        order.append(FlightSupply.id)
+    return stmt.where(*flight_filters(start, end, aircraft_id, client_id)).order_by(*order)
+
+
+def _count(conn, columns: Sequence[str], start, end, aircraft_id, client_id) -> int:
+    conds = flight_filters(start, end, aircraft_id, client_id)
+    if any(COLUMNS[c].supply for c in columns):
+        # flights without supplies still produce one (empty) line
+        per_flight = func.max(func.count(FlightSupply.id), 1)
+        sub = (
+            select(per_flight.label("n"))
+            .select_from(FlightLog)
+            .outerjoin(FlightSupply, FlightSupply.flight_id == FlightLog.id)
+            .where(*conds)
+            .group_by(FlightLog.id)
+            .subquery()
+        )
+        return conn.execute(select(func.coalesce(func.sum(sub.c.n), 0))).scalar_one()
+    return conn.execute(select(func.count(FlightLog.id)).where(*conds)).scalar_one()
+
+
+class _CsvWriter:
+    def __init__(self, path: Path, columns: Sequence[str]):
+        # utf-8-sig so Excel opens accents correctly
+        self._fh = path.open("w", encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._fh)
+        # csv already writes None as "" and dates as ISO; only times need trimming to HH:MM
+        self._time_cols = [i for i, c in enumerate(columns) if isinstance(COLUMNS[c].expr.type, Time)]
+
+    def header(self, names: Sequence[str]) -> None:
+        self._writer.writerow(names)
+
+    def write(self, rows: Iterable[Sequence]) -> None:
+        if self._time_cols:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for i in self._time_cols:
+                    if row[i] is not None:
+                        row[i] = row[i].strftime("%H:%M")
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def abort(self) -> None:
+        self._fh.close()
+
+
+class _XlsxWriter:
+    def __init__(self, path: Path, columns: Sequence[str]):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise RuntimeError("Para exportar a .xlsx instale openpyxl (pip install openpyxl)") from None
+        self._path = path
+        # write-only mode streams rows to a temp file instead of keeping cells in memory
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet("Vuelos")
+
+    def header(self, names: Sequence[str]) -> None:
+        self._ws.append(list(names))
+
+    def write(self, rows: Iterable[Sequence]) -> None:
+        append = self._ws.append
+        for row in rows:
+            append(row)
+
+    def close(self) -> None:
+        self._wb.save(self._path)
+
+    def abort(self) -> None:
+        pass
+
+
+def export_flights(
+    path: Path,
+    start: date,
+    end: date,
+    columns: Optional[Sequence[str]] = None,
+    aircraft_id: int | None = None,
+    client_id: int | None = None,
+    bind: Engine | None = None,
+    progress: Optional[ProgressFn] = None,
+) -> ExportResult:
+    """Stream flights (one line per supply) in [start, end] to a .csv or .xlsx file.
+
+    Rows are fetched YIELD_PER at a time from a streaming cursor and written straight out,
+    so memory stays flat regardless of the date range.
+    """
+    path = Path(path)
+    columns = list(columns or DEFAULT_COLUMNS)
+    suffix = path.suffix.lower()
+    if suffix not in (".csv", ".xlsx"):
+        raise ValueError(f"Formato no soportado: {path.suffix}")
+    t0 = _time.perf_counter()
+    stmt = export_statement(columns, start, end, aircraft_id, client_id)
+    converters = [(i, COLUMNS[c].convert) for i, c in enumerate(columns) if COLUMNS[c].convert]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer = (_XlsxWriter if suffix == ".xlsx" else _CsvWriter)(path, columns)
+    done = 0
+    try:
+        writer.header([COLUMNS[c].header for c in columns])
+        with (bind or default_engine).connect() as conn:
+            total = _count(conn, columns, start, end, aircraft_id, client_id) if progress else 0
+            if progress:
+                progress(0, total)
+            result = conn.execution_options(stream_results=True, yield_per=YIELD_PER).execute(stmt)
+            for chunk in result.partitions():
+                if converters:
+                    chunk = [list(row) for row in chunk]
+                    for row in chunk:
+                        for i, fn in converters:
+                            row[i] = fn(row[i])
+                writer.write(chunk)
+                done += len(chunk)
+                if progress:
+                    progress(done, max(total, done))
+    except BaseException:
+        # Cancelled or failed: don't leave a truncated file behind
+        writer.abort()
+        path.unlink(missing_ok=True)
+        raise
+    writer.close()
+    return ExportResult(path, done, round(_time.perf_counter() - t0, 3))
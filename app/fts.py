@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import re
+
+# Full-text index over flights: one FTS5 row per flight_logs row (rowid = flight id) holding the
+# flight's own text plus the names of the catalogs it points to. Triggers keep it in sync with
+# flight_logs and re-index affected flights when a catalog name changes.
+FTS_TABLE = "flight_search"
+FTS_COLUMNS = ("notes", "origin", "destination", "pilot", "registration", "client", "mechanic", "concept", "service_type")
+# bm25 weights, same order as FTS_COLUMNS: names and registrations rank above free text
+FTS_WEIGHTS = (1.0, 2.0, 2.0, 3.0, 5.0, 3.0, 2.0, 1.5, 1.5)
+
+_SELECT_DOCS = """
+SELECT f.id, f.notes, f.origin, f.destination, f.pilot,
+       (SELECT registration FROM aircraft WHERE id = f.aircraft_id),
+       (SELECT name FROM clients WHERE id = f.client_id),
+       (SELECT name FROM mechanics WHERE id = f.mechanic_id),
+       (SELECT name FROM concepts WHERE id = f.concept_id),
+       coalesce(nullif(f.service_type, ''), (SELECT name FROM service_types WHERE id = f.service_type_id))
+FROM flight_logs f
+"""
+
+_INSERT_DOCS = f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)})" + _SELECT_DOCS
+
+# catalog table, label column, flight_logs FK, FTS column, extra condition on the flight
+_CATALOG_TRIGGERS = (
+    ("aircraft", "registration", "aircraft_id", "registration", ""),
+    ("clients", "name", "client_id", "client", ""),
+    ("mechanics", "name", "mechanic_id", "mechanic", ""),
+    ("concepts", "name", "concept_id", "concept", ""),
+    # the legacy service_type text on the flight wins over the catalog name (see _SELECT_DOCS)
+    ("service_types", "name", "service_type_id", "service_type", " AND coalesce(service_type, '') = ''"),
+)
+
+FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{', '.join(FTS_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_flight_search_ai AFTER INSERT ON flight_logs BEGIN
+        {_INSERT_DOCS} WHERE f.id = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_flight_search_au AFTER UPDATE ON flight_logs BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        {_INSERT_DOCS} WHERE f.id = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_flight_search_ad AFTER DELETE ON flight_logs BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+] + [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_flight_search_{table}_au AFTER UPDATE OF {label} ON {table}
+    WHEN old.{label} IS NOT new.{label} BEGIN
+        UPDATE {FTS_TABLE} SET {column} = new.{label}
+        WHERE rowid IN (SELECT id FROM flight_logs WHERE {fk} = new.id{extra});
+    END"""
+    for table, label, fk, column, extra in _CATALOG_TRIGGERS
+]
+
+
+def ensure_search_index(conn) -> bool:
+    """Create the FTS table and triggers if missing; backfill when the table is new.
+
+    Returns False when this SQLite build has no FTS5 (search then falls back to LIKE).
+    """
+    if not fts5_available(conn):
+        return False
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first()
+    for ddl in FTS_DDL:
+        conn.exec_driver_sql(ddl)
+    if not exists:
+        rebuild_search_index(conn)
+    return True
+
+
+def rebuild_search_index(conn) -> None:
+    conn.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+    conn.exec_driver_sql(_INSERT_DOCS)
+    conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+
+
+def fts5_available(conn) -> bool:
+    row = conn.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").first()
+    return bool(row and row[0])
+
+
+def match_query(text: str) -> str:
+    """Turn what the user typed into an FTS5 query: every word must match, as a prefix.
+
+    Words are quoted, so FTS syntax characters in the input are searched literally.
+    """
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{w}"*' for w in words)
@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import csv
+import re
+import time as _time
+import unicodedata
+from functools import lru_cache
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Engine, func, insert, select
+
+from .catalog_cache import CATALOGS, catalog_cache
+from .db import engine as default_engine
+from .models import FlightLog, FlightSupply, Supply
+
+ProgressFn = Callable[[int, int], None]
+
+BATCH_FLIGHTS = 5_000
+PROGRESS_EVERY = 1_000
+
+# Canonical field -> accepted spreadsheet headers (compared after _norm_header)
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "fecha": ("fecha", "date"),
+    "matricula": ("matricula", "aeronave", "registration"),
+    "cliente": ("cliente", "client"),
+    "piloto": ("piloto", "pilot"),
+    "copiloto": ("copiloto", "copilot"),
+    "origen": ("origen", "origin"),
+    "destino": ("destino", "destination"),
+    "minutos": ("minutos", "tiempo_de_vuelo", "minutes"),
+    "aterrizajes": ("aterrizajes", "landings"),
+    "tipo_servicio": ("tipo_servicio", "servicio", "tipo_de_servicio"),
+    "hora_servicio": ("hora_servicio", "hora_de_servicio", "hora"),
+    "mecanico": ("mecanico", "mechanic"),
+    "concepto": ("concepto", "concept"),
+    "notas": ("notas", "observaciones", "notes"),
+    "insumo": ("insumo", "supply"),
+    "cantidad": ("cantidad", "cant", "quantity"),
+    "costo_unitario": ("costo_unitario", "precio", "precio_unitario", "unit_cost"),
+    "viaticos": ("viaticos",),
+}
+REQUIRED = ("fecha", "matricula")
+
+# Catalog kind resolved for each name column
+_LOOKUP_COLUMNS = {
+    "matricula": "aircraft",
+    "cliente": "clients",
+    "mecanico": "mechanics",
+    "tipo_servicio": "service_types",
+    "concepto": "concepts",
+    "insumo": "supplies",
+}
+
+KIND_LABELS = {
+    "aircraft": "aeronaves",
+    "clients": "clientes",
+    "supplies": "insumos",
+    "mechanics": "mecánicos",
+    "service_types": "tipos de servicio",
+    "concepts": "conceptos",
+}
+
+
+class ImportFileError(Exception):
+    """The file can't be read at all (format, missing columns, missing openpyxl)."""
+
+
+class RowError(NamedTuple):
+    line: int
+    message: str
+
+
+class ImportResult(NamedTuple):
+    rows: int
+    flights: int
+    supplies: int
+    errors: List[RowError]
+    created: Dict[str, int]  # catalog kind -> names created on the fly
+    seconds: float
+
+
+def _norm_header(text) -> str:
+    text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+def _norm_name(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def _text(value) -> str:
+    # iter_rows already strips string cells
+    if value is None:
+        return ""
+    if type(value) is str:
+        return value
+    return str(value).strip()
+
+
+def _parse_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return _date_from_text(_text(value))
+
+
+# Spreadsheets repeat the same few hundred dates/times; strptime is the slowest step per row
+@lru_cache(maxsize=8192)
+def _date_from_text(text: str) -> date:
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    raise ValueError(f"fecha inválida: {text!r}")
+
+
+def _parse_time(value) -> Optional[time]:
+    if isinstance(value, datetime):
+        return value.time().replace(second=0, microsecond=0)
+    if isinstance(value, time):
+        return value
+    text = _text(value)
+    if not text:
+        return None
+    return _time_from_text(text)
+
+
+@lru_cache(maxsize=2048)
+def _time_from_text(text: str) -> time:
+    for fmt in ("%H:%M", "%H:%M:%S", "%I:%M %p"):
+        try:
+            return datetime.strptime(text.upper(), fmt).time()
+        except ValueError:
+            pass
+    raise ValueError(f"hora inválida: {text!r}")
+
+
+def _parse_decimal(value, field: str) -> Decimal:
+    if isinstance(value, (int, float, Decimal)):
+        return Decimal(str(value))
+    text = _text(value).replace("$", "").replace(" ", "")
+    if not text:
+        return Decimal(0)
+    if "," in text and "." in text:
+        # Whichever separator comes last is the decimal one: 1,234.50 / 1.234,50
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    else:
+        text = text.replace(",", ".")
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"{field} inválido: {value!r}") from None
+
+
+def _parse_int(value, field: str) -> int:
+    number = _parse_decimal(value, field)
+    if number != number.to_integral_value() or number < 0:
+        raise ValueError(f"{field} debe ser un entero positivo: {value!r}")
+    return int(number)
+
+
+# Readers: yield (line number, raw header/value row); the first yielded row is the header
+def _iter_csv(path: Path) -> Iterator[Tuple[int, list]]:
+    with path.open("r", encoding="utf-8-sig", newline="") as fh:
+        sample = fh.read(8192)
+        fh.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        for i, row in enumerate(csv.reader(fh, dialect), 1):
+            yield i, row
+
+
+def _iter_xlsx(path: Path) -> Iterator[Tuple[int, list]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("Para importar archivos .xlsx instale openpyxl (pip install openpyxl)") from None
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for i, row in enumerate(wb.worksheets[0].iter_rows(values_only=True), 1):
+            yield i, list(row)
+    finally:
+        wb.close()
+
+
+def _count_rows(path: Path) -> int:
+    if path.suffix.lower() == ".xlsx":
+        return 0
+    with path.open("rb") as fh:
+        return max(0, sum(chunk.count(b"\n") for chunk in iter(lambda: fh.read(1 << 20), b"")) - 1)
+
+
+def iter_rows(path: Path) -> Iterator[Tuple[int, Dict[str, object]]]:
+    """Yield (line, {canonical field: raw value}) for every non-empty data row of a CSV/XLSX file."""
+    suffix = path.suffix.lower()
+    if suffix in (".xlsx", ".xlsm"):
+        raw = _iter_xlsx(path)
+    elif suffix in (".csv", ".txt"):
+        raw = _iter_csv(path)
+    else:
+        raise ImportFileError(f"Formato no soportado: {path.suffix}")
+
+    try:
+        _, header = next(raw)
+    except StopIteration:
+        raise ImportFileError("El archivo está vacío") from None
+    aliases = {alias: field for field, names in COLUMNS.items() for alias in names}
+    positions = [(i, aliases[h]) for i, h in enumerate(map(_norm_header, header)) if h in aliases]
+    missing = [f for f in REQUIRED if f not in {f for _, f in positions}]
+    if missing:
+        raise ImportFileError(f"Faltan columnas: {', '.join(missing)}")
+    for line, values in raw:
+        record = {
+            field: (v.strip() if type(v) is str else v)
+            for i, field in positions
+            if i < len(values) and (v := values[i]) is not None
+        }
+        if any(v != "" for v in record.values()):
+            yield line, record
+
+
+class _Lookup:
+    """Name -> id maps for the catalogs, loaded once per import; optionally inserts missing names."""
+
+    def __init__(self, conn, create_missing: bool):
+        self.conn = conn
+        self.create_missing = create_missing
+        self.created: Dict[str, int] = {}
+        self.ids: Dict[str, Dict[str, int]] = {}
+        self._raw: Dict[Tuple[str, str], int] = {}  # (kind, name as written) -> id
+        for kind, (model, attr) in CATALOGS.items():
+            label = getattr(model, attr)
+            self.ids[kind] = {_norm_name(name): id_ for id_, name in conn.execute(select(model.id, label))}
+        self.supply_cost = {id_: cost for id_, cost in conn.execute(select(Supply.id, Supply.cost_per_unit))}
+
+    def resolve(self, kind: str, name: str) -> Optional[int]:
+        if not name:
+            return None
+        found = self._raw.get((kind, name))
+        if found is not None:
+            return found
+        key = _norm_name(name)
+        found = self.ids[kind].get(key)
+        if found is not None:
+            self._raw[(kind, name)] = found
+            return found
+        if not self.create_missing:
+            raise ValueError(f"{name!r} no existe en el catálogo")
+        model, attr = CATALOGS[kind]
+        found = self.conn.execute(insert(model).values({attr: name.strip()}).returning(model.id)).scalar_one()
+        self.ids[kind][key] = self._raw[(kind, name)] = found
+        if kind == "supplies":
+            self.supply_cost[found] = Decimal(0)
+        self.created[kind] = self.created.get(kind, 0) + 1
+        return found
+
+
+def _flight_values(rec: Dict[str, object]) -> dict:
+    # Parsed scalar columns only; catalog ids are added once the whole row is known to be valid
+    return {
+        "flight_date": _parse_date(rec.get("fecha")),
+        "pilot": _text(rec.get("piloto")) or "N/A",
+        "copilot": _text(rec.get("copiloto")) or None,
+        "origin": (_text(rec.get("origen")) or "N/A").upper()[:10],
+        "destination": (_text(rec.get("destino")) or "N/A").upper()[:10],
+        # The type is stored by id only, so renaming it in the catalog reaches these flights too
+        "service_type": None,
+        "service_time": _parse_time(rec.get("hora_servicio")),
+        "flight_minutes": _parse_int(rec.get("minutos") or 0, "minutos"),
+        "landings": _parse_int(rec.get("aterrizajes") or 0, "aterrizajes"),
+        "notes": _text(rec.get("notas"))[:500] or None,
+    }
+
+
+def _supply_values(rec: Dict[str, object]) -> dict:
+    # unit_cost None: the catalog cost of the supply, filled in by _priced
+    cost = rec.get("costo_unitario")
+    return {
+        "quantity": _parse_decimal(rec.get("cantidad") or 0, "cantidad"),
+        "unit_cost": _parse_decimal(cost, "costo_unitario") if _text(cost) else None,
+        "viaticos": _parse_decimal(rec.get("viaticos") or 0, "viaticos"),
+    }
+
+
+def _priced(values: dict, supply_id: int, lookup: _Lookup) -> dict:
+    unit_cost = values["unit_cost"]
+    if unit_cost is None:
+        unit_cost = Decimal(str(lookup.supply_cost.get(supply_id) or 0))
+    return {**values, "supply_id": supply_id, "unit_cost": unit_cost}
+
+
+def import_flights(
+    path: Path,
+    bind: Engine | None = None,
+    create_missing: bool = False,
+    progress: Optional[ProgressFn] = None,
+    batch_size: int = BATCH_FLIGHTS,
+) -> ImportResult:
+    """Import flights (and their supplies) from a CSV or XLSX file.
+
+    One row is one flight; an optional insumo/cantidad/costo_unitario/viaticos group adds a
+    supply line to it. Rows that only carry supply columns (no fecha/matrícula) add further
+    supplies to the flight above. Invalid rows are skipped and reported in the result; valid
+    ones are inserted with executemany in transactions of `batch_size` flights.
+    """
+    bind = bind or default_engine
+    path = Path(path)
+    t0 = _time.perf_counter()
+    total = _count_rows(path)
+    errors: List[RowError] = []
+    rows = n_flights = n_supplies = 0
+    created: Dict[str, int] = {}
+
+    flights: List[dict] = []
+    supplies: List[Tuple[int, dict]] = []  # (index in flights, values)
+
+    def flush(conn) -> None:
+        nonlocal n_flights, n_supplies
+        if not flights:
+            return
+        # Plain executemany; RETURNING with parameter order falls back to one statement per row
+        # on SQLite. flight_logs.id is a plain INTEGER PRIMARY KEY (no AUTOINCREMENT): each row
+        # gets max(rowid) + 1, which is contiguous only because this transaction holds the write
+        # lock, and not even then once the largest rowid is in use (SQLite then picks random
+        # free ids). Hence the count check on the block ending at last_insert_rowid().
+        conn.execute(insert(FlightLog), flights)
+        last = conn.exec_driver_sql("SELECT last_insert_rowid()").scalar_one()
+        first = last - len(flights) + 1
+        check = select(func.count()).where(FlightLog.id.between(first, last))
+        if conn.execute(check).scalar_one() != len(flights):
+            raise RuntimeError("Los ID de los vuelos importados no son contiguos; importación cancelada")
+        ids = range(first, last + 1)
+        if supplies:
+            conn.execute(insert(FlightSupply), [{**values, "flight_id": ids[i]} for i, values in supplies])
+        n_flights += len(flights)
+        n_supplies += len(supplies)
+        flights.clear()
+        supplies.clear()
+
+    conn = bind.connect()
+    try:
+        trans = conn.begin()
+        lookup = _Lookup(conn, create_missing)
+        created = lookup.created
+        current_ok = False  # whether the last flight row was accepted (for continuation rows)
+        for line, rec in iter_rows(path):
+            rows += 1
+            if progress and rows % PROGRESS_EVERY == 0:
+                progress(rows, max(total, rows))
+            is_continuation = not _text(rec.get("fecha")) and not _text(rec.get("matricula"))
+            try:
+                if is_continuation:
+                    if not _text(rec.get("insumo")):
+                        raise ValueError("fila sin fecha ni matrícula")
+                    if not current_ok:
+                        raise ValueError("el vuelo de la fila anterior no se importó")
+                    supply = _supply_values(rec)
+                    supplies.append((len(flights) - 1, _priced(supply, lookup.resolve("supplies", _text(rec["insumo"])), lookup)))
+                    continue
+                current_ok = False
+                for field in REQUIRED:
+                    if not _text(rec.get(field)):
+                        raise ValueError(f"falta {field}")
+                # Everything is parsed before resolving names, so a rejected row creates no catalog entries
+                values = _flight_values(rec)
+                supply = _supply_values(rec) if _text(rec.get("insumo")) else None
+                ids = {field: lookup.resolve(kind, _text(rec.get(field))) for field, kind in _LOOKUP_COLUMNS.items()}
+                values.update(
+                    aircraft_id=ids["matricula"], client_id=ids["cliente"], mechanic_id=ids["mecanico"],
+                    service_type_id=ids["tipo_servicio"], concept_id=ids["concepto"],
+                )
+                if supply:
+                    supply = _priced(supply, ids["insumo"], lookup)
+            except ValueError as exc:
+                errors.append(RowError(line, str(exc)))
+                continue
+            if len(flights) >= batch_size:
+                flush(conn)
+                trans.commit()
+                trans = conn.begin()
+            flights.append(values)
+            if supply:
+                supplies.append((len(flights) - 1, supply))
+            current_ok = True
+        flush(conn)
+        trans.commit()
+    finally:
+        conn.close()
+        # Catalog rows inserted through Core don't fire the ORM events the cache listens to
+        for kind in created:
+            catalog_cache.invalidate(kind)
+    if progress:
+        progress(rows, rows)
+    return ImportResult(rows, n_flights, n_supplies, errors, created, round(_time.perf_counter() - t0, 3))
+
+
+def write_errors(path: Path, errors: List[RowError]) -> Path:
+    path = Path(path)
+    with path.open("w", encoding="utf-8-sig", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["linea", "error"])
+        writer.writerows(errors)
+    return path
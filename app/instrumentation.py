@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Callable, Deque, Dict, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import LOG_DIR, SLOW_QUERY_MS
+
+# Per-action timing: an "action" is one user click (a Controller handler) or one background job.
+# Everything that runs on the same thread while it is open is charged to it:
+#   - SQL: cursor execute time (engine events) plus row fetching (CountingConnection cursors)
+#   - phases: "sesion" (ORM hydration and Python inside get_session), "pdf" (reportlab
+#     generators), "tabla" (Qt model fills), each excluding the SQL and nested phases inside it.
+
+HISTORY = 200
+MIN_RECORDED = 0.001  # actions without SQL shorter than this (progress ticks...) aren't kept
+SLOW_HISTORY = 50
+SLOW_LOG_BYTES = 1_000_000
+SLOW_LOG_BACKUPS = 3
+
+log = logging.getLogger("bitacoras.slow_sql")
+log.propagate = False
+
+
+@dataclass
+class ActionStats:
+    name: str
+    started: datetime
+    thread: str
+    wall: float = 0.0
+    queries: int = 0
+    sql: float = 0.0
+    rows: int = 0
+    phases: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def other(self) -> float:
+        # Python outside any phase: handler code, building rows, etc.
+        return max(self.wall - self.sql - sum(self.phases.values()), 0.0)
+
+
+class SlowQuery(NamedTuple):
+    at: datetime
+    ms: float
+    action: str
+    sql: str
+    plan: str
+
+
+_local = threading.local()
+_lock = threading.Lock()
+_history: Deque[ActionStats] = deque(maxlen=HISTORY)
+_slow: Deque[SlowQuery] = deque(maxlen=SLOW_HISTORY)
+_slow_ms = SLOW_QUERY_MS
+
+
+def current() -> Optional[ActionStats]:
+    return getattr(_local, "action", None)
+
+
+@contextmanager
+def action(name: str) -> Iterator[ActionStats]:
+    """Charge everything on this thread to `name` until the block ends; nested actions join the outer one."""
+    outer = current()
+    if outer is not None:
+        yield outer
+        return
+    stats = ActionStats(name, datetime.now(), threading.current_thread().name)
+    _local.action, _local.spans = stats, []
+    t0 = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.wall = time.perf_counter() - t0
+        _local.action = None
+        if stats.queries or stats.wall >= MIN_RECORDED:
+            with _lock:
+                _history.append(stats)
+
+
+@contextmanager
+def span(phase: str) -> Iterator[None]:
+    stats = current()
+    if stats is None:
+        yield
+        return
+    frame = [time.perf_counter(), stats.sql, 0.0]  # start, SQL so far, time of nested spans
+    _local.spans.append(frame)
+    try:
+        yield
+    finally:
+        _local.spans.pop()
+        own = time.perf_counter() - frame[0] - (stats.sql - frame[1])
+        stats.phases[phase] = stats.phases.get(phase, 0.0) + own - frame[2]
+        if _local.spans:
+            _local.spans[-1][2] += own
+
+
+def timed(phase: str) -> Callable:
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(phase):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def instrument_methods(cls: type, prefixes=("_on_", "_load_")) -> type:
+    """Wrap every method of `cls` starting with one of `prefixes` in an action named after it.
+
+    The wrapper forwards only as many positional arguments as the method takes, so Qt can keep
+    connecting signals that carry extra arguments (clicked(bool), activated(int)...) to it.
+    """
+    for name, fn in list(vars(cls).items()):
+        if not name.startswith(prefixes) or not inspect.isfunction(fn):
+            continue
+        params = inspect.signature(fn).parameters.values()
+        keep = None if any(p.kind is p.VAR_POSITIONAL for p in params) else sum(
+            p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in params
+        )
+        setattr(cls, name, _as_action(fn, f"{cls.__name__}.{name}", keep))
+    return cls
+
+
+def _as_action(fn: Callable, name: str, keep: Optional[int]) -> Callable:
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with action(name):
+            return fn(*args[:keep] if keep is not None else args, **kwargs)
+
+    del wrapper.__wrapped__  # make Qt look at the wrapper's (*args) signature, not the method's
+    return wrapper
+
+
+# SQL side
+
+class _CountingCursor(sqlite3.Cursor):
+    # Row stepping happens in fetch*, not in execute, so it is timed and counted here
+    def fetchall(self):
+        t0 = time.perf_counter()
+        rows = super().fetchall()
+        _charge_fetch(time.perf_counter() - t0, len(rows))
+        return rows
+
+    def fetchmany(self, size=None):
+        t0 = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        _charge_fetch(time.perf_counter() - t0, len(rows))
+        return rows
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        row = super().fetchone()
+        _charge_fetch(time.perf_counter() - t0, row is not None)
+        return row
+
+
+class CountingConnection(sqlite3.Connection):
+    """sqlite3 connection factory whose cursors report fetched rows to the current action."""
+
+    def cursor(self, factory=_CountingCursor):
+        return super().cursor(factory)
+
+
+def _charge_fetch(seconds: float, rows: int) -> None:
+    stats = current()
+    if stats is not None:
+        stats.sql += seconds
+        stats.rows += rows
+
+
+def install(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_instr_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["_instr_t0"].pop()
+        stats = current()
+        if stats is not None:
+            stats.queries += 1
+            stats.sql += elapsed
+        if elapsed * 1000 >= _slow_ms:
+            _log_slow(cursor, statement, parameters, executemany, elapsed, stats)
+
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def _log_slow(cursor, statement: str, parameters, executemany: bool, elapsed: float, stats: Optional[ActionStats]) -> None:
+    plan = ""
+    if not executemany and statement.lstrip().upper().startswith(_EXPLAINABLE):
+        try:
+            # A plain cursor on the same connection: not timed, not charged to the action
+            raw = sqlite3.Connection.cursor(cursor.connection)
+            rows = raw.execute("EXPLAIN QUERY PLAN " + statement, parameters or ()).fetchall()
+            plan = "\n".join(f"{'  ' * _depth(rows, r)}{r[-1]}" for r in rows)
+        except sqlite3.Error as exc:
+            plan = f"(sin plan: {exc})"
+    entry = SlowQuery(datetime.now(), round(elapsed * 1000, 1), stats.name if stats else "", " ".join(statement.split()), plan)
+    with _lock:
+        _slow.append(entry)
+    _ensure_log_handler()
+    log.warning("%.1f ms [%s] %s\n%s", entry.ms, entry.action or "-", entry.sql, plan)
+
+
+def _depth(rows: list, row: tuple) -> int:
+    # EXPLAIN QUERY PLAN rows are (id, parent, notused, detail)
+    parents = {r[0]: r[1] for r in rows}
+    depth, parent = 0, row[1]
+    while parent in parents:
+        depth, parent = depth + 1, parents[parent]
+    return depth
+
+
+def _ensure_log_handler() -> None:
+    if log.handlers:
+        return
+    with _lock:
+        if log.handlers:
+            return
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(slow_log_path(), maxBytes=SLOW_LOG_BYTES, backupCount=SLOW_LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        log.addHandler(handler)
+        log.setLevel(logging.WARNING)
+
+
+def slow_log_path():
+    return LOG_DIR / "consultas_lentas.log"
+
+
+def slow_threshold_ms() -> float:
+    return _slow_ms
+
+
+def set_slow_threshold_ms(ms: float) -> None:
+    global _slow_ms
+    _slow_ms = float(ms)
+
+
+def recent_actions() -> List[ActionStats]:
+    with _lock:
+        return list(_history)
+
+
+def recent_slow_queries() -> List[SlowQuery]:
+    with _lock:
+        return list(_slow)
+
+
+def clear() -> None:
+    with _lock:
+        _history.clear()
+        _slow.clear()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from PySide6 import QtCore
+
+from .instrumentation import action
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    """Handed to the job function; lets it report progress and notice cancellation."""
+
+    def __init__(self, job_id: int, label: str, runner: "JobRunner"):
+        self.job_id = job_id
+        self.label = label
+        self._runner = runner
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def check_cancelled(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def progress(self, done: int, total: int) -> None:
+        # Called from the worker thread; raising here unwinds the report generator
+        self.check_cancelled()
+        self._runner.progress.emit(self.job_id, self.label, done, total)
+
+
+class _Job(QtCore.QRunnable):
+    def __init__(self, ctx: JobContext, fn: Callable[[JobContext], Any], runner: "JobRunner"):
+        super().__init__()
+        self.ctx = ctx
+        self.fn = fn
+        self.runner = runner
+        self.setAutoDelete(False)
+
+    def run(self) -> None:
+        runner, ctx = self.runner, self.ctx
+        try:
+            ctx.check_cancelled()
+            runner.started.emit(ctx.job_id, ctx.label)
+            with action(f"Trabajo: {ctx.label}"):
+                result = self.fn(ctx)
+            ctx.check_cancelled()
+        except JobCancelled:
+            runner._done(ctx.job_id)
+            runner.cancelled.emit(ctx.job_id, ctx.label)
+        except Exception as exc:
+            runner._done(ctx.job_id)
+            runner.failed.emit(ctx.job_id, ctx.label, str(exc))
+        else:
+            runner._done(ctx.job_id)
+            runner.finished.emit(ctx.job_id, ctx.label, result)
+
+
+class JobRunner(QtCore.QObject):
+    """Runs callables on a private QThreadPool and reports back through Qt signals.
+
+    Signals are emitted from worker threads and delivered queued to receivers living
+    in the GUI thread, so slots can touch widgets directly.
+    """
+
+    started = QtCore.Signal(int, str)  # job_id, label
+    progress = QtCore.Signal(int, str, int, int)  # job_id, label, done, total
+    finished = QtCore.Signal(int, str, object)  # job_id, label, result
+    failed = QtCore.Signal(int, str, str)  # job_id, label, error
+    cancelled = QtCore.Signal(int, str)
+
+    def __init__(self, max_threads: int = 2, parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent)
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, _Job] = {}
+
+    def submit(self, label: str, fn: Callable[[JobContext], Any]) -> int:
+        job_id = next(self._ids)
+        job = _Job(JobContext(job_id, label, self), fn, self)
+        with self._lock:
+            self._jobs[job_id] = job
+        self._pool.start(job)
+        return job_id
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def cancel(self, job_id: int | None = None) -> None:
+        # Queued jobs are dropped from the pool; running ones stop at their next progress() call
+        with self._lock:
+            targets = [j for jid, j in self._jobs.items() if job_id is None or jid == job_id]
+        for job in targets:
+            job.ctx.cancel()
+            if self._pool.tryTake(job):
+                self._done(job.ctx.job_id)
+                self.cancelled.emit(job.ctx.job_id, job.ctx.label)
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self._pool.waitForDone(msecs)
+
+    def _done(self, job_id: int) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import and_, func, select, true
+from sqlalchemy.orm import Session
+
+from .models import Aircraft, AircraftCounter, AircraftInspection, FlightLog, InspectionInterval
+
+# Per-aircraft running totals (aircraft_counters) and the counters as of each aircraft's last
+# inspection (aircraft_inspections). Triggers on flight_logs apply every flight insert/edit/delete to
+# both, so "hours since the last 100-hour inspection" is a subtraction and checking the whole fleet
+# reads one row per aircraft and interval. A flight counts before an inspection done the same day.
+
+
+def _apply(f: str, sign: str) -> str:
+    # Adds (sign = "") or removes (sign = "-") flight row `f` from its aircraft's counters
+    return f"""INSERT INTO aircraft_counters (aircraft_id, flights, minutes, landings)
+        VALUES ({f}.aircraft_id, {sign}1, {sign}{f}.flight_minutes, {sign}{f}.landings)
+        ON CONFLICT (aircraft_id) DO UPDATE SET
+            flights = flights + excluded.flights,
+            minutes = minutes + excluded.minutes,
+            landings = landings + excluded.landings;
+        UPDATE aircraft_inspections
+        SET minutes_at = minutes_at + {sign}{f}.flight_minutes, landings_at = landings_at + {sign}{f}.landings
+        WHERE aircraft_id = {f}.aircraft_id AND done_on >= {f}.flight_date;{_DROP_EMPTY.format(f) if sign else ""}"""
+
+
+# An aircraft without flights has no counter row (as rebuild_counters leaves it), not a row of zeros
+_DROP_EMPTY = """
+        DELETE FROM aircraft_counters
+        WHERE aircraft_id = {0}.aircraft_id AND flights = 0 AND minutes = 0 AND landings = 0;"""
+
+
+COUNTER_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_counters_flight_ai AFTER INSERT ON flight_logs BEGIN
+        {_apply("new", "")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_counters_flight_ad AFTER DELETE ON flight_logs BEGIN
+        {_apply("old", "-")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_counters_flight_au
+    AFTER UPDATE OF aircraft_id, flight_date, flight_minutes, landings ON flight_logs
+    WHEN old.aircraft_id IS NOT new.aircraft_id OR old.flight_date IS NOT new.flight_date
+      OR old.flight_minutes IS NOT new.flight_minutes OR old.landings IS NOT new.landings BEGIN
+        {_apply("old", "-")}
+        {_apply("new", "")}
+    END""",
+]
+
+
+def ensure_counters(conn) -> None:
+    """Create the sync triggers; fill the counters when they are empty but there are flights (older DBs)."""
+    for ddl in COUNTER_DDL:
+        conn.exec_driver_sql(ddl)
+    empty = conn.exec_driver_sql("SELECT NOT EXISTS (SELECT 1 FROM aircraft_counters)").scalar()
+    if empty and conn.exec_driver_sql("SELECT EXISTS (SELECT 1 FROM flight_logs)").scalar():
+        rebuild_counters(conn)
+
+
+def refresh_counter_triggers(conn) -> None:
+    """Replace the sync triggers of older DBs with the current COUNTER_DDL and drop their rows of zeros."""
+    for name in ("trg_counters_flight_ai", "trg_counters_flight_ad", "trg_counters_flight_au"):
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+    for ddl in COUNTER_DDL:
+        conn.exec_driver_sql(ddl)
+    conn.exec_driver_sql("DELETE FROM aircraft_counters WHERE flights = 0 AND minutes = 0 AND landings = 0")
+
+
+def rebuild_counters(conn) -> int:
+    """Recompute the counters and the inspection snapshots from flight_logs; returns the number of aircraft."""
+    conn.exec_driver_sql("DELETE FROM aircraft_counters")
+    conn.exec_driver_sql(
+        """INSERT INTO aircraft_counters (aircraft_id, flights, minutes, landings)
+        SELECT aircraft_id, count(*), coalesce(sum(flight_minutes), 0), coalesce(sum(landings), 0)
+        FROM flight_logs GROUP BY aircraft_id"""
+    )
+    conn.exec_driver_sql(
+        """UPDATE aircraft_inspections SET
+            minutes_at = (SELECT coalesce(sum(flight_minutes), 0) FROM flight_logs f
+                          WHERE f.aircraft_id = aircraft_inspections.aircraft_id AND f.flight_date <= aircraft_inspections.done_on),
+            landings_at = (SELECT coalesce(sum(landings), 0) FROM flight_logs f
+                           WHERE f.aircraft_id = aircraft_inspections.aircraft_id AND f.flight_date <= aircraft_inspections.done_on)"""
+    )
+    return conn.exec_driver_sql("SELECT count(*) FROM aircraft_counters").scalar()
+
+
+class InspectionStatus(NamedTuple):
+    aircraft_id: int
+    registration: str
+    interval_id: int
+    interval_name: str
+    done_on: Optional[date]  # None = never recorded; counted since the first flight
+    total_minutes: int
+    total_landings: int
+    minutes_since: int
+    landings_since: int
+    minutes_left: Optional[int]  # None when the interval doesn't track minutes
+    landings_left: Optional[int]
+
+    @property
+    def overdue(self) -> bool:
+        return any(left is not None and left <= 0 for left in (self.minutes_left, self.landings_left))
+
+    def due_within(self, minutes: int, landings: int) -> bool:
+        return (self.minutes_left is not None and self.minutes_left <= minutes) or (
+            self.landings_left is not None and self.landings_left <= landings
+        )
+
+
+def list_inspection_intervals(session: Session) -> List[InspectionInterval]:
+    return list(session.scalars(select(InspectionInterval).order_by(InspectionInterval.name)))
+
+
+def add_inspection_interval(
+    session: Session, name: str, hours: float | None = None, landings: int | None = None
+) -> InspectionInterval:
+    if not hours and not landings:
+        raise ValueError("El intervalo necesita horas o aterrizajes")
+    interval = InspectionInterval(name=name, minutes=round(hours * 60) if hours else None, landings=landings or None)
+    session.add(interval)
+    session.flush()
+    return interval
+
+
+def record_inspection(
+    session: Session, aircraft_id: int, interval_id: int, done_on: date, notes: str | None = None
+) -> AircraftInspection:
+    """Record (or replace) the last inspection of an interval, snapshotting the counters as of `done_on`."""
+    minutes, landings = session.execute(
+        select(func.coalesce(func.sum(FlightLog.flight_minutes), 0), func.coalesce(func.sum(FlightLog.landings), 0))
+        .where(FlightLog.aircraft_id == aircraft_id, FlightLog.flight_date <= done_on)
+    ).one()
+    inspection = session.merge(AircraftInspection(
+        aircraft_id=aircraft_id, interval_id=interval_id, done_on=done_on,
+        minutes_at=int(minutes), landings_at=int(landings), notes=notes,
+    ))
+    session.flush()
+    return inspection
+
+
+def inspection_status(session: Session, aircraft_id: int | None = None) -> List[InspectionStatus]:
+    """Every (aircraft, interval) pair with hours/landings since the last inspection and what is left.
+
+    One row per aircraft and interval is read: no flight rows are scanned.
+    """
+    stmt = (
+        select(
+            Aircraft.id,
+            Aircraft.registration,
+            InspectionInterval.id,
+            InspectionInterval.name,
+            InspectionInterval.minutes,
+            InspectionInterval.landings,
+            AircraftInspection.done_on,
+            func.coalesce(AircraftCounter.minutes, 0),
+            func.coalesce(AircraftCounter.landings, 0),
+            func.coalesce(AircraftInspection.minutes_at, 0),
+            func.coalesce(AircraftInspection.landings_at, 0),
+        )
+        .select_from(Aircraft)
+        .join(InspectionInterval, true())
+        .outerjoin(AircraftCounter, AircraftCounter.aircraft_id == Aircraft.id)
+        .outerjoin(
+            AircraftInspection,
+            and_(AircraftInspection.aircraft_id == Aircraft.id, AircraftInspection.interval_id == InspectionInterval.id),
+        )
+        .order_by(Aircraft.registration, InspectionInterval.name)
+    )
+    if aircraft_id is not None:
+        stmt = stmt.where(Aircraft.id == aircraft_id)
+    out = []
+    for ac_id, reg, iv_id, iv_name, every_min, every_land, done_on, tot_min, tot_land, min_at, land_at in session.execute(stmt):
+        since_min, since_land = tot_min - min_at, tot_land - land_at
+        out.append(InspectionStatus(
+            ac_id, reg, iv_id, iv_name, done_on, tot_min, tot_land, since_min, since_land,
+            every_min - since_min if every_min else None,
+            every_land - since_land if every_land else None,
+        ))
+    return out
+
+
+def due_soon(session: Session, within_hours: float = 10, within_landings: int = 10) -> List[InspectionStatus]:
+    """Inspections overdue or due within the given margin, most urgent first."""
+    margin = round(within_hours * 60)
+    due = [st for st in inspection_status(session) if st.due_within(margin, within_landings)]
+
+    def urgency(st: InspectionStatus) -> float:
+        # fraction of the interval still left; the smaller of hours and landings decides
+        fractions = [
+            left / (left + since)
+            for left, since in ((st.minutes_left, st.minutes_since), (st.landings_left, st.landings_since))
+            if left is not None and left + since
+        ]
+        return min(fractions, default=0.0)
+
+    return sorted(due, key=urgency)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import Engine
+from sqlalchemy.engine import Connection
+
+from .db import Base
+from .fts import ensure_search_index
+from .maintenance import ensure_counters, refresh_counter_triggers
+from .report_cache import ensure_report_stamps
+from .rollups import ensure_rollups
+
+# The schema version is SQLite's PRAGMA user_version: N means the first N steps below are applied
+# (0 = new file or a database from before versioning). Starting up on an up-to-date database only
+# reads that integer. Each pending step runs in its own BEGIN IMMEDIATE transaction together with
+# its version bump, so an interrupted step leaves nothing behind and is retried on the next start.
+#
+# Append new steps at the end and never edit applied ones. Steps also run on brand-new files, where
+# step 1's create_all already built the current tables: add columns with _add_columns (it probes).
+
+
+def _add_columns(conn: Connection, table: str, columns: Dict[str, str]) -> None:
+    existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info('{table}')")}
+    for name, ddl in columns.items():
+        if name not in existing:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+
+
+def _tables(conn: Connection) -> None:
+    Base.metadata.create_all(bind=conn)
+    # Columns added to databases created by the first releases
+    _add_columns(conn, "flight_logs", {
+        "service_type": "VARCHAR(60)",
+        "service_time": "TIME",
+        "mechanic_id": "INTEGER REFERENCES mechanics(id)",
+        "service_type_id": "INTEGER REFERENCES service_types(id)",
+        "concept_id": "INTEGER REFERENCES concepts(id)",
+    })
+    _add_columns(conn, "flight_supplies", {"viaticos": "NUMERIC(12,2) DEFAULT 0"})
+
+
+def _indexes(conn: Connection) -> None:
+    # Date/aircraft/client range queries (create_all skips indexes on existing tables)
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_flight_logs_flight_date ON flight_logs (flight_date)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_flight_logs_aircraft_date ON flight_logs (aircraft_id, flight_date)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_flight_logs_client_date ON flight_logs (client_id, flight_date)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_flight_supplies_flight_id ON flight_supplies (flight_id)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_flight_logs_mechanic_date ON flight_logs (mechanic_id, flight_date)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_flight_logs_service_type_date ON flight_logs (service_type_id, flight_date)")
+
+
+def _search(conn: Connection) -> None:
+    # Without FTS5 nothing is created and search_flights keeps using LIKE
+    ensure_search_index(conn)
+
+
+# version -> (label, step); the version is the position in the list, starting at 1
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("tablas y columnas", _tables),
+    ("índices de consulta", _indexes),
+    ("búsqueda de texto (FTS5)", _search),
+    ("totales mensuales", ensure_rollups),
+    ("contadores de mantenimiento", ensure_counters),
+    ("huellas de datos de reportes", ensure_report_stamps),
+    ("contadores sin filas en cero", refresh_counter_triggers),
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: Connection) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def migrate(bind: Engine) -> int:
+    """Apply the pending steps in order; returns the resulting schema version.
+
+    A database written by a newer release (higher version) is left untouched.
+    """
+    with bind.connect() as conn:
+        version = schema_version(conn)
+        while version < SCHEMA_VERSION:
+            # IMMEDIATE takes the write lock before re-reading, so two instances starting
+            # together don't both run a step; pysqlite won't BEGIN before DDL by itself
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                version = schema_version(conn)
+                if version < SCHEMA_VERSION:
+                    MIGRATIONS[version][1](conn)
+                    version += 1
+                    conn.exec_driver_sql(f"PRAGMA user_version = {version}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        return version
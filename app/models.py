@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date, time
 from typing import List, Optional
 
-from sqlalchemy import Date, ForeignKey, Integer, Numeric, String, Time, UniqueConstraint
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric, String, Time, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .db import Base
@@ -130,6 +130,15 @@ class FlightLog(Base):
     service_type_ref: Mapped[Optional[ServiceType]] = relationship()
     concept: Mapped[Optional[Concept]] = relationship()
 
+    # Range queries for reports always filter by date, optionally narrowed by aircraft or client
+    __table_args__ = (
+        Index("ix_flight_logs_flight_date", "flight_date"),
+        Index("ix_flight_logs_aircraft_date", "aircraft_id", "flight_date"),
+        Index("ix_flight_logs_client_date", "client_id", "flight_date"),
+        Index("ix_flight_logs_mechanic_date", "mechanic_id", "flight_date"),
+        Index("ix_flight_logs_service_type_date", "service_type_id", "flight_date"),
+    )
+
     def __repr__(self) -> str:  # pragma: no cover
         return f"FlightLog(id={self.id}, date={self.flight_date})"
 
@@ -147,9 +156,91 @@ class FlightSupply(Base):
     flight: Mapped[FlightLog] = relationship(back_populates="supplies")
     supply: Mapped[Supply] = relationship(back_populates="items")
 
+    __table_args__ = (Index("ix_flight_supplies_flight_id", "flight_id"),)
+
     @property
     def total_cost(self) -> float:
         try:
             return float(self.quantity) * float(self.unit_cost)
         except Exception:
             return 0.0
+
+
+# Flight and supply totals per month, aircraft and client; maintained by triggers (app/rollups.py)
+class MonthlyRollup(Base):
+    __tablename__ = "monthly_rollups"
+
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    month: Mapped[int] = mapped_column(Integer, primary_key=True)
+    aircraft_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    client_id: Mapped[int] = mapped_column(Integer, primary_key=True)  # 0 = flights without client
+    flights: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    landings: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    subtotal_cents: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    viaticos_cents: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"MonthlyRollup({self.year}-{self.month:02d}, aircraft={self.aircraft_id}, client={self.client_id})"
+
+
+# Random stamp per month, aircraft and client, replaced by triggers on every change to its flights;
+# the PDF cache keys reports on the stamps they cover (app/report_cache.py)
+class ReportStamp(Base):
+    __tablename__ = "report_stamps"
+
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    month: Mapped[int] = mapped_column(Integer, primary_key=True)
+    aircraft_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    client_id: Mapped[int] = mapped_column(Integer, primary_key=True)  # 0 = flights without client
+    stamp: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"ReportStamp({self.year}-{self.month:02d}, aircraft={self.aircraft_id}, client={self.client_id})"
+
+
+# Running totals per aircraft; maintained by triggers on flight_logs (app/maintenance.py)
+class AircraftCounter(Base):
+    __tablename__ = "aircraft_counters"
+
+    aircraft_id: Mapped[int] = mapped_column(ForeignKey("aircraft.id"), primary_key=True)
+    flights: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    landings: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"AircraftCounter(aircraft={self.aircraft_id}, minutes={self.minutes}, landings={self.landings})"
+
+
+class InspectionInterval(Base):
+    __tablename__ = "inspection_intervals"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(80), nullable=False)
+    # Due after this many flight minutes and/or landings since the last inspection (None = not tracked)
+    minutes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    landings: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (UniqueConstraint("name", name="uq_inspection_intervals_name"),)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"InspectionInterval(id={self.id}, name={self.name!r})"
+
+
+# Last inspection of each interval per aircraft, with the aircraft counters as of that day
+class AircraftInspection(Base):
+    __tablename__ = "aircraft_inspections"
+
+    aircraft_id: Mapped[int] = mapped_column(ForeignKey("aircraft.id"), primary_key=True)
+    interval_id: Mapped[int] = mapped_column(ForeignKey("inspection_intervals.id"), primary_key=True)
+    done_on: Mapped[date] = mapped_column(Date, nullable=False)
+    minutes_at: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    landings_at: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    notes: Mapped[Optional[str]] = mapped_column(String(300), nullable=True)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"AircraftInspection(aircraft={self.aircraft_id}, interval={self.interval_id}, done_on={self.done_on})"
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.rl_accel import fp_str
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFName, PDFStream, PDFZCompress
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.pdfgen.textobject import PDFTextObject
+
+# Table engine shared by the PDF reports. A TableLayout (built once per process) holds the column
+# geometry in points; a Table draws rows onto one canvas, starting a new page with the column
+# headers again when it reaches the bottom margin. All rows of a page go into a single text object
+# as ready-made operators, instead of a drawString (its own BT/ET, font and number formatting) per
+# cell. Rows can come from any iterable, so generators stream straight onto the page.
+
+Cell = Optional[str]  # None or "" draws nothing
+RIGHT_X_CACHE = 20_000  # right-aligned positions remembered per layout (amounts, counts...)
+
+
+class ReportCanvas(Canvas):
+    """Canvas that deflates each page's content as soon as the page is finished.
+
+    reportlab keeps the content of every page as text until save(); in a long report that text
+    (~15 KB a page) is most of the memory used, while the rows themselves are streamed.
+    """
+
+    def showPage(self):
+        super().showPage()
+        page = self._doc.Pages.pages[-1]
+        if page.compression and page.stream and not page.Contents:
+            # A stream whose dictionary already names its filter is written as is by save()
+            contents = PDFStream(content=PDFZCompress.encode(page.stream))
+            contents.dictionary["Filter"] = PDFArray([PDFName("FlateDecode")])
+            contents.__Comment__ = "page stream"
+            page.Contents, page.stream = contents, None
+
+
+class Column(NamedTuple):
+    header: str
+    x: float  # inches; left edge of the header and of left-aligned cells
+    right: Optional[float] = None  # inches; right edge of right-aligned cells
+
+
+class TableLayout:
+    def __init__(
+        self,
+        columns: Sequence[Column],
+        font: Tuple[str, float] = ("Helvetica", 9),
+        header_font: Tuple[str, float] = ("Helvetica-Bold", 9),
+        leading: float = 0.18,  # inches between rows
+        header_gap: float = 0.2,  # inches from the header baseline to the first row
+        band_width: float = 0.0,  # inches of grey band behind the header, 0 for none
+        page_top: float = 10.0,  # inches from the page bottom to the header on continuation pages
+        bottom: float = 1.0,  # inches; no row starts below this
+    ):
+        self.columns = list(columns)
+        self.font = font
+        self.header_font = header_font
+        self.leading = leading * inch
+        self.header_gap = header_gap * inch
+        self.band_width = band_width * inch
+        self.page_top = page_top * inch
+        self.bottom = bottom * inch
+        self._left = [None if col.right is not None else fp_str(col.x * inch) for col in self.columns]
+        self._right = [None if col.right is None else col.right * inch for col in self.columns]
+        self._right_x: Dict[Tuple[int, str], str] = {}  # (column, text) -> x, texts repeat a lot
+
+    def draw_header(self, c: Canvas, y: float) -> float:
+        """Column headers at baseline y; returns the baseline of the first row."""
+        x0 = self.columns[0].x * inch
+        if self.band_width:
+            c.setFillColorRGB(0.9, 0.9, 0.9)
+            c.rect(x0, y - 0.18 * inch, self.band_width, 0.25 * inch, fill=True, stroke=False)
+            c.setFillColor(colors.black)
+        c.setFont(*self.header_font)
+        for col in self.columns:
+            c.drawString(col.x * inch, y, col.header)
+        return y - self.header_gap
+
+    def place(self, row: Sequence[Cell]) -> List[Tuple[str, str]]:
+        # (formatted x, text) of the non-empty cells
+        placed = []
+        for i, text in enumerate(row):
+            if not text:
+                continue
+            x = self._left[i]
+            if x is None:
+                x = self._right_x.get((i, text))
+                if x is None:
+                    if len(self._right_x) >= RIGHT_X_CACHE:
+                        self._right_x.clear()
+                    x = self._right_x[(i, text)] = fp_str(self._right[i] - stringWidth(text, *self.font))
+            placed.append((x, text))
+        return placed
+
+
+class _RowText(PDFTextObject):
+    # Cells are appended as "Tm + Tj" operators with the coordinates already formatted; the escaped
+    # text of each distinct value is kept in `shown`, which is per document (font names are)
+    def add_row(self, y: float, cells: List[Tuple[str, str]], shown: Dict[str, str]) -> None:
+        ys = fp_str(y)
+        for x, text in cells:
+            op = shown.get(text)
+            if op is None:
+                op = shown[text] = self._formatText(text)
+            self._code.append(f"1 0 0 1 {x} {ys} Tm {op}")
+
+
+class Table:
+    """Rows of `layout` drawn on canvas `c`, with the headers at baseline y of the current page."""
+
+    def __init__(self, c: Canvas, layout: TableLayout, y: float):
+        self.c = c
+        self.layout = layout
+        self.y = layout.draw_header(c, y)
+        self._shown: Dict[str, str] = {}
+
+    def draw(self, rows: Iterable[Sequence[Cell]]) -> float:
+        """Draw the rows (consumed lazily); returns the baseline below the last one."""
+        c, layout, y = self.c, self.layout, self.y
+        text: Optional[_RowText] = None
+        for row in rows:
+            if y < layout.bottom:
+                if text is not None:
+                    c.drawText(text)
+                    text = None
+                c.showPage()
+                y = layout.draw_header(c, layout.page_top)
+            if text is None:
+                text = _RowText(c)
+                text.setFont(*layout.font)
+            text.add_row(y, layout.place(row), self._shown)
+            y -= layout.leading
+        if text is not None:
+            c.drawText(text)
+        self.y = y
+        return y
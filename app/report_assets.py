@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+from io import BytesIO
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+from PIL import Image
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+
+from .company_config import CompanyConfig, load_company_config
+
+LOGO_WIDTH = 1.2 * inch  # every report draws the logo this wide
+LOGO_DPI = 300  # wider logos are shrunk to this resolution at LOGO_WIDTH before embedding
+
+
+class HeaderAssets(NamedTuple):
+    company: CompanyConfig
+    logo: Optional[ImageReader]  # decoded and scaled once per process; None without a usable logo
+    # Height of the box the logo is centred in: the original file's pixel height, which is what
+    # drawImage used when given the file path, so the scaled logo lands in the same place
+    logo_box_height: float = 0.0
+
+
+# The logo for the current (path, mtime, size); rebuilt when the config points elsewhere or the file changes
+_lock = threading.Lock()
+_logo_key: Optional[Tuple[str, int, int]] = None
+_logo: Optional[Tuple[ImageReader, float]] = None
+
+
+def header_assets() -> HeaderAssets:
+    cfg = load_company_config()
+    logo = _logo_for(cfg.logo_path)
+    return HeaderAssets(cfg, *logo) if logo else HeaderAssets(cfg, None)
+
+
+def _logo_for(path: str) -> Optional[Tuple[ImageReader, float]]:
+    global _logo_key, _logo
+    if not path:
+        return None
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    key = (path, st.st_mtime_ns, st.st_size)
+    with _lock:
+        if key != _logo_key:
+            _logo, _logo_key = _load_logo(path), key
+        return _logo
+
+
+def _load_logo(path: str) -> Optional[Tuple[ImageReader, float]]:
+    try:
+        with Image.open(path) as im:
+            im.load()
+            box_height = float(im.height)
+            jpeg = im.format == "JPEG"
+            if "transparency" in im.info:
+                im = im.convert("RGBA")
+            elif im.mode not in ("L", "LA", "RGB", "RGBA", "CMYK"):
+                im = im.convert("RGB")
+            max_px = round(LOGO_WIDTH / inch * LOGO_DPI)
+            scaled = im.width > max_px
+            if scaled:
+                im = im.resize((max_px, max(1, round(im.height * max_px / im.width))), Image.LANCZOS)
+            if jpeg:
+                # JPEG bytes go into the PDF as they are (DCT), so keep a JPEG instead of raw pixels
+                buf = BytesIO()
+                if scaled:
+                    im.save(buf, "JPEG", quality=90)
+                else:
+                    buf.write(Path(path).read_bytes())
+                buf.seek(0)
+                reader = ImageReader(buf)
+            else:
+                reader = ImageReader(im)
+        # Decode here, under the lock: drawImage then only reads the cached pixels (it hashes them to
+        # name the XObject), so report threads can share one reader
+        reader.getRGBData()
+        alpha = getattr(reader, "_dataA", None)
+        if alpha is not None:
+            alpha.getRGBData()
+        reader.getSize()
+        return reader, box_height
+    except Exception:
+        return None
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import asdict
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from .company_config import load_company_config
+from .config import REPORT_CACHE_DAYS, REPORT_CACHE_DIR, REPORT_CACHE_MB
+from .models import ReportStamp
+
+# Finished PDFs are kept under REPORT_CACHE_DIR/<key>/<file name>, where the key hashes the report
+# kind, its parameters, the company header and the stamps of the data it prints. Triggers give each
+# (month, aircraft, client) bucket a new random stamp whenever one of its flights or supply lines
+# changes, and the catalog bucket one when a printed catalog name changes. Editing a flight therefore
+# only misses the reports covering its month/aircraft/client, and checking for a hit reads a few
+# primary-key rows. Stamps are random rather than counters so a restored or swapped database file
+# can't repeat a stamp that was cached for other data.
+STAMP_TABLE = "report_stamps"
+CATALOG_BUCKET = (0, 0, 0, 0)
+
+# Bump when a generator's output changes, so PDFs rendered by older code stop matching
+LAYOUT_VERSION = 2
+
+
+def _touch(f: str, where: str = "") -> str:
+    # New stamp for the bucket of flight row `f` (new/old inside a trigger, or an alias in `where`)
+    return f"""INSERT INTO {STAMP_TABLE} (year, month, aircraft_id, client_id, stamp)
+        SELECT CAST(strftime('%Y', {f}.flight_date) AS INTEGER), CAST(strftime('%m', {f}.flight_date) AS INTEGER),
+               {f}.aircraft_id, coalesce({f}.client_id, 0), random()
+        {where or "WHERE true"}
+        ON CONFLICT (year, month, aircraft_id, client_id) DO UPDATE SET stamp = excluded.stamp;"""
+
+
+_TOUCH_CATALOG = f"""INSERT INTO {STAMP_TABLE} (year, month, aircraft_id, client_id, stamp) VALUES (0, 0, 0, 0, random())
+        ON CONFLICT (year, month, aircraft_id, client_id) DO UPDATE SET stamp = excluded.stamp;"""
+_FLIGHT_OF = "FROM flight_logs f WHERE f.id = {}"
+# Catalog columns the PDFs print (through FlightRow)
+_PRINTED_NAMES = [("aircraft", "registration"), ("clients", "name"), ("service_types", "name"), ("supplies", "name")]
+
+STAMP_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_stamp_flight_ai AFTER INSERT ON flight_logs BEGIN
+        {_touch("new")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_stamp_flight_ad AFTER DELETE ON flight_logs BEGIN
+        {_touch("old")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_stamp_flight_au AFTER UPDATE ON flight_logs BEGIN
+        {_touch("old")}
+        {_touch("new")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_stamp_supply_ai AFTER INSERT ON flight_supplies BEGIN
+        {_touch("f", _FLIGHT_OF.format("new.flight_id"))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_stamp_supply_ad AFTER DELETE ON flight_supplies BEGIN
+        {_touch("f", _FLIGHT_OF.format("old.flight_id"))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_stamp_supply_au AFTER UPDATE ON flight_supplies BEGIN
+        {_touch("f", _FLIGHT_OF.format("old.flight_id"))}
+        {_touch("f", _FLIGHT_OF.format("new.flight_id"))}
+    END""",
+]
+for _table, _col in _PRINTED_NAMES:
+    STAMP_DDL += [
+        f"""CREATE TRIGGER IF NOT EXISTS trg_stamp_{_table}_au AFTER UPDATE OF {_col} ON {_table}
+        WHEN old.{_col} IS NOT new.{_col} BEGIN
+            {_TOUCH_CATALOG}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_stamp_{_table}_ad AFTER DELETE ON {_table} BEGIN
+            {_TOUCH_CATALOG}
+        END""",
+    ]
+
+
+def ensure_report_stamps(conn) -> None:
+    """Create the stamp table and triggers; stamp the buckets that already have flights (older DBs)."""
+    ReportStamp.__table__.create(conn, checkfirst=True)
+    for ddl in STAMP_DDL:
+        conn.exec_driver_sql(ddl)
+    conn.exec_driver_sql(
+        f"""INSERT OR IGNORE INTO {STAMP_TABLE} (year, month, aircraft_id, client_id, stamp)
+        SELECT CAST(strftime('%Y', flight_date) AS INTEGER), CAST(strftime('%m', flight_date) AS INTEGER),
+               aircraft_id, coalesce(client_id, 0), random()
+        FROM flight_logs GROUP BY 1, 2, 3, 4"""
+    )
+    conn.exec_driver_sql(_TOUCH_CATALOG)
+
+
+Bucket = Tuple[int, int, int, int, int]  # (year, month, aircraft_id, client_id, stamp)
+
+
+class Stamps(NamedTuple):
+    catalog: Optional[int]
+    buckets: Tuple[Bucket, ...]
+
+    def for_group(self, aircraft_id: int, client_id: Optional[int]) -> "Stamps":
+        # What data_stamps(...) filtered on this aircraft and client returns, without another query
+        return self._replace(buckets=tuple(b for b in self.buckets if b[2] == aircraft_id and b[3] == (client_id or 0)))
+
+
+def data_stamps(
+    session: Session, start: date, end: date, aircraft_id: int | None = None, client_id: int | None = None
+) -> Stamps:
+    """Stamps of the buckets a report of flights from start to end (inclusive, whole months) prints."""
+    conds = [tuple_(ReportStamp.year, ReportStamp.month).between(tuple_(start.year, start.month), tuple_(end.year, end.month))]
+    if aircraft_id is not None:
+        conds.append(ReportStamp.aircraft_id == aircraft_id)
+    if client_id is not None:
+        conds.append(ReportStamp.client_id == client_id)
+    cols = (ReportStamp.year, ReportStamp.month, ReportStamp.aircraft_id, ReportStamp.client_id, ReportStamp.stamp)
+    buckets = session.execute(select(*cols).where(*conds).order_by(*cols[:4])).all()
+    catalog = session.execute(
+        select(ReportStamp.stamp).where(tuple_(*cols[:4]) == tuple_(*CATALOG_BUCKET))
+    ).scalar()
+    return Stamps(catalog, tuple(tuple(b) for b in buckets))
+
+
+def month_stamps(
+    session: Session, year: int, month: int, aircraft_id: int | None = None, client_id: int | None = None
+) -> Stamps:
+    """Stamps of one calendar month, what the monthly reports print."""
+    first = date(year, month, 1)
+    return data_stamps(session, first, first, aircraft_id, client_id)
+
+
+def month_report_params(month: int, year: int, client_name: str, matricula: str) -> Dict[str, Any]:
+    # Same parameters from the Reportes buttons and the month batch, so both find each other's PDFs
+    return {"mes": month, "anio": year, "cliente": client_name, "matricula": matricula}
+
+
+def report_key(kind: str, params: Dict[str, Any], stamps: Stamps) -> str:
+    cfg = load_company_config()
+    logo = None
+    if cfg.logo_path:
+        try:
+            st = os.stat(cfg.logo_path)
+            logo = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+    blob = json.dumps([LAYOUT_VERSION, kind, params, asdict(cfg), logo, stamps], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def fetch_report(key: str, out_dir: Path) -> Optional[Path]:
+    """Copy the cached PDF for `key` into out_dir under its original name; None on a miss."""
+    entry = REPORT_CACHE_DIR / key
+    try:
+        src = next(entry.glob("*.pdf"))
+        out_dir.mkdir(parents=True, exist_ok=True)
+        dest = out_dir / src.name
+        shutil.copyfile(src, dest)
+        os.utime(entry)  # recently used: evicted last
+    except (OSError, StopIteration):
+        return None
+    return dest
+
+
+def store_report(key: str, path: Path, evict: bool = True) -> None:
+    """Keep a copy of the freshly rendered `path` under `key`. Failures only mean no cache entry."""
+    entry = REPORT_CACHE_DIR / key
+    if entry.exists():
+        return
+    # Filled under a private name and renamed, so readers never see a half-copied entry
+    tmp = REPORT_CACHE_DIR / f".{key}.{os.getpid()}.{threading.get_ident()}"
+    try:
+        tmp.mkdir(parents=True)
+        shutil.copyfile(path, tmp / path.name)
+        os.replace(tmp, entry)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        return
+    if evict:
+        evict_reports()
+
+
+def evict_reports(max_mb: float = REPORT_CACHE_MB, max_days: float = REPORT_CACHE_DAYS) -> int:
+    """Drop entries unused for max_days, then the least recently used until the cache fits in max_mb."""
+    entries = []
+    try:
+        with os.scandir(REPORT_CACHE_DIR) as it:
+            dirs = [e for e in it if e.is_dir()]
+    except OSError:
+        return 0
+    for e in dirs:
+        try:
+            with os.scandir(e.path) as files:
+                size = sum(f.stat().st_size for f in files)
+            entries.append((e.stat().st_mtime, size, e.path))
+        except OSError:
+            continue  # removed meanwhile by another process
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    oldest = time.time() - max_days * 86400
+    removed = 0
+    for mtime, size, path in entries:
+        if mtime >= oldest and total <= max_mb * 1024 * 1024:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed += 1
+    return removed
@@ -1,72 +1,148 @@
 from __future__ import annotations
 
 from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterable, Iterator, Optional, Sized
 
+from reportlab import rl_config
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas
 
+from .aggregates import CENT, FlightTotals, SupplyTotals
 from .config import REPORTS_DIR
-from .models import FlightLog
-from .company_config import load_company_config
+from .pdf_layout import Column, ReportCanvas, Table, TableLayout
+from .report_assets import LOGO_WIDTH, header_assets
+from .repository import FlightRow
+from .instrumentation import timed
 
 
-def generate_flights_summary_pdf(flights: List[FlightLog], start: date, end: date) -> Path:
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    filename = REPORTS_DIR / f"reporte_vuelos_{start.isoformat()}_a_{end.isoformat()}.pdf"
+# Page and image streams are only Flate-compressed, not also ASCII85-encoded: without reportlab's C
+# accelerator the pure-Python encoder took longer than drawing the pages, and binary streams are smaller
+rl_config.useA85 = 0
 
-    c = canvas.Canvas(str(filename), pagesize=LETTER)
+# progress(done, total) is called every PROGRESS_EVERY rows; it may raise to abort the render
+ProgressFn = Callable[[int, int], None]
+PROGRESS_EVERY = 100
+
+
+class _RowProgress:
+    # Progress over a list of flights or a stream of them (repository.iter_flight_rows), whose
+    # length the caller may pass as `total`; without it the bar just follows the rows read
+    def __init__(self, progress: Optional[ProgressFn], flights: Iterable[FlightRow], total: Optional[int] = None):
+        self.progress = progress
+        self.total = len(flights) if isinstance(flights, Sized) else total or 0
+        self.done = 0
+
+    def each(self, flights: Iterable[FlightRow]) -> Iterator[FlightRow]:
+        for f in flights:
+            if self.progress and self.done % PROGRESS_EVERY == 0:
+                self.progress(self.done, max(self.total, self.done))
+            self.done += 1
+            yield f
+
+    def finish(self) -> None:
+        if self.progress:
+            self.progress(self.done, self.done)
+
+
+# Column geometry of each report, computed once per process
+SUMMARY_TABLE = TableLayout(
+    [
+        Column("Fecha", 1), Column("Matrícula", 1.9), Column("Cliente", 2.8), Column("Piloto", 4.1),
+        Column("Origen", 5.1), Column("Destino", 5.8), Column("Minutos", 6.5, right=7.0), Column("Aterrizajes", 7.2, right=7.7),
+    ],
+)
+PRE_POST_TABLE = TableLayout(
+    [Column("FECHA VUELO", 1), Column("HORA", 2.3), Column("TIPO DE SERVICIO", 3.2), Column("OBSERVACIONES", 4.4)],
+    font=("Helvetica", 10), header_font=("Helvetica-Bold", 10), leading=0.35, header_gap=0.35, band_width=6.6,
+)
+CONSUMIBLES_TABLE = TableLayout(
+    [
+        Column("FECHA VUELO", 1), Column("HORA", 2.1), Column("TIPO DE SERVICIO", 2.9), Column("CONCEPTO", 4.0),
+        Column("CANT.", 5.3, right=5.6), Column("PRECIO", 5.7, right=6.1), Column("SUBTOTAL", 6.2, right=6.6),
+        Column("VIATICOS", 6.7, right=7.1), Column("IMPORTE", 7.2, right=7.6),
+    ],
+    leading=0.25, header_gap=0.3, band_width=6.6,
+)
+
+
+def _service_time(f: FlightRow) -> str:
+    return f.service_time.strftime("%I:%M %p").lower() if f.service_time else ""
+
+
+def _month_header(c: ReportCanvas, title: str, month: int, year: int, client_name: str, matricula: str) -> None:
+    # Company block and title of the monthly PRE/POST and consumibles reports
+    width, height = LETTER
+    header = header_assets()
+    cfg = header.company
+    if header.logo is not None:
+        c.drawImage(header.logo, 0.8 * inch, height - 1.3 * inch, width=LOGO_WIDTH, height=header.logo_box_height, preserveAspectRatio=True, mask='auto')
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(2.2 * inch, height - 0.8 * inch, (cfg.name or "").upper())
+    c.setFont("Helvetica", 9)
+    if cfg.afac_no:
+        c.drawString(2.2 * inch, height - 1.0 * inch, f"TALLER AERONAUTICO AUTORIZADO AFAC No. {cfg.afac_no}")
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(1 * inch, height - 1.3 * inch, title)
+    c.setFont("Helvetica", 10)
+    c.drawString(1 * inch, height - 1.55 * inch, f"MES {month:02d}    AÑO {year}")
+    c.drawString(4.5 * inch, height - 1.55 * inch, f"CLIENTE  {client_name}")
+    c.drawString(4.5 * inch, height - 1.75 * inch, f"MATRICULA  {matricula}")
+
+
+@timed("pdf")
+def generate_flights_summary_pdf(
+    flights: Iterable[FlightRow],
+    start: date,
+    end: date,
+    progress: Optional[ProgressFn] = None,
+    totals: Optional[FlightTotals] = None,
+    out_dir: Optional[Path] = None,
+) -> Path:
+    """Flights from start to end; `flights` may be a stream (totals.flights then sizes the progress)."""
+    out_dir = out_dir or REPORTS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    filename = out_dir / f"reporte_vuelos_{start.isoformat()}_a_{end.isoformat()}.pdf"
+
+    c = ReportCanvas(str(filename), pagesize=LETTER)
     width, height = LETTER
 
     # Header with company
-    cfg = load_company_config()
-    if cfg.logo_path:
-        try:
-            c.drawImage(cfg.logo_path, 0.8 * inch, height - 1.2 * inch, width=1.2 * inch, preserveAspectRatio=True, mask='auto')
-        except Exception:
-            pass
+    header = header_assets()
+    cfg = header.company
+    if header.logo is not None:
+        c.drawImage(header.logo, 0.8 * inch, height - 1.2 * inch, width=LOGO_WIDTH, height=header.logo_box_height, preserveAspectRatio=True, mask='auto')
     c.setFont("Helvetica-Bold", 14)
     c.drawString(2.2 * inch, height - 1.0 * inch, cfg.name or "Reporte de Vuelos")
     c.setFont("Helvetica", 10)
     c.drawString(2.2 * inch, height - 1.2 * inch, f"Periodo: {start.isoformat()} a {end.isoformat()}")
+    if totals is not None:
+        c.drawString(
+            2.2 * inch, height - 1.4 * inch,
+            f"Vuelos: {totals.flights}    Minutos: {totals.minutes}    Aterrizajes: {totals.landings}",
+        )
 
-    # Table header
-    y = height - 1.6 * inch
-    c.setFont("Helvetica-Bold", 9)
-    headers = ["Fecha", "Matrícula", "Cliente", "Piloto", "Origen", "Destino", "Minutos", "Aterrizajes"]
-    x_positions = [1, 1.9, 2.8, 4.1, 5.1, 5.8, 6.5, 7.2]
-    for h, x in zip(headers, x_positions):
-        c.drawString(x * inch, y, h)
-    y -= 0.2 * inch
-    c.setFont("Helvetica", 9)
-
+    # Without precomputed (SQL) totals, accumulate them while drawing
     total_minutes = 0
     total_landings = 0
 
-    for f in flights:
-        if y < 1 * inch:
-            c.showPage()
-            y = height - 1 * inch
-            c.setFont("Helvetica-Bold", 9)
-            for h, x in zip(headers, x_positions):
-                c.drawString(x * inch, y, h)
-            y -= 0.2 * inch
-            c.setFont("Helvetica", 9)
-
-        c.drawString(1 * inch, y, f.flight_date.isoformat())
-        c.drawString(1.9 * inch, y, f.aircraft.registration if f.aircraft else "-")
-        c.drawString(2.8 * inch, y, (f.client.name if f.client else "-")[:20])
-        c.drawString(4.1 * inch, y, (f.pilot or "-")[:15])
-        c.drawString(5.1 * inch, y, (f.origin or "-")[:5])
-        c.drawString(5.8 * inch, y, (f.destination or "-")[:5])
-        c.drawRightString(7.0 * inch, y, str(f.flight_minutes))
-        c.drawRightString(7.7 * inch, y, str(f.landings))
-        y -= 0.18 * inch
-        total_minutes += int(f.flight_minutes or 0)
-        total_landings += int(f.landings or 0)
+    tracker = _RowProgress(progress, flights, totals.flights if totals is not None else None)
+
+    def rows() -> Iterator[tuple]:
+        nonlocal total_minutes, total_landings
+        for f in tracker.each(flights):
+            yield (
+                f.flight_date.isoformat(), f.registration or "-", (f.client_name or "-")[:20], (f.pilot or "-")[:15],
+                (f.origin or "-")[:5], (f.destination or "-")[:5], str(f.flight_minutes), str(f.landings),
+            )
+            if totals is None:
+                total_minutes += int(f.flight_minutes or 0)
+                total_landings += int(f.landings or 0)
+
+    y = Table(c, SUMMARY_TABLE, height - 1.6 * inch).draw(rows())
+    if totals is not None:
+        total_minutes, total_landings = totals.minutes, totals.landings
 
     # Totals
     y -= 0.2 * inch
@@ -77,167 +153,98 @@ def generate_flights_summary_pdf(flights: List[FlightLog], start: date, end: dat
 
     c.showPage()
     c.save()
+    tracker.finish()
     return filename
 
 
+@timed("pdf")
 def generate_bitacora_pre_post_pdf(
-    flights: List[FlightLog], month: int, year: int, client_name: str, matricula: str
+    flights: Iterable[FlightRow],
+    month: int,
+    year: int,
+    client_name: str,
+    matricula: str,
+    progress: Optional[ProgressFn] = None,
+    out_dir: Optional[Path] = None,
 ) -> Path:
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    filename = REPORTS_DIR / f"bitacora_pre_post_{matricula}_{year}_{month:02d}.pdf"
-    c = canvas.Canvas(str(filename), pagesize=LETTER)
+    out_dir = out_dir or REPORTS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    filename = out_dir / f"bitacora_pre_post_{matricula}_{year}_{month:02d}.pdf"
+    c = ReportCanvas(str(filename), pagesize=LETTER)
     width, height = LETTER
+    _month_header(c, "BITACORA DE PRE Y POST VUELOS", month, year, client_name, matricula)
 
-    # Encabezado
-    cfg = load_company_config()
-    if cfg.logo_path:
-        try:
-            c.drawImage(cfg.logo_path, 0.8 * inch, height - 1.3 * inch, width=1.2 * inch, preserveAspectRatio=True, mask='auto')
-        except Exception:
-            pass
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(2.2 * inch, height - 0.8 * inch, (cfg.name or "").upper())
-    c.setFont("Helvetica", 9)
-    if cfg.afac_no:
-        c.drawString(2.2 * inch, height - 1.0 * inch, f"TALLER AERONAUTICO AUTORIZADO AFAC No. {cfg.afac_no}")
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(1 * inch, height - 1.3 * inch, "BITACORA DE PRE Y POST VUELOS")
-    c.setFont("Helvetica", 10)
-    c.drawString(1 * inch, height - 1.55 * inch, f"MES {month:02d}    AÑO {year}")
-    c.drawString(4.5 * inch, height - 1.55 * inch, f"CLIENTE  {client_name}")
-    c.drawString(4.5 * inch, height - 1.75 * inch, f"MATRICULA  {matricula}")
+    # flights: the month's rows (repository.list_month_rows), printed as they come
+    tracker = _RowProgress(progress, flights)
 
-    # Encabezados de tabla
-    y = height - 2.1 * inch
-    c.setFillColorRGB(0.9, 0.9, 0.9)
-    c.rect(1 * inch, y - 0.18 * inch, 6.6 * inch, 0.25 * inch, fill=True, stroke=False)
-    c.setFillColor(colors.black)
-    c.setFont("Helvetica-Bold", 10)
-    headers = ["FECHA VUELO", "HORA", "TIPO DE SERVICIO", "OBSERVACIONES"]
-    x_positions = [1, 2.3, 3.2, 4.4]
-    for h, x in zip(headers, x_positions):
-        c.drawString(x * inch, y, h)
-    y -= 0.35 * inch
+    def rows() -> Iterator[tuple]:
+        for f in tracker.each(flights):
+            yield f.flight_date.strftime("%d/%m/%Y"), _service_time(f), f.service_label.upper(), (f.notes or "")[:60]
 
-    c.setFont("Helvetica", 10)
-    for f in flights:
-        if f.flight_date.month != month or f.flight_date.year != year:
-            continue
-        if y < 1 * inch:
-            c.showPage()
-            y = height - 1 * inch
-        c.drawString(1 * inch, y, f.flight_date.strftime("%d/%m/%Y"))
-        if f.service_time:
-            c.drawString(2.3 * inch, y, f.service_time.strftime("%I:%M %p").lower())
-        st = f.service_type or (getattr(f, 'service_type_ref', None).name if getattr(f, 'service_type_ref', None) else "")
-        c.drawString(3.2 * inch, y, (st or "").upper())
-        c.drawString(4.4 * inch, y, (f.notes or "")[:60])
-        y -= 0.35 * inch
+    Table(c, PRE_POST_TABLE, height - 2.1 * inch).draw(rows())
 
     c.showPage()
     c.save()
+    tracker.finish()
     return filename
 
 
+@timed("pdf")
 def generate_consumibles_servicios_pdf(
-    flights: List[FlightLog],
+    flights: Iterable[FlightRow],
     month: int,
     year: int,
     client_name: str,
     matricula: str,
+    progress: Optional[ProgressFn] = None,
+    out_dir: Optional[Path] = None,
+    totals: Optional[SupplyTotals] = None,
 ) -> Path:
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    filename = REPORTS_DIR / f"consumibles_servicios_{matricula}_{year}_{month:02d}.pdf"
-    c = canvas.Canvas(str(filename), pagesize=LETTER)
+    out_dir = out_dir or REPORTS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    filename = out_dir / f"consumibles_servicios_{matricula}_{year}_{month:02d}.pdf"
+    c = ReportCanvas(str(filename), pagesize=LETTER)
     width, height = LETTER
+    _month_header(c, "SUMINISTRO DE CONSUMIBLES Y SERVICIOS EN PRE Y POST VUELOS", month, year, client_name, matricula)
 
-    # Header
-    cfg = load_company_config()
-    if cfg.logo_path:
-        try:
-            c.drawImage(cfg.logo_path, 0.8 * inch, height - 1.3 * inch, width=1.2 * inch, preserveAspectRatio=True, mask='auto')
-        except Exception:
-            pass
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(2.2 * inch, height - 0.8 * inch, (cfg.name or "").upper())
-    c.setFont("Helvetica", 9)
-    if cfg.afac_no:
-        c.drawString(2.2 * inch, height - 1.0 * inch, f"TALLER AERONAUTICO AUTORIZADO AFAC No. {cfg.afac_no}")
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(1 * inch, height - 1.3 * inch, "SUMINISTRO DE CONSUMIBLES Y SERVICIOS EN PRE Y POST VUELOS")
-    c.setFont("Helvetica", 10)
-    c.drawString(1 * inch, height - 1.55 * inch, f"MES {month:02d}    AÑO {year}")
-    c.drawString(4.5 * inch, height - 1.55 * inch, f"CLIENTE  {client_name}")
-    c.drawString(4.5 * inch, height - 1.75 * inch, f"MATRICULA  {matricula}")
+    # Without precomputed (SQL) totals, accumulate them while drawing
+    subtotal = Decimal("0.00")
+    total_viaticos = Decimal("0.00")
 
-    # Table header
-    y = height - 2.1 * inch
-    c.setFillColorRGB(0.9, 0.9, 0.9)
-    c.rect(1 * inch, y - 0.18 * inch, 6.6 * inch, 0.25 * inch, fill=True, stroke=False)
-    c.setFillColor(colors.black)
-    c.setFont("Helvetica-Bold", 9)
-    headers = ["FECHA VUELO", "HORA", "TIPO DE SERVICIO", "CONCEPTO", "CANT.", "PRECIO", "SUBTOTAL", "VIATICOS", "IMPORTE"]
-    x = [1, 2.1, 2.9, 4.0, 5.3, 5.7, 6.2, 6.7, 7.2]
-    for h, xp in zip(headers, x):
-        c.drawString(xp * inch, y, h)
-    y -= 0.3 * inch
+    # flights: the month's rows (repository.list_month_rows), printed as they come
+    tracker = _RowProgress(progress, flights)
 
-    c.setFont("Helvetica", 9)
-    subtotal = 0.0
-    total_viaticos = 0.0
-
-    for f in flights:
-        if f.flight_date.month != month or f.flight_date.year != year:
-            continue
-        # If no supplies, print service row only with zeros
-        items = f.supplies or []
-        if not items:
-            if y < 1 * inch:
-                c.showPage(); y = height - 1 * inch
-            c.drawString(1 * inch, y, f.flight_date.strftime("%d/%m/%Y"))
-            if f.service_time:
-                c.drawString(2.1 * inch, y, f.service_time.strftime("%I:%M %p").lower())
-            st = f.service_type or (getattr(f, 'service_type_ref', None).name if getattr(f, 'service_type_ref', None) else "")
-            c.drawString(2.9 * inch, y, (st or "").upper()[:18])
-            c.drawString(4.0 * inch, y, "HORAS EXTRAS")
-            c.drawRightString(5.6 * inch, y, "0")
-            c.drawRightString(6.1 * inch, y, "$0.00")
-            c.drawRightString(6.6 * inch, y, "$0.00")
-            c.drawRightString(7.1 * inch, y, "$0.00")
-            c.drawRightString(7.6 * inch, y, "$0.00")
-            y -= 0.25 * inch
-            continue
-
-        for it in items:
-            if y < 1 * inch:
-                c.showPage(); y = height - 1 * inch
-            c.drawString(1 * inch, y, f.flight_date.strftime("%d/%m/%Y"))
-            if f.service_time:
-                c.drawString(2.1 * inch, y, f.service_time.strftime("%I:%M %p").lower())
-            st = f.service_type or (getattr(f, 'service_type_ref', None).name if getattr(f, 'service_type_ref', None) else "")
-            c.drawString(2.9 * inch, y, (st or "").upper()[:18])
-            c.drawString(4.0 * inch, y, it.supply.name[:22])
-            c.drawRightString(5.6 * inch, y, f"{float(it.quantity):.0f}")
-            c.drawRightString(6.1 * inch, y, f"${float(it.unit_cost):,.2f}")
-            sub = float(it.quantity) * float(it.unit_cost)
-            c.drawRightString(6.6 * inch, y, f"${sub:,.2f}")
-            c.drawRightString(7.1 * inch, y, f"${float(it.viaticos):,.2f}")
-            total = sub + float(it.viaticos)
-            c.drawRightString(7.6 * inch, y, f"${total:,.2f}")
-            subtotal += sub
-            total_viaticos += float(it.viaticos)
-            y -= 0.25 * inch
+    def rows() -> Iterator[tuple]:
+        nonlocal subtotal, total_viaticos
+        for f in tracker.each(flights):
+            day, hour, service = f.flight_date.strftime("%d/%m/%Y"), _service_time(f), f.service_label.upper()[:18]
+            # If no supplies, print service row only with zeros
+            if not f.supplies:
+                yield day, hour, service, "HORAS EXTRAS", "0", "$0.00", "$0.00", "$0.00", "$0.00"
+                continue
+            for it in f.supplies:
+                sub = (Decimal(it.quantity) * Decimal(it.unit_cost)).quantize(CENT, rounding=ROUND_HALF_UP)
+                viaticos = Decimal(it.viaticos).quantize(CENT, rounding=ROUND_HALF_UP)
+                yield (
+                    day, hour, service, it.supply_name[:22], f"{it.quantity:.0f}", f"${it.unit_cost:,.2f}",
+                    f"${sub:,.2f}", f"${viaticos:,.2f}", f"${sub + viaticos:,.2f}",
+                )
+                if totals is None:
+                    subtotal += sub
+                    total_viaticos += viaticos
+
+    y = Table(c, CONSUMIBLES_TABLE, height - 2.1 * inch).draw(rows())
 
     # Totales al pie
+    if totals is None:
+        totals = SupplyTotals(subtotal, total_viaticos)
     y -= 0.2 * inch
     c.setFont("Helvetica-Bold", 10)
-    c.drawRightString(6.6 * inch, y, f"${subtotal:,.2f}")
-    c.drawRightString(7.1 * inch, y, f"${total_viaticos:,.2f}")
-    importe = subtotal + total_viaticos
+    c.drawRightString(6.6 * inch, y, f"${totals.subtotal:,.2f}")
+    c.drawRightString(7.1 * inch, y, f"${totals.viaticos:,.2f}")
+    importe, iva, total = totals.importe, totals.iva, totals.total
     c.drawRightString(7.6 * inch, y, f"${importe:,.2f}")
     y -= 0.3 * inch
-    iva = importe * 0.16
-    total = importe + iva
     # Caja de totales a la derecha
     c.setFont("Helvetica-Bold", 11)
     c.drawString(6.0 * inch, y, "IMPORTE:")
@@ -251,4 +258,5 @@ def generate_consumibles_servicios_pdf(
 
     c.showPage()
     c.save()
+    tracker.finish()
     return filename
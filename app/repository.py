@@ -1,41 +1,26 @@
 from __future__ import annotations
 
-from datetime import date, time
-from typing import List, Optional, Tuple
+from datetime import date, time, timedelta
+from decimal import Decimal
+from itertools import groupby
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-from sqlalchemy import select, func
+from sqlalchemy import Engine, and_, column, literal_column, or_, select, func, table, text, tuple_
 from sqlalchemy.orm import Session, selectinload
 
-from .db import Base, engine
+from .config import DB_PATH
+from .db import engine, get_session
+from .fts import FTS_TABLE, FTS_WEIGHTS, match_query
+from .migrations import migrate
 from .models import Aircraft, Client, FlightLog, FlightSupply, Supply, Mechanic, ServiceType, Concept
 
 
-def init_db() -> None:
-    Base.metadata.create_all(bind=engine)
-    # Lightweight migrations for existing SQLite DBs
-    with engine.begin() as conn:
-        # FlightLog: service_type (VARCHAR), service_time (TIME)
-        cols = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info('flight_logs')").fetchall()}
-        if 'service_type' not in cols:
-            conn.exec_driver_sql("ALTER TABLE flight_logs ADD COLUMN service_type VARCHAR(60)")
-        if 'service_time' not in cols:
-            conn.exec_driver_sql("ALTER TABLE flight_logs ADD COLUMN service_time TIME")
-        # FlightSupply: viaticos (NUMERIC)
-        cols = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info('flight_supplies')").fetchall()}
-        if 'viaticos' not in cols:
-            conn.exec_driver_sql("ALTER TABLE flight_supplies ADD COLUMN viaticos NUMERIC(12,2) DEFAULT 0")
-        # New catalogs tables may not exist if metadata.create_all didn't create them (older DB)
-        conn.exec_driver_sql("CREATE TABLE IF NOT EXISTS mechanics (id INTEGER PRIMARY KEY AUTOINCREMENT, name VARCHAR(120) NOT NULL, UNIQUE(name))")
-        conn.exec_driver_sql("CREATE TABLE IF NOT EXISTS service_types (id INTEGER PRIMARY KEY AUTOINCREMENT, name VARCHAR(120) NOT NULL, UNIQUE(name))")
-        conn.exec_driver_sql("CREATE TABLE IF NOT EXISTS concepts (id INTEGER PRIMARY KEY AUTOINCREMENT, name VARCHAR(150) NOT NULL, UNIQUE(name))")
-        # Add nullable FKs in flight_logs
-        cols = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info('flight_logs')").fetchall()}
-        if 'mechanic_id' not in cols:
-            conn.exec_driver_sql("ALTER TABLE flight_logs ADD COLUMN mechanic_id INTEGER REFERENCES mechanics(id)")
-        if 'service_type_id' not in cols:
-            conn.exec_driver_sql("ALTER TABLE flight_logs ADD COLUMN service_type_id INTEGER REFERENCES service_types(id)")
-        if 'concept_id' not in cols:
-            conn.exec_driver_sql("ALTER TABLE flight_logs ADD COLUMN concept_id INTEGER REFERENCES concepts(id)")
+def init_db(bind: Engine | None = None) -> None:
+    # Versioned steps in app/migrations.py; on an up-to-date database this reads one PRAGMA
+    if bind is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        bind = engine
+    migrate(bind)
 
 
 # Generic helpers
@@ -118,7 +103,13 @@ def add_aircraft(session: Session, registration: str, model: str | None = None)
     return a
 
 
-def list_flights_in_range(session: Session, start: date, end: date) -> List[FlightLog]:
+def list_flights_in_range(
+    session: Session,
+    start: date,
+    end: date,
+    aircraft_id: int | None = None,
+    client_id: int | None = None,
+) -> List[FlightLog]:
     stmt = (
         select(FlightLog)
         .options(
@@ -129,12 +120,370 @@ def list_flights_in_range(session: Session, start: date, end: date) -> List[Flig
             selectinload(FlightLog.concept),
             selectinload(FlightLog.supplies).selectinload(FlightSupply.supply),
         )
-        .where(FlightLog.flight_date.between(start, end))
+        # Optional report filters go into the WHERE clause so selectinload only fetches matching rows
+        .where(*flight_filters(start, end, aircraft_id, client_id))
         .order_by(FlightLog.flight_date)
     )
     return list(session.scalars(stmt))
 
 
+# Row views: flat tuples with just the columns tables and PDFs read, one joined SELECT
+class SupplyRow(NamedTuple):
+    flight_id: int
+    supply_name: str
+    quantity: Decimal
+    unit_cost: Decimal
+    viaticos: Decimal
+
+
+class FlightRow(NamedTuple):
+    id: int
+    flight_date: date
+    aircraft_id: int
+    registration: str
+    client_id: Optional[int]
+    client_name: str
+    pilot: str
+    origin: str
+    destination: str
+    service_label: str  # legacy service_type text, else the ServiceType catalog name
+    service_time: Optional[time]
+    mechanic_name: str
+    concept_name: str
+    flight_minutes: int
+    landings: int
+    notes: Optional[str]
+    supplies: Tuple[SupplyRow, ...] = ()
+
+
+def _flight_row_select():
+    return (
+        select(
+            FlightLog.id,
+            FlightLog.flight_date,
+            FlightLog.aircraft_id,
+            func.coalesce(Aircraft.registration, ""),
+            FlightLog.client_id,
+            func.coalesce(Client.name, ""),
+            FlightLog.pilot,
+            FlightLog.origin,
+            FlightLog.destination,
+            func.coalesce(func.nullif(FlightLog.service_type, ""), ServiceType.name, ""),
+            FlightLog.service_time,
+            func.coalesce(Mechanic.name, ""),
+            func.coalesce(Concept.name, ""),
+            FlightLog.flight_minutes,
+            FlightLog.landings,
+            FlightLog.notes,
+        )
+        .select_from(FlightLog)
+        .outerjoin(Aircraft, FlightLog.aircraft_id == Aircraft.id)
+        .outerjoin(Client, FlightLog.client_id == Client.id)
+        .outerjoin(ServiceType, FlightLog.service_type_id == ServiceType.id)
+        .outerjoin(Mechanic, FlightLog.mechanic_id == Mechanic.id)
+        .outerjoin(Concept, FlightLog.concept_id == Concept.id)
+    )
+
+
+def flight_filters(start: date, end: date, aircraft_id: int | None, client_id: int | None) -> list:
+    return [FlightLog.flight_date.between(start, end), *_owner_filters(aircraft_id, client_id)]
+
+
+def _owner_filters(aircraft_id: int | None, client_id: int | None) -> list:
+    conds = []
+    if aircraft_id is not None:
+        conds.append(FlightLog.aircraft_id == aircraft_id)
+    if client_id is not None:
+        conds.append(FlightLog.client_id == client_id)
+    return conds
+
+
+def list_flight_rows(
+    session: Session,
+    start: date,
+    end: date,
+    aircraft_id: int | None = None,
+    client_id: int | None = None,
+    with_supplies: bool = False,
+) -> List[FlightRow]:
+    conds = flight_filters(start, end, aircraft_id, client_id)
+    stmt = _flight_row_select().where(*conds).order_by(FlightLog.flight_date, FlightLog.id)
+    rows = [FlightRow(*r) for r in session.execute(stmt)]
+    if not with_supplies or not rows:
+        return rows
+    return _attach_supplies(session, rows, FlightSupply.flight_id.in_(select(FlightLog.id).where(*conds)))
+
+
+FLIGHT_ROW_CHUNK = 2_000
+
+
+def iter_flight_rows(
+    session: Session,
+    start: date,
+    end: date,
+    aircraft_id: int | None = None,
+    client_id: int | None = None,
+    with_supplies: bool = False,
+) -> Iterator[FlightRow]:
+    """The rows of list_flight_rows, fetched FLIGHT_ROW_CHUNK at a time from a streaming cursor.
+
+    Supplies are read per chunk, so memory stays bounded by the chunk whatever the date range.
+    The session must stay open until the iterator is exhausted.
+    """
+    stmt = _flight_row_select().where(*flight_filters(start, end, aircraft_id, client_id)).order_by(FlightLog.flight_date, FlightLog.id)
+    result = session.execute(stmt, execution_options={"stream_results": True, "yield_per": FLIGHT_ROW_CHUNK})
+    for chunk in result.partitions():
+        rows = [FlightRow(*r) for r in chunk]
+        if with_supplies:
+            rows = _attach_supplies(session, rows, FlightSupply.flight_id.in_([row.id for row in rows]))
+        yield from rows
+
+
+def list_flight_rows_after(
+    session: Session,
+    start: date,
+    end: date,
+    after: PageKey | None = None,
+    limit: int = FLIGHT_ROW_CHUNK,
+    aircraft_id: int | None = None,
+    client_id: int | None = None,
+) -> List[FlightRow]:
+    """Up to `limit` rows of list_flight_rows following keyset `after` (flight_date, id)."""
+    stmt = _flight_row_select().where(*flight_filters(start, end, aircraft_id, client_id))
+    if after is not None:
+        stmt = stmt.where(tuple_(FlightLog.flight_date, FlightLog.id) > tuple_(*after))
+    stmt = stmt.order_by(FlightLog.flight_date, FlightLog.id).limit(limit)
+    return [FlightRow(*r) for r in session.execute(stmt)]
+
+
+def page_flight_rows(
+    start: date, end: date, aircraft_id: int | None = None, client_id: int | None = None, limit: int = FLIGHT_ROW_CHUNK
+) -> Iterator[FlightRow]:
+    """The rows of list_flight_rows, read lazily `limit` at a time, each chunk in its own short session.
+
+    Unlike iter_flight_rows no session stays open between chunks, so a consumer may take its
+    time (a table model pulling rows as the user scrolls); only the rows consumed stay in memory.
+    """
+    after = None
+    while True:
+        with get_session() as s:
+            rows = list_flight_rows_after(s, start, end, after, limit, aircraft_id, client_id)
+        yield from rows
+        if len(rows) < limit:
+            return
+        after = (rows[-1].flight_date, rows[-1].id)
+
+
+def month_range(year: int, month: int) -> Tuple[date, date]:
+    """First day of the month and of the next one: the month is [start, end)."""
+    return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+
+
+def month_filters(year: int, month: int, aircraft_id: int | None, client_id: int | None) -> list:
+    # Half-open, so the first day of the next month stays out; the date indexes serve both bounds
+    start, end = month_range(year, month)
+    return [FlightLog.flight_date >= start, FlightLog.flight_date < end, *_owner_filters(aircraft_id, client_id)]
+
+
+def list_month_rows(
+    session: Session,
+    year: int,
+    month: int,
+    aircraft_id: int | None = None,
+    client_id: int | None = None,
+    with_supplies: bool = False,
+) -> List[FlightRow]:
+    """Flights of exactly one calendar month, by date: the rows a monthly report prints."""
+    conds = month_filters(year, month, aircraft_id, client_id)
+    stmt = _flight_row_select().where(*conds).order_by(FlightLog.flight_date, FlightLog.id)
+    rows = [FlightRow(*r) for r in session.execute(stmt)]
+    if not with_supplies or not rows:
+        return rows
+    return _attach_supplies(session, rows, FlightSupply.flight_id.in_(select(FlightLog.id).where(*conds)))
+
+
+GroupKey = Tuple[int, Optional[int]]  # (aircraft_id, client_id)
+
+
+def month_flight_groups(session: Session, year: int, month: int, with_supplies: bool = False) -> Dict[GroupKey, List[FlightRow]]:
+    """The month's flights per (aircraft, client) pair, each group by date; pairs in id order."""
+    conds = month_filters(year, month, None, None)
+    stmt = _flight_row_select().where(*conds).order_by(
+        FlightLog.aircraft_id, FlightLog.client_id, FlightLog.flight_date, FlightLog.id
+    )
+    rows = [FlightRow(*r) for r in session.execute(stmt)]
+    if with_supplies and rows:
+        rows = _attach_supplies(session, rows, FlightSupply.flight_id.in_(select(FlightLog.id).where(*conds)))
+    return {key: list(group) for key, group in groupby(rows, key=lambda f: (f.aircraft_id, f.client_id))}
+
+
+def _attach_supplies(session: Session, rows: List[FlightRow], flights_cond) -> List[FlightRow]:
+    by_flight: dict[int, list[SupplyRow]] = {}
+    sup_stmt = (
+        select(FlightSupply.flight_id, Supply.name, FlightSupply.quantity, FlightSupply.unit_cost, FlightSupply.viaticos)
+        .join(Supply, FlightSupply.supply_id == Supply.id)
+        .where(flights_cond)
+        .order_by(FlightSupply.flight_id, FlightSupply.id)
+    )
+    for r in session.execute(sup_stmt):
+        by_flight.setdefault(r[0], []).append(SupplyRow(*r))
+    return [row._replace(supplies=tuple(by_flight[row.id])) if row.id in by_flight else row for row in rows]
+
+
+PageKey = Tuple[date, int]  # (flight_date, id)
+FLIGHT_PAGE_SIZE = 200
+
+
+class FlightPage(NamedTuple):
+    rows: List[FlightRow]  # newest first
+    has_newer: bool
+    has_older: bool
+
+    @property
+    def first_key(self) -> Optional[PageKey]:
+        return (self.rows[0].flight_date, self.rows[0].id) if self.rows else None
+
+    @property
+    def last_key(self) -> Optional[PageKey]:
+        return (self.rows[-1].flight_date, self.rows[-1].id) if self.rows else None
+
+
+def browse_filters(
+    aircraft_id: int | None = None,
+    client_id: int | None = None,
+    mechanic_id: int | None = None,
+    service_type_id: int | None = None,
+) -> list:
+    conds = []
+    for col, value in (
+        (FlightLog.aircraft_id, aircraft_id),
+        (FlightLog.client_id, client_id),
+        (FlightLog.mechanic_id, mechanic_id),
+        (FlightLog.service_type_id, service_type_id),
+    ):
+        if value is not None:
+            conds.append(col == value)
+    return conds
+
+
+def date_page_key(day: date) -> PageKey:
+    # Cursor just past every flight of `day`, so older_than=date_page_key(d) starts at d's flights
+    return (day + timedelta(days=1), 0)
+
+
+def list_flight_page(
+    session: Session,
+    older_than: PageKey | None = None,
+    newer_than: PageKey | None = None,
+    limit: int = FLIGHT_PAGE_SIZE,
+    aircraft_id: int | None = None,
+    client_id: int | None = None,
+    mechanic_id: int | None = None,
+    service_type_id: int | None = None,
+) -> FlightPage:
+    """One page of flights ordered newest first, by keyset on (flight_date, id).
+
+    With neither cursor the newest page is returned; `older_than` gives the page after a
+    previous page's last_key, `newer_than` the page before its first_key. Each page is an
+    index range scan of `limit` rows, so its cost doesn't grow with the table.
+    """
+    conds = browse_filters(aircraft_id, client_id, mechanic_id, service_type_id)
+    key = tuple_(FlightLog.flight_date, FlightLog.id)
+    stmt = _flight_row_select().where(*conds).limit(limit + 1)
+    if newer_than is not None:
+        stmt = stmt.where(key > tuple_(*newer_than)).order_by(FlightLog.flight_date, FlightLog.id)
+        rows = [FlightRow(*r) for r in session.execute(stmt)]
+        more, rows = len(rows) > limit, rows[:limit][::-1]
+        page = FlightPage(rows, more, True)
+    else:
+        if older_than is not None:
+            stmt = stmt.where(key < tuple_(*older_than))
+        stmt = stmt.order_by(FlightLog.flight_date.desc(), FlightLog.id.desc())
+        rows = [FlightRow(*r) for r in session.execute(stmt)]
+        page = FlightPage(rows[:limit], older_than is not None, len(rows) > limit)
+    if not page.rows:
+        return page
+    # The side we didn't scan was only assumed to have rows; confirm with a one-row probe
+    if newer_than is not None:
+        probe = key < tuple_(*page.last_key)
+        return page._replace(has_older=_exists(session, conds, probe))
+    if older_than is not None:
+        probe = key > tuple_(*page.first_key)
+        return page._replace(has_newer=_exists(session, conds, probe))
+    return page
+
+
+def _exists(session: Session, conds: list, cond) -> bool:
+    return session.scalar(select(FlightLog.id).where(*conds, cond).limit(1)) is not None
+
+
+class SearchHit(NamedTuple):
+    row: FlightRow
+    score: float  # bm25, lower is better
+    snippet: str
+
+
+SEARCH_LIMIT = 200
+
+
+def search_flights(
+    session: Session,
+    words: str,
+    limit: int = SEARCH_LIMIT,
+    start: date | None = None,
+    end: date | None = None,
+    aircraft_id: int | None = None,
+    client_id: int | None = None,
+    mechanic_id: int | None = None,
+    service_type_id: int | None = None,
+) -> List[SearchHit]:
+    """Flights whose notes, route, pilot or catalog names contain every word of `words` (as prefixes).
+
+    Ranked by bm25 over the flight_search FTS5 table; the snippet marks the matches with [ ].
+    On SQLite builds without FTS5 it degrades to a LIKE scan ordered by date.
+    """
+    query = match_query(words)
+    if not query:
+        return []
+    conds = browse_filters(aircraft_id, client_id, mechanic_id, service_type_id)
+    if start is not None:
+        conds.append(FlightLog.flight_date >= start)
+    if end is not None:
+        conds.append(FlightLog.flight_date <= end)
+
+    fts_ready = session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first()
+    if fts_ready:
+        fts = table(FTS_TABLE, column("rowid"))
+        doc = literal_column(FTS_TABLE)
+        score = func.bm25(doc, *FTS_WEIGHTS).label("score")
+        stmt = (
+            select(fts.c.rowid, score, func.snippet(doc, -1, "[", "]", "…", 10))
+            .where(doc.op("MATCH")(query))
+            .order_by(score)
+            .limit(limit)
+        )
+        if conds:
+            stmt = stmt.select_from(fts.join(FlightLog, FlightLog.id == fts.c.rowid)).where(*conds)
+        ranked = [(r[0], r[1], r[2] or "") for r in session.execute(stmt)]
+    else:
+        terms = query.replace('"', "").replace("*", "").split()
+        fields = (FlightLog.notes, FlightLog.origin, FlightLog.destination, FlightLog.pilot)
+        like = and_(*[or_(*[f.ilike(f"%{t}%") for f in fields]) for t in terms])
+        stmt = (
+            select(FlightLog.id, literal_column("0.0"), func.coalesce(FlightLog.notes, ""))
+            .where(like, *conds)
+            .order_by(FlightLog.flight_date.desc(), FlightLog.id.desc())
+            .limit(limit)
+        )
+        ranked = [tuple(r) for r in session.execute(stmt)]
+    if not ranked:
+        return []
+    rows = {r[0]: FlightRow(*r) for r in session.execute(_flight_row_select().where(FlightLog.id.in_([h[0] for h in ranked])))}
+    return [SearchHit(rows[fid], score, snip) for fid, score, snip in ranked if fid in rows]
+
+
 def add_flight(
     session: Session,
     flight_date: date,
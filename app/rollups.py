@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+# Monthly totals per (year, month, aircraft, client) in the monthly_rollups table (models.MonthlyRollup).
+# Triggers on flight_logs and flight_supplies apply every insert/update/delete as a delta, so the
+# ORM handlers, the importer's Core inserts and manual SQL all keep it current. Money is stored in
+# cents with the same per-line rounding as aggregates.line_cents.
+ROLLUP_TABLE = "monthly_rollups"
+
+
+def _line_cents(s: str) -> str:
+    return f"(CAST(round({s}.quantity * 100) AS INTEGER) * CAST(round({s}.unit_cost * 100) AS INTEGER) + 50) / 100"
+
+
+def _viaticos_cents(s: str) -> str:
+    return f"CAST(round({s}.viaticos * 100) AS INTEGER)"
+
+
+def _supply_cents(flight_id: str) -> tuple[str, str]:
+    # (subtotal, viaticos) of all supply lines of one flight
+    return (
+        f"(SELECT coalesce(sum({_line_cents('s')}), 0) FROM flight_supplies s WHERE s.flight_id = {flight_id})",
+        f"(SELECT coalesce(sum({_viaticos_cents('s')}), 0) FROM flight_supplies s WHERE s.flight_id = {flight_id})",
+    )
+
+
+def _bump(f: str, flights: str, minutes: str, landings: str, sub: str, via: str, where: str = "") -> str:
+    # Adds the deltas to the bucket of flight row `f` (new/old inside a trigger, or an alias in `where`)
+    return f"""INSERT INTO {ROLLUP_TABLE} (year, month, aircraft_id, client_id, flights, minutes, landings, subtotal_cents, viaticos_cents)
+        SELECT CAST(strftime('%Y', {f}.flight_date) AS INTEGER), CAST(strftime('%m', {f}.flight_date) AS INTEGER),
+               {f}.aircraft_id, coalesce({f}.client_id, 0), {flights}, {minutes}, {landings}, {sub}, {via}
+        {where or "WHERE true"}
+        ON CONFLICT (year, month, aircraft_id, client_id) DO UPDATE SET
+            flights = flights + excluded.flights,
+            minutes = minutes + excluded.minutes,
+            landings = landings + excluded.landings,
+            subtotal_cents = subtotal_cents + excluded.subtotal_cents,
+            viaticos_cents = viaticos_cents + excluded.viaticos_cents;"""
+
+
+def _drop_empty(f: str) -> str:
+    return f"""DELETE FROM {ROLLUP_TABLE}
+        WHERE year = CAST(strftime('%Y', {f}.flight_date) AS INTEGER) AND month = CAST(strftime('%m', {f}.flight_date) AS INTEGER)
+          AND aircraft_id = {f}.aircraft_id AND client_id = coalesce({f}.client_id, 0)
+          AND flights = 0 AND subtotal_cents = 0 AND viaticos_cents = 0;"""
+
+
+_OLD_SUB, _OLD_VIA = _supply_cents("old.id")
+_NEW_SUB, _NEW_VIA = _supply_cents("new.id")
+_FLIGHT_OF = "FROM flight_logs f WHERE f.id = {}"
+
+ROLLUP_DDL = [
+    # A new flight has no supply lines yet; they are added by the flight_supplies triggers
+    f"""CREATE TRIGGER IF NOT EXISTS trg_rollup_flight_ai AFTER INSERT ON flight_logs BEGIN
+        {_bump("new", "1", "new.flight_minutes", "new.landings", "0", "0")}
+    END""",
+    # Deleting a flight removes its remaining supply lines' money too (the ORM deletes the lines
+    # first, in which case these sums are 0)
+    f"""CREATE TRIGGER IF NOT EXISTS trg_rollup_flight_ad AFTER DELETE ON flight_logs BEGIN
+        {_bump("old", "-1", "-old.flight_minutes", "-old.landings", f"-{_OLD_SUB}", f"-{_OLD_VIA}")}
+        {_drop_empty("old")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_rollup_flight_au
+    AFTER UPDATE OF flight_date, aircraft_id, client_id, flight_minutes, landings ON flight_logs
+    WHEN old.flight_date IS NOT new.flight_date OR old.aircraft_id IS NOT new.aircraft_id
+      OR old.client_id IS NOT new.client_id OR old.flight_minutes IS NOT new.flight_minutes
+      OR old.landings IS NOT new.landings BEGIN
+        {_bump("old", "-1", "-old.flight_minutes", "-old.landings", f"-{_OLD_SUB}", f"-{_OLD_VIA}")}
+        {_bump("new", "1", "new.flight_minutes", "new.landings", _NEW_SUB, _NEW_VIA)}
+        {_drop_empty("old")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_rollup_supply_ai AFTER INSERT ON flight_supplies BEGIN
+        {_bump("f", "0", "0", "0", _line_cents("new"), _viaticos_cents("new"), _FLIGHT_OF.format("new.flight_id"))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_rollup_supply_ad AFTER DELETE ON flight_supplies BEGIN
+        {_bump("f", "0", "0", "0", f"-{_line_cents('old')}", f"-{_viaticos_cents('old')}", _FLIGHT_OF.format("old.flight_id"))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_rollup_supply_au
+    AFTER UPDATE OF flight_id, quantity, unit_cost, viaticos ON flight_supplies BEGIN
+        {_bump("f", "0", "0", "0", f"-{_line_cents('old')}", f"-{_viaticos_cents('old')}", _FLIGHT_OF.format("old.flight_id"))}
+        {_bump("f", "0", "0", "0", _line_cents("new"), _viaticos_cents("new"), _FLIGHT_OF.format("new.flight_id"))}
+    END""",
+]
+
+_REBUILD = f"""
+INSERT INTO {ROLLUP_TABLE} (year, month, aircraft_id, client_id, flights, minutes, landings, subtotal_cents, viaticos_cents)
+SELECT CAST(strftime('%Y', f.flight_date) AS INTEGER), CAST(strftime('%m', f.flight_date) AS INTEGER),
+       f.aircraft_id, coalesce(f.client_id, 0), count(*), coalesce(sum(f.flight_minutes), 0), coalesce(sum(f.landings), 0),
+       coalesce(sum(s.sub), 0), coalesce(sum(s.via), 0)
+FROM flight_logs f
+LEFT JOIN (
+    SELECT flight_id, sum({_line_cents('flight_supplies')}) AS sub, sum({_viaticos_cents('flight_supplies')}) AS via
+    FROM flight_supplies GROUP BY flight_id
+) s ON s.flight_id = f.id
+GROUP BY 1, 2, 3, 4
+"""
+
+
+def ensure_rollups(conn) -> None:
+    """Create the sync triggers; fill the table when it is empty but there are flights (older DBs)."""
+    for ddl in ROLLUP_DDL:
+        conn.exec_driver_sql(ddl)
+    empty = conn.exec_driver_sql(f"SELECT NOT EXISTS (SELECT 1 FROM {ROLLUP_TABLE})").scalar()
+    if empty and conn.exec_driver_sql("SELECT EXISTS (SELECT 1 FROM flight_logs)").scalar():
+        rebuild_rollups(conn)
+
+
+def rebuild_rollups(conn) -> int:
+    """Recompute every bucket from flight_logs/flight_supplies; returns the number of buckets."""
+    conn.exec_driver_sql(f"DELETE FROM {ROLLUP_TABLE}")
+    conn.exec_driver_sql(_REBUILD)
+    return conn.exec_driver_sql(f"SELECT count(*) FROM {ROLLUP_TABLE}").scalar()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import date, time
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from PySide6 import QtCore
+
+from .instrumentation import span
+
+
+def format_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, time):
+        return value.strftime("%H:%M")
+    if isinstance(value, (float, Decimal)):
+        return f"{float(value):.2f}"
+    return str(value)
+
+
+class RowTableModel(QtCore.QAbstractTableModel):
+    """Read-only table over compact row tuples, pulled from an iterable in pages.
+
+    Rows keep their raw values; display strings are built only for the cells the
+    view actually paints. The source iterable is consumed lazily through
+    canFetchMore/fetchMore as the user scrolls.
+    """
+
+    def __init__(
+        self,
+        headers: Sequence[str],
+        formatters: Optional[Dict[int, Callable[[Any], str]]] = None,
+        page_size: int = 500,
+        parent: Optional[QtCore.QObject] = None,
+    ):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._formatters = formatters or {}
+        self._page_size = page_size
+        self._rows: List[tuple] = []
+        self._source: Iterator[tuple] = iter(())
+        self._exhausted = True
+
+    def set_rows(self, rows: Iterable[tuple]) -> None:
+        with span("tabla"):
+            self.beginResetModel()
+            self._rows = []
+            self._source = iter(rows)
+            self._exhausted = False
+            self.endResetModel()
+            # First page right away so selection/scroll state is meaningful before the view asks
+            self.fetchMore(QtCore.QModelIndex())
+
+    def set_headers(self, headers: Sequence[str], formatters: Optional[Dict[int, Callable[[Any], str]]] = None) -> None:
+        self.beginResetModel()
+        self._headers = list(headers)
+        self._formatters = formatters or {}
+        self._rows = []
+        self._source = iter(())
+        self._exhausted = True
+        self.endResetModel()
+
+    def row(self, i: int) -> tuple:
+        return self._rows[i]
+
+    # Qt model API
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if role != QtCore.Qt.DisplayRole or not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column()]
+        fmt = self._formatters.get(index.column(), format_cell)
+        return fmt(value)
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return str(section + 1)
+
+    def canFetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> None:
+        if parent.isValid() or self._exhausted:
+            return
+        page = list(islice(self._source, self._page_size))
+        if len(page) < self._page_size:
+            self._exhausted = True
+        if not page:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
@@ -2,8 +2,31 @@ from __future__ import annotations
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
+from .table_models import RowTableModel
+
+
+REPORT_PREVIEW_HEADERS = ["Fecha", "Matrícula", "Cliente", "Tipo Serv.", "Mecánico", "Concepto", "Hora", "Origen", "Destino", "Minutos", "Aterrizajes"]
+REPORT_TREND_HEADERS = ["Año", "Mes", "Vuelos", "Minutos", "Aterrizajes", "Subtotal", "Viáticos", "Importe"]
+REPORT_SEARCH_HEADERS = ["Fecha", "Matrícula", "Cliente", "Piloto", "Ruta", "Coincidencia"]
+REPORT_DASHBOARD_HEADERS = ["Agrupación", "Nombre", "Vuelos", "Minutos", "Aterrizajes", "Cantidad", "Subtotal", "Viáticos", "Importe"]
+
+
+# Sidebar entries in order: (page name, label). Each page is built by _build_<name>_page on its first visit.
+PAGES = [
+    ("clients", "Clientes"),
+    ("supplies", "Insumos"),
+    ("aircraft", "Aeronaves"),
+    ("flights", "Vuelos"),
+    ("catalogs", "Catálogos"),
+    ("reports", "Reportes"),
+    ("settings", "Configuración"),
+]
+
 
 class MainWindow(QtWidgets.QMainWindow):
+    # Emitted every time a page becomes current: (page name, True on the visit that built it)
+    page_shown = QtCore.Signal(str, bool)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Bitácoras de Vuelos - Mantenimiento Aéreo")
@@ -16,33 +39,47 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Sidebar
         self.menu_list = QtWidgets.QListWidget()
-        self.menu_list.addItems(["Clientes", "Insumos", "Aeronaves", "Vuelos", "Catálogos", "Reportes", "Configuración"]) 
+        self.menu_list.addItems([label for _, label in PAGES])
         self.menu_list.setFixedWidth(180)
         layout.addWidget(self.menu_list)
 
-        # Stacked pages
+        # Stacked pages: empty placeholders until each page is first shown
         self.stack = QtWidgets.QStackedWidget()
         layout.addWidget(self.stack, 1)
+        self.pages: dict[str, QtWidgets.QWidget] = {}
+        for _ in PAGES:
+            self.stack.addWidget(QtWidgets.QWidget())
 
-        self.page_clients = self._build_clients_page()
-        self.page_supplies = self._build_supplies_page()
-        self.page_aircraft = self._build_aircraft_page()
-        self.page_flights = self._build_flights_page()
-        self.page_catalogs = self._build_catalogs_page()
-        self.page_reports = self._build_reports_page()
-        self.page_settings = self._build_settings_page()
-
-        self.stack.addWidget(self.page_clients)
-        self.stack.addWidget(self.page_supplies)
-        self.stack.addWidget(self.page_aircraft)
-        self.stack.addWidget(self.page_flights)
-        self.stack.addWidget(self.page_catalogs)
-        self.stack.addWidget(self.page_reports)
-        self.stack.addWidget(self.page_settings)
-
-        self.menu_list.currentRowChanged.connect(self.stack.setCurrentIndex)
+        self.menu_list.currentRowChanged.connect(self.show_page)
         self.menu_list.setCurrentRow(0)
 
+    def show_page(self, index: int) -> None:
+        name = PAGES[index][0]
+        first = name not in self.pages
+        if first:
+            self._build_page(index)
+        self.stack.setCurrentIndex(index)
+        self.page_shown.emit(name, first)
+
+    def _build_page(self, index: int) -> None:
+        name = PAGES[index][0]
+        page = getattr(self, f"_build_{name}_page")()
+        placeholder = self.stack.widget(index)
+        self.stack.insertWidget(index, page)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.pages[name] = page
+        setattr(self, f"page_{name}", page)
+
+    def _make_table(self, headers: list[str], select_rows: bool = True) -> QtWidgets.QTableView:
+        view = QtWidgets.QTableView()
+        view.setModel(RowTableModel(headers, parent=view))
+        view.horizontalHeader().setStretchLastSection(True)
+        if select_rows:
+            view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+            view.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        return view
+
     def _build_clients_page(self) -> QtWidgets.QWidget:
         w = QtWidgets.QWidget()
         v = QtWidgets.QVBoxLayout(w)
@@ -54,11 +91,7 @@ class MainWindow(QtWidgets.QMainWindow):
         header.addWidget(self.client_add_btn)
         header.addWidget(self.client_update_btn)
         v.addLayout(header)
-        self.clients_table = QtWidgets.QTableWidget(0, 2)
-        self.clients_table.setHorizontalHeaderLabels(["ID", "Nombre"])
-        self.clients_table.horizontalHeader().setStretchLastSection(True)
-        self.clients_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.clients_table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.clients_table = self._make_table(["ID", "Nombre"])
         v.addWidget(self.clients_table)
         return w
 
@@ -75,11 +108,7 @@ class MainWindow(QtWidgets.QMainWindow):
             header.addWidget(wdg)
         header.addWidget(self.supply_update_btn)
         v.addLayout(header)
-        self.supplies_table = QtWidgets.QTableWidget(0, 4)
-        self.supplies_table.setHorizontalHeaderLabels(["ID", "Nombre", "Unidad", "Costo/U"]) 
-        self.supplies_table.horizontalHeader().setStretchLastSection(True)
-        self.supplies_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.supplies_table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.supplies_table = self._make_table(["ID", "Nombre", "Unidad", "Costo/U"])
         v.addWidget(self.supplies_table)
         return w
 
@@ -96,12 +125,33 @@ class MainWindow(QtWidgets.QMainWindow):
         header.addWidget(self.ac_add_btn)
         header.addWidget(self.ac_update_btn)
         v.addLayout(header)
-        self.aircraft_table = QtWidgets.QTableWidget(0, 3)
-        self.aircraft_table.setHorizontalHeaderLabels(["ID", "Matrícula", "Modelo"])
-        self.aircraft_table.horizontalHeader().setStretchLastSection(True)
-        self.aircraft_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.aircraft_table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.aircraft_table = self._make_table(["ID", "Matrícula", "Modelo"])
         v.addWidget(self.aircraft_table)
+
+        # Horas/aterrizajes desde la última inspección de cada intervalo
+        gb = QtWidgets.QGroupBox("Mantenimiento")
+        gv = QtWidgets.QVBoxLayout(gb)
+        row = QtWidgets.QHBoxLayout()
+        self.maint_interval = QtWidgets.QComboBox()
+        self.maint_date = QtWidgets.QDateEdit(); self.maint_date.setCalendarPopup(True); self.maint_date.setDate(QtCore.QDate.currentDate())
+        self.maint_record_btn = QtWidgets.QPushButton("Registrar inspección (aeronave seleccionada)")
+        self.maint_due_only = QtWidgets.QCheckBox("Solo vencidas o próximas")
+        self.maint_margin_hours = QtWidgets.QSpinBox(); self.maint_margin_hours.setRange(0, 1000); self.maint_margin_hours.setValue(10); self.maint_margin_hours.setSuffix(" h")
+        self.maint_margin_landings = QtWidgets.QSpinBox(); self.maint_margin_landings.setRange(0, 10000); self.maint_margin_landings.setValue(10); self.maint_margin_landings.setSuffix(" aterr.")
+        for wdg in (
+            QtWidgets.QLabel("Intervalo:"), self.maint_interval, QtWidgets.QLabel("Fecha:"), self.maint_date, self.maint_record_btn,
+        ):
+            row.addWidget(wdg)
+        row.addStretch(1)
+        for wdg in (self.maint_due_only, QtWidgets.QLabel("Margen:"), self.maint_margin_hours, self.maint_margin_landings):
+            row.addWidget(wdg)
+        gv.addLayout(row)
+        self.maint_table = self._make_table(
+            ["Matrícula", "Inspección", "Última", "Horas totales", "Horas desde", "Horas restantes", "Aterr. desde", "Aterr. restantes", "Estado"],
+            select_rows=False,
+        )
+        gv.addWidget(self.maint_table)
+        v.addWidget(gb)
         return w
 
     def _build_flights_page(self) -> QtWidgets.QWidget:
@@ -138,9 +188,43 @@ class MainWindow(QtWidgets.QMainWindow):
         v.addLayout(form)
         self.flight_add_btn = QtWidgets.QPushButton("Guardar vuelo")
         v.addWidget(self.flight_add_btn)
-        self.flights_table = QtWidgets.QTableWidget(0, 8)
-        self.flights_table.setHorizontalHeaderLabels(["ID", "Fecha", "Matrícula", "Cliente", "Piloto", "Origen", "Destino", "Minutos"]) 
-        self.flights_table.horizontalHeader().setStretchLastSection(True)
+        import_row = QtWidgets.QHBoxLayout()
+        self.flight_import_btn = QtWidgets.QPushButton("Importar CSV/Excel…")
+        self.flight_import_create = QtWidgets.QCheckBox("Crear catálogos faltantes")
+        import_row.addWidget(self.flight_import_btn)
+        import_row.addWidget(self.flight_import_create)
+        import_row.addStretch(1)
+        v.addLayout(import_row)
+        # Browser: filters + keyset paging (newest first)
+        filter_row = QtWidgets.QHBoxLayout()
+        self.flights_filter_aircraft = QtWidgets.QComboBox()
+        self.flights_filter_client = QtWidgets.QComboBox()
+        self.flights_filter_mechanic = QtWidgets.QComboBox()
+        self.flights_filter_service_type = QtWidgets.QComboBox()
+        for label, wdg in (
+            ("Aeronave:", self.flights_filter_aircraft),
+            ("Cliente:", self.flights_filter_client),
+            ("Mecánico:", self.flights_filter_mechanic),
+            ("Tipo servicio:", self.flights_filter_service_type),
+        ):
+            filter_row.addWidget(QtWidgets.QLabel(label))
+            filter_row.addWidget(wdg, 1)
+        v.addLayout(filter_row)
+        self.flights_search = QtWidgets.QLineEdit(); self.flights_search.setClearButtonEnabled(True)
+        self.flights_search.setPlaceholderText("Buscar en observaciones, ruta, piloto, matrícula, cliente… (Enter)")
+        v.addWidget(self.flights_search)
+        page_row = QtWidgets.QHBoxLayout()
+        self.flights_goto_date = QtWidgets.QDateEdit(); self.flights_goto_date.setCalendarPopup(True); self.flights_goto_date.setDate(QtCore.QDate.currentDate())
+        self.flights_goto_btn = QtWidgets.QPushButton("Ir a fecha")
+        self.flights_newest_btn = QtWidgets.QPushButton("Más recientes")
+        self.flights_newer_btn = QtWidgets.QPushButton("◀ Más nuevos")
+        self.flights_older_btn = QtWidgets.QPushButton("Más antiguos ▶")
+        self.flights_page_label = QtWidgets.QLabel("")
+        for wdg in (self.flights_goto_date, self.flights_goto_btn, self.flights_newest_btn, self.flights_newer_btn, self.flights_older_btn):
+            page_row.addWidget(wdg)
+        page_row.addWidget(self.flights_page_label, 1)
+        v.addLayout(page_row)
+        self.flights_table = self._make_table(["ID", "Fecha", "Matrícula", "Cliente", "Piloto", "Origen", "Destino", "Minutos"])
         v.addWidget(self.flights_table)
 
         # Panel para asociar insumos al vuelo seleccionado
@@ -176,10 +260,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.cat_st_update = QtWidgets.QPushButton("Actualizar")
         row.addWidget(self.cat_st_name); row.addWidget(self.cat_st_add); row.addWidget(self.cat_st_update)
         stv.addLayout(row)
-        self.cat_st_table = QtWidgets.QTableWidget(0, 2); self.cat_st_table.setHorizontalHeaderLabels(["ID", "Nombre"])
-        self.cat_st_table.horizontalHeader().setStretchLastSection(True)
-        self.cat_st_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.cat_st_table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.cat_st_table = self._make_table(["ID", "Nombre"])
         stv.addWidget(self.cat_st_table)
         tabs.addTab(st, "Tipos de Servicio")
 
@@ -191,10 +272,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.cat_mech_update = QtWidgets.QPushButton("Actualizar")
         row.addWidget(self.cat_mech_name); row.addWidget(self.cat_mech_add); row.addWidget(self.cat_mech_update)
         mv.addLayout(row)
-        self.cat_mech_table = QtWidgets.QTableWidget(0, 2); self.cat_mech_table.setHorizontalHeaderLabels(["ID", "Nombre"])
-        self.cat_mech_table.horizontalHeader().setStretchLastSection(True)
-        self.cat_mech_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.cat_mech_table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.cat_mech_table = self._make_table(["ID", "Nombre"])
         mv.addWidget(self.cat_mech_table)
         tabs.addTab(mech, "Mecánicos")
 
@@ -206,12 +284,22 @@ class MainWindow(QtWidgets.QMainWindow):
         self.cat_con_update = QtWidgets.QPushButton("Actualizar")
         row.addWidget(self.cat_con_name); row.addWidget(self.cat_con_add); row.addWidget(self.cat_con_update)
         cv.addLayout(row)
-        self.cat_con_table = QtWidgets.QTableWidget(0, 2); self.cat_con_table.setHorizontalHeaderLabels(["ID", "Nombre"])
-        self.cat_con_table.horizontalHeader().setStretchLastSection(True)
-        self.cat_con_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.cat_con_table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.cat_con_table = self._make_table(["ID", "Nombre"])
         cv.addWidget(self.cat_con_table)
         tabs.addTab(con, "Conceptos")
+
+        # Inspection intervals
+        iv = QtWidgets.QWidget(); ivv = QtWidgets.QVBoxLayout(iv)
+        row = QtWidgets.QHBoxLayout();
+        self.cat_iv_name = QtWidgets.QLineEdit(); self.cat_iv_name.setPlaceholderText("Nombre (ej. 100 horas)")
+        self.cat_iv_hours = QtWidgets.QDoubleSpinBox(); self.cat_iv_hours.setDecimals(1); self.cat_iv_hours.setMaximum(100_000); self.cat_iv_hours.setSuffix(" h"); self.cat_iv_hours.setSpecialValueText("Sin horas")
+        self.cat_iv_landings = QtWidgets.QSpinBox(); self.cat_iv_landings.setMaximum(1_000_000); self.cat_iv_landings.setSuffix(" aterr."); self.cat_iv_landings.setSpecialValueText("Sin aterrizajes")
+        self.cat_iv_add = QtWidgets.QPushButton("Agregar")
+        row.addWidget(self.cat_iv_name); row.addWidget(self.cat_iv_hours); row.addWidget(self.cat_iv_landings); row.addWidget(self.cat_iv_add)
+        ivv.addLayout(row)
+        self.cat_iv_table = self._make_table(["ID", "Nombre", "Horas", "Aterrizajes"])
+        ivv.addWidget(self.cat_iv_table)
+        tabs.addTab(iv, "Intervalos de inspección")
         return w
 
     def _build_reports_page(self) -> QtWidgets.QWidget:
@@ -226,15 +314,24 @@ class MainWindow(QtWidgets.QMainWindow):
         self.report_prepost_btn = QtWidgets.QPushButton("Bitácora PRE/POST (PDF)")
         self.report_consumibles_btn = QtWidgets.QPushButton("Consumibles y Servicios (PDF)")
         self.report_preview_btn = QtWidgets.QPushButton("Ver en tabla")
-        for wdg in (self.report_start, self.report_end, self.report_aircraft, self.report_client, self.report_preview_btn, self.report_btn, self.report_prepost_btn, self.report_consumibles_btn):
+        self.report_dashboard_btn = QtWidgets.QPushButton("Tablero")
+        self.report_trend_btn = QtWidgets.QPushButton("Tendencia mensual")
+        self.report_batch_btn = QtWidgets.QPushButton("Lote del mes (PDF)")
+        self.report_export_btn = QtWidgets.QPushButton("Exportar CSV/Excel…")
+        for wdg in (self.report_start, self.report_end, self.report_aircraft, self.report_client, self.report_preview_btn, self.report_dashboard_btn, self.report_trend_btn, self.report_btn, self.report_prepost_btn, self.report_consumibles_btn, self.report_batch_btn, self.report_export_btn):
             row.addWidget(wdg)
         v.addLayout(row)
+        status_row = QtWidgets.QHBoxLayout()
         self.report_status = QtWidgets.QLabel("Seleccione periodo y genere el reporte.")
-        v.addWidget(self.report_status)
+        self.report_cancel_btn = QtWidgets.QPushButton("Cancelar reportes"); self.report_cancel_btn.setEnabled(False)
+        status_row.addWidget(self.report_status, 1)
+        status_row.addWidget(self.report_cancel_btn)
+        v.addLayout(status_row)
+        self.report_search = QtWidgets.QLineEdit(); self.report_search.setClearButtonEnabled(True)
+        self.report_search.setPlaceholderText("Buscar vuelos del periodo por texto (Enter)")
+        v.addWidget(self.report_search)
         # preview table
-        self.report_table = QtWidgets.QTableWidget(0, 11)
-        self.report_table.setHorizontalHeaderLabels(["Fecha", "Matrícula", "Cliente", "Tipo Serv.", "Mecánico", "Concepto", "Hora", "Origen", "Destino", "Minutos", "Aterrizajes"])
-        self.report_table.horizontalHeader().setStretchLastSection(True)
+        self.report_table = self._make_table(REPORT_PREVIEW_HEADERS, select_rows=False)
         v.addWidget(self.report_table)
         return w
 
@@ -261,5 +358,50 @@ class MainWindow(QtWidgets.QMainWindow):
         v.addLayout(form)
         self.cfg_save_btn = QtWidgets.QPushButton("Guardar configuración")
         v.addWidget(self.cfg_save_btn)
-        v.addStretch(1)
+
+        # Tiempos por acción (SQL / ORM / PDF / tabla) y consultas lentas
+        gb = QtWidgets.QGroupBox("Diagnóstico")
+        gv = QtWidgets.QVBoxLayout(gb)
+        row = QtWidgets.QHBoxLayout()
+        self.diag_refresh_btn = QtWidgets.QPushButton("Actualizar")
+        self.diag_clear_btn = QtWidgets.QPushButton("Limpiar")
+        self.diag_threshold = QtWidgets.QSpinBox(); self.diag_threshold.setRange(1, 60_000); self.diag_threshold.setSuffix(" ms")
+        self.diag_log_label = QtWidgets.QLabel(""); self.diag_log_label.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
+        for wdg in (self.diag_refresh_btn, self.diag_clear_btn, QtWidgets.QLabel("Consulta lenta desde:"), self.diag_threshold):
+            row.addWidget(wdg)
+        row.addWidget(self.diag_log_label, 1)
+        gv.addLayout(row)
+        self.diag_actions_table = self._make_table(
+            ["Hora", "Acción", "Total ms", "SQL ms", "Consultas", "Filas", "ORM ms", "PDF ms", "Tabla ms", "Otro ms"],
+            select_rows=False,
+        )
+        self.diag_slow_table = self._make_table(["Hora", "ms", "Acción", "Consulta", "Plan"], select_rows=False)
+        gv.addWidget(self.diag_actions_table, 2)
+        gv.addWidget(self.diag_slow_table, 1)
+        v.addWidget(gb, 1)
         return w
+
+
+class ColumnPickerDialog(QtWidgets.QDialog):
+    """Checklist of (key, label) columns; selected_keys() keeps the given order."""
+
+    def __init__(self, title: str, columns: list[tuple[str, str]], checked: set[str], parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        v = QtWidgets.QVBoxLayout(self)
+        self.list = QtWidgets.QListWidget()
+        for key, label in columns:
+            item = QtWidgets.QListWidgetItem(label)
+            item.setData(QtCore.Qt.UserRole, key)
+            item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.Checked if key in checked else QtCore.Qt.Unchecked)
+            self.list.addItem(item)
+        v.addWidget(self.list)
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        v.addWidget(buttons)
+
+    def selected_keys(self) -> list[str]:
+        items = (self.list.item(i) for i in range(self.list.count()))
+        return [it.data(QtCore.Qt.UserRole) for it in items if it.checkState() == QtCore.Qt.Checked]
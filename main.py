@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import multiprocessing
 import sys
-from datetime import date, time
+from datetime import time, timedelta
+from pathlib import Path
 
 from PySide6 import QtWidgets, QtCore
 from sqlalchemy import exc as sa_exc
 
+from app.aggregates import breakdown, flight_totals, monthly_trend, supply_breakdown, supply_totals
+from app.catalog_cache import CATALOGS, catalog_cache
 from app.db import get_session
+from app import instrumentation
+from app.maintenance import add_inspection_interval, inspection_status, list_inspection_intervals, record_inspection
 from app.models import Aircraft, Client
 from app.repository import (
     add_aircraft,
@@ -15,208 +21,423 @@ from app.repository import (
     add_flight_supply,
     init_db,
     list_aircraft,
-    list_clients,
-    list_flights_in_range,
+    iter_flight_rows,
+    list_month_rows,
+    page_flight_rows,
+    month_range,
+    list_flight_page,
+    date_page_key,
+    search_flights,
     list_supplies,
     add_supply,
-    list_mechanics,
-    list_service_types,
-    list_concepts,
     add_mechanic,
     add_service_type,
     add_concept,
 )
-from app.reporting import (
-    generate_flights_summary_pdf,
-    generate_bitacora_pre_post_pdf,
-    generate_consumibles_servicios_pdf,
-)
-from app.ui_main import MainWindow
+from app.jobs import JobContext, JobRunner
+from app.ui_main import ColumnPickerDialog, MainWindow, REPORT_DASHBOARD_HEADERS, REPORT_PREVIEW_HEADERS, REPORT_SEARCH_HEADERS, REPORT_TREND_HEADERS
 from app.company_config import CompanyConfig, load_company_config, save_company_config
+from app.config import REPORTS_DIR
+from app.report_cache import data_stamps, fetch_report, month_report_params, month_stamps, report_key, store_report
+
+# reportlab (app.reporting, app.batch) and the import/export engines load on first use, inside the
+# handlers or the job functions that need them, so starting the window doesn't pay for them
+
 
+class _CatalogBridge(QtCore.QObject):
+    # Catalog commits may happen on job threads; this hops the notification onto the GUI thread
+    changed = QtCore.Signal(str, object)
 
+
+# Every _on_*/_load_* method is timed as a user action (Configuración > Diagnóstico)
+@instrumentation.instrument_methods
 class Controller:
     def __init__(self, window: MainWindow):
         self.w = window
         self.company = load_company_config()
         self._current_flight_id: int | None = None
+        self._job_callbacks: dict[int, object] = {}
+        self._export_columns: list[str] | None = None  # export dialog selection, exporter defaults until used
+        # Vuelos browser position: None = newest page, else ("older" | "newer", (flight_date, id))
+        self._flight_cursor: tuple[str, tuple] | None = None
+        self._flight_page = None
+        # Text search shown in the Vuelos table instead of the pages ("" = browsing)
+        self._flight_search = ""
+        # PDF reports render on worker threads so data entry keeps working meanwhile
+        self.jobs = JobRunner(parent=self.w)
+        self._catalog_bridge = _CatalogBridge(self.w)
+        self._catalog_bridge.changed.connect(self._on_catalog_changed)
+        catalog_cache.subscribe(self._catalog_bridge.changed.emit)
+        # Landing page rows are read on a worker after the window is up; other pages load on first visit
+        self.loader = JobRunner(max_threads=1, parent=self.w)
+        self.loader.finished.connect(self._on_startup_loaded)
+        self.loader.failed.connect(self._on_startup_loaded)
         init_db()
         self._wire()
-        self._refresh_all()
+        self.w.page_shown.connect(self._on_page_shown)
+        self._landing = list(self.w.pages)
+        for name in self._landing:
+            getattr(self, f"_wire_{name}")()
+        self.loader.submit("Carga inicial", self._warm_catalogs)
 
     def _wire(self) -> None:
+        self.jobs.started.connect(self._on_job_started)
+        self.jobs.progress.connect(self._on_job_progress)
+        self.jobs.finished.connect(self._on_job_finished)
+        self.jobs.failed.connect(self._on_job_failed)
+        self.jobs.cancelled.connect(self._on_job_cancelled)
+
+    def _wire_clients(self) -> None:
         self.w.client_add_btn.clicked.connect(self._on_add_client)
         self.w.client_name.returnPressed.connect(self._on_add_client)
-        # Edit buttons
-        if hasattr(self.w, 'client_update_btn'):
-            self.w.client_update_btn.clicked.connect(self._on_update_client)
+        self.w.client_update_btn.clicked.connect(self._on_update_client)
+
+    def _wire_supplies(self) -> None:
         self.w.supply_add_btn.clicked.connect(self._on_add_supply)
-        if hasattr(self.w, 'supply_update_btn'):
-            self.w.supply_update_btn.clicked.connect(self._on_update_supply)
+        self.w.supply_update_btn.clicked.connect(self._on_update_supply)
+
+    def _wire_aircraft(self) -> None:
         self.w.ac_add_btn.clicked.connect(self._on_add_aircraft)
-        if hasattr(self.w, 'ac_update_btn'):
-            self.w.ac_update_btn.clicked.connect(self._on_update_aircraft)
+        self.w.ac_update_btn.clicked.connect(self._on_update_aircraft)
+        self.w.maint_record_btn.clicked.connect(self._on_record_inspection)
+        self.w.maint_due_only.toggled.connect(self._load_maintenance)
+        self.w.maint_margin_hours.valueChanged.connect(self._load_maintenance)
+        self.w.maint_margin_landings.valueChanged.connect(self._load_maintenance)
+
+    def _wire_flights(self) -> None:
         self.w.flight_add_btn.clicked.connect(self._on_add_flight)
         self.w.flight_supply_add_btn.clicked.connect(self._on_add_flight_supply)
+        self.w.flight_import_btn.clicked.connect(self._on_import_flights)
+        for combo in (self.w.flights_filter_aircraft, self.w.flights_filter_client, self.w.flights_filter_mechanic, self.w.flights_filter_service_type):
+            combo.activated.connect(self._on_flights_filter_changed)
+        self.w.flights_newest_btn.clicked.connect(self._on_flights_newest)
+        self.w.flights_newer_btn.clicked.connect(self._on_flights_newer)
+        self.w.flights_older_btn.clicked.connect(self._on_flights_older)
+        self.w.flights_goto_btn.clicked.connect(self._on_flights_goto_date)
+        self.w.flights_search.returnPressed.connect(self._on_flights_search)
+        self.w.flights_search.textChanged.connect(self._on_flights_search_edited)
         # Load flight form on table selection
-        self.w.flights_table.itemSelectionChanged.connect(self._on_flight_row_selected)
+        self.w.flights_table.selectionModel().selectionChanged.connect(self._on_flight_row_selected)
+
+    def _wire_catalogs(self) -> None:
+        self.w.cat_st_add.clicked.connect(self._on_add_service_type)
+        self.w.cat_st_update.clicked.connect(self._on_update_service_type)
+        self.w.cat_mech_add.clicked.connect(self._on_add_mechanic)
+        self.w.cat_mech_update.clicked.connect(self._on_update_mechanic)
+        self.w.cat_con_add.clicked.connect(self._on_add_concept)
+        self.w.cat_con_update.clicked.connect(self._on_update_concept)
+        self.w.cat_iv_add.clicked.connect(self._on_add_inspection_interval)
+
+    def _wire_reports(self) -> None:
         self.w.report_btn.clicked.connect(self._on_generate_report)
         self.w.report_prepost_btn.clicked.connect(self._on_generate_report_prepost)
         self.w.report_consumibles_btn.clicked.connect(self._on_generate_report_consumibles)
-        if hasattr(self.w, 'report_preview_btn'):
-            self.w.report_preview_btn.clicked.connect(self._on_preview_report_table)
+        self.w.report_preview_btn.clicked.connect(self._on_preview_report_table)
+        self.w.report_dashboard_btn.clicked.connect(self._on_show_dashboard)
+        self.w.report_trend_btn.clicked.connect(self._on_show_trend)
+        self.w.report_batch_btn.clicked.connect(self._on_generate_month_batch)
+        self.w.report_export_btn.clicked.connect(self._on_export_flights)
+        self.w.report_search.returnPressed.connect(self._on_report_search)
+        self.w.report_cancel_btn.clicked.connect(self._on_cancel_reports)
+
+    def _wire_settings(self) -> None:
         self.w.cfg_logo_btn.clicked.connect(self._on_pick_logo)
         self.w.cfg_save_btn.clicked.connect(self._on_save_company)
-        # Catalogs buttons (if exist)
-        if hasattr(self.w, 'cat_st_add'):
-            self.w.cat_st_add.clicked.connect(self._on_add_service_type)
-        if hasattr(self.w, 'cat_st_update'):
-            self.w.cat_st_update.clicked.connect(self._on_update_service_type)
-        if hasattr(self.w, 'cat_mech_add'):
-            self.w.cat_mech_add.clicked.connect(self._on_add_mechanic)
-        if hasattr(self.w, 'cat_mech_update'):
-            self.w.cat_mech_update.clicked.connect(self._on_update_mechanic)
-        if hasattr(self.w, 'cat_con_add'):
-            self.w.cat_con_add.clicked.connect(self._on_add_concept)
-        if hasattr(self.w, 'cat_con_update'):
-            self.w.cat_con_update.clicked.connect(self._on_update_concept)
-
-    def _refresh_all(self) -> None:
+        self.w.diag_refresh_btn.clicked.connect(self._diag_refresh)
+        self.w.diag_clear_btn.clicked.connect(self._diag_clear)
+        self.w.diag_threshold.setValue(int(instrumentation.slow_threshold_ms()))
+        self.w.diag_threshold.valueChanged.connect(instrumentation.set_slow_threshold_ms)
+
+    # First-visit fills, one per page
+    def _fill_clients(self) -> None:
         self._load_clients()
+
+    def _fill_supplies(self) -> None:
         self._load_supplies()
+
+    def _fill_aircraft(self) -> None:
+        self._load_inspection_intervals()
         self._load_aircraft()
+
+    def _fill_flights(self) -> None:
+        self._load_combo_boxes("flights")
         self._load_flights_table()
-        self._load_combo_boxes()
-        self._load_company_to_form()
+
+    def _fill_catalogs(self) -> None:
         self._load_catalogs()
+        self._load_inspection_intervals()
+
+    def _fill_reports(self) -> None:
+        self._load_combo_boxes("reports")
+        self.w.report_cancel_btn.setEnabled(self.jobs.pending() > 0)
+
+    def _fill_settings(self) -> None:
+        self._load_company_to_form()
+        self._diag_refresh()
+
+    def _warm_catalogs(self, job: JobContext) -> None:
+        # Worker thread: the cache is shared and locked, so the GUI then fills from memory
+        for kind in CATALOGS:
+            job.check_cancelled()
+            catalog_cache.items(kind)
+
+    def _on_startup_loaded(self, *_) -> None:
+        for name in self._landing:
+            getattr(self, f"_fill_{name}")()
+
+    def _on_page_shown(self, name: str, first: bool) -> None:
+        if first:
+            getattr(self, f"_wire_{name}")()
+            getattr(self, f"_fill_{name}")()
+        elif name == "aircraft":
+            # Counters change with every flight saved or imported
+            self._load_maintenance()
+        elif name == "settings":
+            self._diag_refresh()
+
+    # Diagnostics panel; deliberately not _on_*/_load_* so looking at it isn't recorded as an action
+    def _diag_refresh(self, *_) -> None:
+        def ms(seconds):
+            return round(seconds * 1000, 1)
+
+        self.w.diag_actions_table.model().set_rows(
+            (
+                a.started.strftime("%H:%M:%S"), a.name.replace("Controller.", ""), ms(a.wall), ms(a.sql), a.queries, a.rows,
+                ms(a.phases.get("sesion", 0)), ms(a.phases.get("pdf", 0)), ms(a.phases.get("tabla", 0)), ms(a.other),
+            )
+            for a in reversed(instrumentation.recent_actions())
+        )
+        self.w.diag_slow_table.model().set_rows(
+            (q.at.strftime("%H:%M:%S"), q.ms, q.action.replace("Controller.", ""), q.sql, q.plan.replace("\n", " | "))
+            for q in reversed(instrumentation.recent_slow_queries())
+        )
+        self.w.diag_log_label.setText(f"Registro: {instrumentation.slow_log_path()}")
+
+    def _diag_clear(self, *_) -> None:
+        instrumentation.clear()
+        self._diag_refresh()
 
     def _load_clients(self) -> None:
-        with get_session() as s:
-            clients = list_clients(s)
-        t = self.w.clients_table
-        t.setRowCount(0)
-        for c in clients:
-            row = t.rowCount(); t.insertRow(row)
-            t.setItem(row, 0, QtWidgets.QTableWidgetItem(str(c.id)))
-            t.setItem(row, 1, QtWidgets.QTableWidgetItem(c.name))
+        self.w.clients_table.model().set_rows(catalog_cache.items("clients"))
 
     def _load_supplies(self) -> None:
         with get_session() as s:
             supplies = list_supplies(s)
-        t = self.w.supplies_table
-        t.setRowCount(0)
-        for sup in supplies:
-            row = t.rowCount(); t.insertRow(row)
-            t.setItem(row, 0, QtWidgets.QTableWidgetItem(str(sup.id)))
-            t.setItem(row, 1, QtWidgets.QTableWidgetItem(sup.name))
-            t.setItem(row, 2, QtWidgets.QTableWidgetItem(sup.unit))
-            t.setItem(row, 3, QtWidgets.QTableWidgetItem(f"{float(sup.cost_per_unit):.2f}"))
+        self.w.supplies_table.model().set_rows((sup.id, sup.name, sup.unit, sup.cost_per_unit) for sup in supplies)
 
     def _load_aircraft(self) -> None:
         with get_session() as s:
             aircraft = list_aircraft(s)
-        t = self.w.aircraft_table
-        t.setRowCount(0)
-        for a in aircraft:
-            row = t.rowCount(); t.insertRow(row)
-            t.setItem(row, 0, QtWidgets.QTableWidgetItem(str(a.id)))
-            t.setItem(row, 1, QtWidgets.QTableWidgetItem(a.registration))
-            t.setItem(row, 2, QtWidgets.QTableWidgetItem(a.model or ""))
+        self.w.aircraft_table.model().set_rows((a.id, a.registration, a.model) for a in aircraft)
+        self._load_maintenance()
+
+    def _load_inspection_intervals(self) -> None:
+        with get_session() as s:
+            intervals = [(iv.id, iv.name, iv.minutes, iv.landings) for iv in list_inspection_intervals(s)]
+        if "catalogs" in self.w.pages:
+            self.w.cat_iv_table.model().set_rows(
+                (iv_id, name, minutes / 60 if minutes else None, landings) for iv_id, name, minutes, landings in intervals
+            )
+        if "aircraft" not in self.w.pages:
+            return
+        current = self.w.maint_interval.currentData()
+        self.w.maint_interval.clear()
+        for iv_id, name, _, _ in intervals:
+            self.w.maint_interval.addItem(name, iv_id)
+        self._set_combo_by_data(self.w.maint_interval, current)
+
+    def _load_maintenance(self, *_) -> None:
+        # Reads one counter row per aircraft and interval, never the flights themselves
+        margin_min = self.w.maint_margin_hours.value() * 60
+        margin_land = self.w.maint_margin_landings.value()
+        with get_session() as s:
+            statuses = inspection_status(s)
+        if self.w.maint_due_only.isChecked():
+            statuses = [st for st in statuses if st.due_within(margin_min, margin_land)]
+
+        def hours(minutes):
+            return None if minutes is None else round(minutes / 60, 1)
+
+        self.w.maint_table.model().set_rows(
+            (
+                st.registration, st.interval_name, st.done_on or "(sin registro)", hours(st.total_minutes),
+                hours(st.minutes_since), hours(st.minutes_left), st.landings_since, st.landings_left,
+                "VENCIDA" if st.overdue else "PRÓXIMA" if st.due_within(margin_min, margin_land) else "",
+            )
+            for st in statuses
+        )
+
+    def _flights_browse_filters(self) -> dict:
+        return {
+            "aircraft_id": self.w.flights_filter_aircraft.currentData(),
+            "client_id": self.w.flights_filter_client.currentData(),
+            "mechanic_id": self.w.flights_filter_mechanic.currentData(),
+            "service_type_id": self.w.flights_filter_service_type.currentData(),
+        }
 
     def _load_flights_table(self) -> None:
-        # Load this month flights as a simple default
-        today = date.today()
-        start = date(today.year, today.month, 1)
-        end = date(today.year + (1 if today.month == 12 else 0), 1 if today.month == 12 else today.month + 1, 1)
+        # Reloads the page at the current cursor (after saving/importing the user stays where they were)
+        filters = self._flights_browse_filters()
+        if self._flight_search:
+            self._load_flights_search(filters)
+            return
+        direction, key = self._flight_cursor or (None, None)
         with get_session() as s:
-            flights = list_flights_in_range(s, start, end)
-        t = self.w.flights_table
-        t.setRowCount(0)
-        for f in flights:
-            row = t.rowCount(); t.insertRow(row)
-            t.setItem(row, 0, QtWidgets.QTableWidgetItem(str(f.id)))
-            t.setItem(row, 1, QtWidgets.QTableWidgetItem(f.flight_date.isoformat()))
-            t.setItem(row, 2, QtWidgets.QTableWidgetItem(f.aircraft.registration if f.aircraft else ""))
-            t.setItem(row, 3, QtWidgets.QTableWidgetItem(f.client.name if f.client else ""))
-            t.setItem(row, 4, QtWidgets.QTableWidgetItem(f.pilot))
-            t.setItem(row, 5, QtWidgets.QTableWidgetItem(f.origin))
-            t.setItem(row, 6, QtWidgets.QTableWidgetItem(f.destination))
-            t.setItem(row, 7, QtWidgets.QTableWidgetItem(str(f.flight_minutes)))
+            page = list_flight_page(
+                s,
+                older_than=key if direction == "older" else None,
+                newer_than=key if direction == "newer" else None,
+                **filters,
+            )
+            if not page.rows and direction == "older":
+                # Nothing before the cursor (e.g. jumped before the first flight): show the oldest page
+                self._flight_cursor = ("newer", key)
+                page = list_flight_page(s, newer_than=key, **filters)
+            elif not page.rows and direction == "newer":
+                self._flight_cursor = None
+                page = list_flight_page(s, **filters)
+        self._flight_page = page
+        self.w.flights_table.model().set_rows(
+            (f.id, f.flight_date, f.registration, f.client_name, f.pilot, f.origin, f.destination, f.flight_minutes)
+            for f in page.rows
+        )
+        self.w.flights_newer_btn.setEnabled(page.has_newer)
+        self.w.flights_newest_btn.setEnabled(page.has_newer)
+        self.w.flights_older_btn.setEnabled(page.has_older)
+        if page.rows:
+            self.w.flights_page_label.setText(
+                f"{len(page.rows)} vuelos del {page.rows[-1].flight_date.isoformat()} al {page.rows[0].flight_date.isoformat()}"
+            )
+        else:
+            self.w.flights_page_label.setText("Sin vuelos")
         # when reloading, clear selection and reset editing state
         self._current_flight_id = None
-        t.clearSelection()
+        self.w.flights_table.clearSelection()
         self._set_flight_form_mode_insert()
 
-    def _load_combo_boxes(self) -> None:
+    def _load_flights_search(self, filters: dict) -> None:
         with get_session() as s:
-            aircraft = list_aircraft(s)
-            clients = list_clients(s)
-            supplies = list_supplies(s)
-            mechanics = list_mechanics(s)
-            service_types = list_service_types(s)
-            concepts = list_concepts(s)
-        self.w.flight_aircraft.clear()
-        for a in aircraft:
-            self.w.flight_aircraft.addItem(a.registration, a.id)
-        self.w.flight_client.clear()
-        self.w.flight_client.addItem("(Sin cliente)", None)
-        for c in clients:
-            self.w.flight_client.addItem(c.name, c.id)
-        # supplies
-        self.w.flight_supply_cb.clear()
-        for s in supplies:
-            self.w.flight_supply_cb.addItem(s.name, s.id)
-        # report filters combos
-        if hasattr(self.w, 'report_aircraft'):
-            self.w.report_aircraft.clear(); self.w.report_aircraft.addItem("(Todas)")
-            for a in aircraft:
-                self.w.report_aircraft.addItem(a.registration)
-        if hasattr(self.w, 'report_client'):
-            self.w.report_client.clear(); self.w.report_client.addItem("(Todos)")
-            for c in clients:
-                self.w.report_client.addItem(c.name)
-        # catalogs in flight form (if present)
-        if hasattr(self.w, 'flight_mechanic'):
-            self.w.flight_mechanic.clear()
-            self.w.flight_mechanic.addItem("(Ninguno)", None)
-            for m in mechanics:
-                self.w.flight_mechanic.addItem(m.name, m.id)
-        if hasattr(self.w, 'flight_service_type_ref'):
-            self.w.flight_service_type_ref.clear()
-            self.w.flight_service_type_ref.addItem("(Ninguno)", None)
-            for st in service_types:
-                self.w.flight_service_type_ref.addItem(st.name, st.id)
-        if hasattr(self.w, 'flight_concept'):
-            self.w.flight_concept.clear()
-            self.w.flight_concept.addItem("(Ninguno)", None)
-            for cpt in concepts:
-                self.w.flight_concept.addItem(cpt.name, cpt.id)
+            hits = search_flights(s, self._flight_search, **filters)
+        self._flight_page = None
+        self.w.flights_table.model().set_rows(
+            (h.row.id, h.row.flight_date, h.row.registration, h.row.client_name, h.row.pilot, h.row.origin, h.row.destination, h.row.flight_minutes)
+            for h in hits
+        )
+        for btn in (self.w.flights_newer_btn, self.w.flights_newest_btn, self.w.flights_older_btn):
+            btn.setEnabled(False)
+        self.w.flights_page_label.setText(
+            f"{len(hits)} coincidencias para «{self._flight_search}»" if hits else f"Sin coincidencias para «{self._flight_search}»"
+        )
+        self._current_flight_id = None
+        self.w.flights_table.clearSelection()
+        self._set_flight_form_mode_insert()
+
+    def _on_flights_search(self):
+        self._flight_search = self.w.flights_search.text().strip()
+        self._load_flights_table()
+
+    def _on_flights_search_edited(self, text: str):
+        # Clearing the box goes back to the page the user was browsing
+        if not text.strip() and self._flight_search:
+            self._on_flights_search()
+
+    def _on_flights_filter_changed(self, *_):
+        self._flight_cursor = None
+        self._load_flights_table()
+
+    def _leave_flights_search(self):
+        self._flight_search = ""
+        self.w.flights_search.clear()
+
+    def _on_flights_newest(self):
+        self._leave_flights_search()
+        self._flight_cursor = None
+        self._load_flights_table()
+
+    def _on_flights_newer(self):
+        if self._flight_page and self._flight_page.rows:
+            self._flight_cursor = ("newer", self._flight_page.first_key)
+            self._load_flights_table()
+
+    def _on_flights_older(self):
+        if self._flight_page and self._flight_page.rows:
+            self._flight_cursor = ("older", self._flight_page.last_key)
+            self._load_flights_table()
+
+    def _on_flights_goto_date(self):
+        self._leave_flights_search()
+        self._flight_cursor = ("older", date_page_key(self.w.flights_goto_date.date().toPython()))
+        self._load_flights_table()
+
+    # Catalog combos/tables come from the in-memory cache and are patched per changed kind;
+    # only pages already built have widgets to patch, the rest fill themselves on first visit
+    def _page_combos(self, page: str) -> dict[str, list[tuple[QtWidgets.QComboBox, str | None]]]:
+        if page not in self.w.pages:
+            return {}
+        if page == "reports":
+            return {
+                "aircraft": [(self.w.report_aircraft, "(Todas)")],
+                "clients": [(self.w.report_client, "(Todos)")],
+            }
+        return {
+            "aircraft": [(self.w.flight_aircraft, None), (self.w.flights_filter_aircraft, "(Todas)")],
+            "clients": [(self.w.flight_client, "(Sin cliente)"), (self.w.flights_filter_client, "(Todos)")],
+            "supplies": [(self.w.flight_supply_cb, None)],
+            "mechanics": [(self.w.flight_mechanic, "(Ninguno)"), (self.w.flights_filter_mechanic, "(Todos)")],
+            "service_types": [(self.w.flight_service_type_ref, "(Ninguno)"), (self.w.flights_filter_service_type, "(Todos)")],
+            "concepts": [(self.w.flight_concept, "(Ninguno)")],
+        }
+
+    def _catalog_combos(self, kind: str) -> list[tuple[QtWidgets.QComboBox, str | None]]:
+        return [c for page in ("flights", "reports") for c in self._page_combos(page).get(kind, [])]
+
+    def _catalog_tables(self, kind: str) -> list[QtWidgets.QTableView]:
+        tables = {}
+        if "clients" in self.w.pages:
+            tables["clients"] = [self.w.clients_table]
+        if "catalogs" in self.w.pages:
+            tables.update(mechanics=[self.w.cat_mech_table], service_types=[self.w.cat_st_table], concepts=[self.w.cat_con_table])
+        return tables.get(kind, [])
+
+    def _fill_combo(self, combo: QtWidgets.QComboBox, kind: str, placeholder: str | None) -> None:
+        current = combo.currentData()
+        combo.clear()
+        if placeholder is not None:
+            combo.addItem(placeholder, None)
+        for item_id, label in catalog_cache.items(kind):
+            combo.addItem(label, item_id)
+        self._set_combo_by_data(combo, current)
+
+    def _load_combo_boxes(self, page: str) -> None:
+        for kind, combos in self._page_combos(page).items():
+            for combo, placeholder in combos:
+                self._fill_combo(combo, kind, placeholder)
+
+    def _on_catalog_changed(self, kind: str, changes) -> None:
+        for view in self._catalog_tables(kind):
+            view.model().set_rows(catalog_cache.items(kind))
+        for combo, placeholder in self._catalog_combos(kind):
+            if changes is None:
+                self._fill_combo(combo, kind, placeholder)
+                continue
+            offset = 0 if placeholder is None else 1
+            current = combo.currentData()
+            # Drop every touched id first, then insert survivors in ascending final position
+            for _, item_id, _ in changes:
+                i = combo.findData(item_id)
+                if i >= offset:
+                    combo.removeItem(i)
+            survivors = {item_id: label for op, item_id, label in changes if op != "delete"}
+            placed = sorted((catalog_cache.position(kind, item_id), item_id) for item_id in survivors)
+            for pos, item_id in placed:
+                if pos is not None:
+                    combo.insertItem(offset + pos, survivors[item_id], item_id)
+            self._set_combo_by_data(combo, current)
 
     def _load_catalogs(self) -> None:
-        if not hasattr(self.w, 'cat_st_table'):
-            return
-        with get_session() as s:
-            sts = list_service_types(s)
-            mechs = list_mechanics(s)
-            cons = list_concepts(s)
-        # service types table
-        t = self.w.cat_st_table; t.setRowCount(0)
-        for st in sts:
-            r = t.rowCount(); t.insertRow(r)
-            t.setItem(r, 0, QtWidgets.QTableWidgetItem(str(st.id)))
-            t.setItem(r, 1, QtWidgets.QTableWidgetItem(st.name))
-        # mechanics
-        t = self.w.cat_mech_table; t.setRowCount(0)
-        for m in mechs:
-            r = t.rowCount(); t.insertRow(r)
-            t.setItem(r, 0, QtWidgets.QTableWidgetItem(str(m.id)))
-            t.setItem(r, 1, QtWidgets.QTableWidgetItem(m.name))
-        # concepts
-        t = self.w.cat_con_table; t.setRowCount(0)
-        for c in cons:
-            r = t.rowCount(); t.insertRow(r)
-            t.setItem(r, 0, QtWidgets.QTableWidgetItem(str(c.id)))
-            t.setItem(r, 1, QtWidgets.QTableWidgetItem(c.name))
+        for kind in ("service_types", "mechanics", "concepts"):
+            for view in self._catalog_tables(kind):
+                view.model().set_rows(catalog_cache.items(kind))
 
     def _load_company_to_form(self) -> None:
         self.w.cfg_name.setText(self.company.name)
@@ -259,8 +480,6 @@ class Controller:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo guardar el cliente.\n{e}")
             return
         self.w.client_name.clear()
-        self._load_clients()
-        self._load_combo_boxes()
         QtWidgets.QMessageBox.information(self.w, "Cliente", "Cliente agregado correctamente")
 
     def _on_add_supply(self):
@@ -281,7 +500,6 @@ class Controller:
             return
         self.w.supply_name.clear(); self.w.supply_unit.clear(); self.w.supply_cpu.setValue(0)
         self._load_supplies()
-        self._load_combo_boxes()
 
     def _on_add_aircraft(self):
         reg = self.w.ac_reg.text().strip()
@@ -300,7 +518,23 @@ class Controller:
             return
         self.w.ac_reg.clear(); self.w.ac_model.clear()
         self._load_aircraft()
-        self._load_combo_boxes()
+
+    def _on_record_inspection(self):
+        aircraft_id = self._selected_id(self.w.aircraft_table)
+        interval_id = self.w.maint_interval.currentData()
+        if aircraft_id is None:
+            QtWidgets.QMessageBox.warning(self.w, "Selección", "Seleccione una aeronave en la tabla")
+            return
+        if interval_id is None:
+            QtWidgets.QMessageBox.warning(self.w, "Validación", "Dé de alta un intervalo en Catálogos > Intervalos de inspección")
+            return
+        try:
+            with get_session() as s:
+                record_inspection(s, aircraft_id, interval_id, self.w.maint_date.date().toPython())
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo registrar la inspección.\n{e}")
+            return
+        self._load_maintenance()
 
     def _on_add_flight(self):
         dt = self.w.flight_date.date().toPython()
@@ -360,18 +594,20 @@ class Controller:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo guardar el vuelo.\n{e}")
             return
         self._load_flights_table()
-        self._load_combo_boxes()
+
+    def _selected_id(self, view: QtWidgets.QTableView) -> int | None:
+        # First column of every catalog/flight row tuple is the primary key
+        rows = view.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return view.model().row(rows[0].row())[0]
 
     def _on_flight_row_selected(self):
-        row = self.w.flights_table.currentRow()
-        if row < 0:
+        fid = self._selected_id(self.w.flights_table)
+        if fid is None:
             self._current_flight_id = None
             self._set_flight_form_mode_insert()
             return
-        fid_item = self.w.flights_table.item(row, 0)
-        if not fid_item:
-            return
-        fid = int(fid_item.text())
         # Load the latest object state from DB
         from app.models import FlightLog
         with get_session() as s:
@@ -414,41 +650,120 @@ class Controller:
     def _set_flight_form_mode_update(self):
         self.w.flight_add_btn.setText("Actualizar vuelo")
 
+    def _report_filters(self) -> tuple[int | None, str, int | None, str] | None:
+        # Returns (aircraft_id, matricula, client_id, client_name); None if the typed client is unknown
+        aircraft_id = self.w.report_aircraft.currentData()
+        matricula = self.w.report_aircraft.currentText() if aircraft_id is not None else ""
+        client_name = self.w.report_client.currentText().strip()
+        if not client_name or client_name == "(Todos)":
+            return aircraft_id, matricula, None, ""
+        # The client combo is editable, so resolve the typed text instead of trusting currentData()
+        idx = self.w.report_client.findText(client_name)
+        client_id = self.w.report_client.itemData(idx) if idx >= 0 else None
+        if client_id is None:
+            QtWidgets.QMessageBox.warning(self.w, "Validación", f"No existe el cliente: {client_name}")
+            return None
+        return aircraft_id, matricula, client_id, client_name
+
     def _on_preview_report_table(self):
         start = self.w.report_start.date().toPython()
         end = self.w.report_end.date().toPython()
+        filters = self._report_filters()
+        if filters is None:
+            return
+        aircraft_id, _, client_id, _ = filters
+        # Chunks are queried as the table scrolls (fetchMore), so a long range isn't loaded up front
+        flights = page_flight_rows(start, end, aircraft_id=aircraft_id, client_id=client_id)
+        self.w.report_table.model().set_headers(REPORT_PREVIEW_HEADERS)
+        self.w.report_table.model().set_rows(
+            (
+                f.flight_date, f.registration, f.client_name, f.service_label, f.mechanic_name, f.concept_name,
+                f.service_time, f.origin, f.destination, f.flight_minutes, f.landings,
+            )
+            for f in flights
+        )
+
+    def _on_report_search(self):
+        words = self.w.report_search.text().strip()
+        if not words:
+            self._on_preview_report_table()
+            return
+        start = self.w.report_start.date().toPython()
+        end = self.w.report_end.date().toPython()
+        filters = self._report_filters()
+        if filters is None:
+            return
+        aircraft_id, _, client_id, _ = filters
+        with get_session() as s:
+            hits = search_flights(s, words, start=start, end=end, aircraft_id=aircraft_id, client_id=client_id)
+        model = self.w.report_table.model()
+        model.set_headers(REPORT_SEARCH_HEADERS)
+        model.set_rows(
+            (h.row.flight_date, h.row.registration, h.row.client_name, h.row.pilot, f"{h.row.origin}-{h.row.destination}", h.snippet)
+            for h in hits
+        )
+        self.w.report_status.setText(f"{len(hits)} vuelos coinciden con «{words}»")
+
+    def _on_show_dashboard(self):
+        # Totals and breakdowns straight from GROUP BY queries; no flight rows are loaded
+        start = self.w.report_start.date().toPython()
+        end = self.w.report_end.date().toPython()
+        filters = self._report_filters()
+        if filters is None:
+            return
+        aircraft_id, _, client_id, _ = filters
+        with get_session() as s:
+            ft = flight_totals(s, start, end, aircraft_id=aircraft_id, client_id=client_id)
+            st = supply_totals(s, start, end, aircraft_id=aircraft_id, client_id=client_id)
+            by_aircraft = breakdown(s, "aircraft", start, end, aircraft_id=aircraft_id, client_id=client_id)
+            by_client = breakdown(s, "client", start, end, aircraft_id=aircraft_id, client_id=client_id)
+            by_supply = supply_breakdown(s, start, end, aircraft_id=aircraft_id, client_id=client_id)
+        rows = [("TOTAL", "", ft.flights, ft.minutes, ft.landings, None, st.subtotal, st.viaticos, st.importe)]
+        for group, items in (("Aeronave", by_aircraft), ("Cliente", by_client)):
+            rows.extend(
+                (group, r.label or "(Sin cliente)", r.flights, r.minutes, r.landings, None, r.subtotal, r.viaticos, r.subtotal + r.viaticos)
+                for r in items
+            )
+        rows.extend(
+            ("Insumo", r.label, None, None, None, r.quantity, r.subtotal, r.viaticos, r.subtotal + r.viaticos)
+            for r in by_supply
+        )
+        model = self.w.report_table.model()
+        model.set_headers(REPORT_DASHBOARD_HEADERS)
+        model.set_rows(rows)
+        self.w.report_status.setText(f"Importe: ${st.importe:,.2f}    IVA: ${st.iva:,.2f}    Total: ${st.total:,.2f}")
+
+    def _on_show_trend(self):
+        # One row per month from the rollup table, plus a total row closing each year
+        start = self.w.report_start.date().toPython()
+        end = self.w.report_end.date().toPython()
+        filters = self._report_filters()
+        if filters is None:
+            return
+        aircraft_id, _, client_id, _ = filters
         with get_session() as s:
-            flights = list_flights_in_range(s, start, end)
-        ac_text = self.w.report_aircraft.currentText() if hasattr(self.w, 'report_aircraft') else "(Todas)"
-        cl_text = self.w.report_client.currentText() if hasattr(self.w, 'report_client') else "(Todos)"
-        if ac_text and ac_text != "(Todas)":
-            flights = [f for f in flights if f.aircraft and f.aircraft.registration == ac_text]
-        if cl_text and cl_text != "(Todos)":
-            flights = [f for f in flights if f.client and f.client.name == cl_text]
-        t = self.w.report_table
-        t.setRowCount(0)
-        for f in flights:
-            r = t.rowCount(); t.insertRow(r)
-            t.setItem(r, 0, QtWidgets.QTableWidgetItem(f.flight_date.isoformat()))
-            t.setItem(r, 1, QtWidgets.QTableWidgetItem(f.aircraft.registration if f.aircraft else ""))
-            t.setItem(r, 2, QtWidgets.QTableWidgetItem(f.client.name if f.client else ""))
-            st_label = f.service_type or (getattr(f, 'service_type_ref', None).name if getattr(f, 'service_type_ref', None) else "")
-            t.setItem(r, 3, QtWidgets.QTableWidgetItem(st_label))
-            t.setItem(r, 4, QtWidgets.QTableWidgetItem(getattr(f.mechanic, 'name', "")))
-            t.setItem(r, 5, QtWidgets.QTableWidgetItem(getattr(f.concept, 'name', "")))
-            t.setItem(r, 6, QtWidgets.QTableWidgetItem(f.service_time.strftime("%H:%M") if f.service_time else ""))
-            t.setItem(r, 7, QtWidgets.QTableWidgetItem(f.origin or ""))
-            t.setItem(r, 8, QtWidgets.QTableWidgetItem(f.destination or ""))
-            t.setItem(r, 9, QtWidgets.QTableWidgetItem(str(f.flight_minutes)))
-            t.setItem(r, 10, QtWidgets.QTableWidgetItem(str(f.landings)))
+            months = monthly_trend(s, start, end, aircraft_id=aircraft_id, client_id=client_id)
+        rows = []
+        for i, m in enumerate(months):
+            rows.append((m.year, f"{m.month:02d}", m.flights, m.minutes, m.landings, m.subtotal, m.viaticos, m.importe))
+            if i + 1 == len(months) or months[i + 1].year != m.year:
+                year = [x for x in months if x.year == m.year]
+                sub, via = sum(x.subtotal for x in year), sum(x.viaticos for x in year)
+                rows.append((
+                    m.year, "TOTAL", sum(x.flights for x in year), sum(x.minutes for x in year),
+                    sum(x.landings for x in year), sub, via, sub + via,
+                ))
+        model = self.w.report_table.model()
+        model.set_headers(REPORT_TREND_HEADERS)
+        model.set_rows(rows)
+        self.w.report_status.setText(f"{len(months)} meses con vuelos entre {start.year}-{start.month:02d} y {end.year}-{end.month:02d}")
 
     # Catalog update handlers
     def _on_update_service_type(self):
-        row = self.w.cat_st_table.currentRow()
-        if row < 0:
+        sid = self._selected_id(self.w.cat_st_table)
+        if sid is None:
             QtWidgets.QMessageBox.warning(self.w, "Selección", "Seleccione un tipo de servicio")
             return
-        sid = int(self.w.cat_st_table.item(row, 0).text())
         name = self.w.cat_st_name.text().strip()
         if not name:
             QtWidgets.QMessageBox.warning(self.w, "Validación", "Ingrese el nombre")
@@ -462,14 +777,12 @@ class Controller:
         except Exception as e:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo actualizar.\n{e}")
             return
-        self._load_catalogs(); self._load_combo_boxes()
 
     def _on_update_mechanic(self):
-        row = self.w.cat_mech_table.currentRow()
-        if row < 0:
+        mid = self._selected_id(self.w.cat_mech_table)
+        if mid is None:
             QtWidgets.QMessageBox.warning(self.w, "Selección", "Seleccione un mecánico")
             return
-        mid = int(self.w.cat_mech_table.item(row, 0).text())
         name = self.w.cat_mech_name.text().strip()
         if not name:
             QtWidgets.QMessageBox.warning(self.w, "Validación", "Ingrese el nombre")
@@ -483,14 +796,12 @@ class Controller:
         except Exception as e:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo actualizar.\n{e}")
             return
-        self._load_catalogs(); self._load_combo_boxes()
 
     def _on_update_concept(self):
-        row = self.w.cat_con_table.currentRow()
-        if row < 0:
+        cid = self._selected_id(self.w.cat_con_table)
+        if cid is None:
             QtWidgets.QMessageBox.warning(self.w, "Selección", "Seleccione un concepto")
             return
-        cid = int(self.w.cat_con_table.item(row, 0).text())
         name = self.w.cat_con_name.text().strip()
         if not name:
             QtWidgets.QMessageBox.warning(self.w, "Validación", "Ingrese el nombre")
@@ -504,15 +815,13 @@ class Controller:
         except Exception as e:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo actualizar.\n{e}")
             return
-        self._load_catalogs(); self._load_combo_boxes()
 
     # Update handlers
     def _on_update_client(self):
-        row = self.w.clients_table.currentRow()
-        if row < 0:
+        cid = self._selected_id(self.w.clients_table)
+        if cid is None:
             QtWidgets.QMessageBox.warning(self.w, "Selección", "Seleccione un cliente en la tabla")
             return
-        cid = int(self.w.clients_table.item(row, 0).text())
         name = self.w.client_name.text().strip()
         if not name:
             QtWidgets.QMessageBox.warning(self.w, "Validación", "Ingrese el nombre del cliente")
@@ -525,14 +834,12 @@ class Controller:
         except Exception as e:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo actualizar el cliente.\n{e}")
             return
-        self._load_clients(); self._load_combo_boxes()
 
     def _on_update_supply(self):
-        row = self.w.supplies_table.currentRow()
-        if row < 0:
+        sid = self._selected_id(self.w.supplies_table)
+        if sid is None:
             QtWidgets.QMessageBox.warning(self.w, "Selección", "Seleccione un insumo en la tabla")
             return
-        sid = int(self.w.supplies_table.item(row, 0).text())
         name = self.w.supply_name.text().strip()
         unit = self.w.supply_unit.text().strip() or "unidad"
         cpu = float(self.w.supply_cpu.value())
@@ -550,14 +857,13 @@ class Controller:
         except Exception as e:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo actualizar el insumo.\n{e}")
             return
-        self._load_supplies(); self._load_combo_boxes()
+        self._load_supplies()
 
     def _on_update_aircraft(self):
-        row = self.w.aircraft_table.currentRow()
-        if row < 0:
+        aid = self._selected_id(self.w.aircraft_table)
+        if aid is None:
             QtWidgets.QMessageBox.warning(self.w, "Selección", "Seleccione una aeronave en la tabla")
             return
-        aid = int(self.w.aircraft_table.item(row, 0).text())
         reg = self.w.ac_reg.text().strip()
         model = self.w.ac_model.text().strip() or None
         if not reg:
@@ -571,7 +877,7 @@ class Controller:
         except Exception as e:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo actualizar la aeronave.\n{e}")
             return
-        self._load_aircraft(); self._load_combo_boxes()
+        self._load_aircraft()
 
     # Catalog add handlers
     def _on_add_service_type(self):
@@ -585,7 +891,7 @@ class Controller:
         except Exception as e:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo agregar el tipo de servicio.\n{e}")
             return
-        self.w.cat_st_name.clear(); self._load_catalogs(); self._load_combo_boxes()
+        self.w.cat_st_name.clear()
 
     def _on_add_mechanic(self):
         name = self.w.cat_mech_name.text().strip()
@@ -598,7 +904,28 @@ class Controller:
         except Exception as e:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo agregar el mecánico.\n{e}")
             return
-        self.w.cat_mech_name.clear(); self._load_catalogs(); self._load_combo_boxes()
+        self.w.cat_mech_name.clear()
+
+    def _on_add_inspection_interval(self):
+        name = self.w.cat_iv_name.text().strip()
+        hours = self.w.cat_iv_hours.value() or None
+        landings = self.w.cat_iv_landings.value() or None
+        if not name or not (hours or landings):
+            QtWidgets.QMessageBox.warning(self.w, "Validación", "Ingrese el nombre y las horas y/o aterrizajes del intervalo")
+            return
+        try:
+            with get_session() as s:
+                add_inspection_interval(s, name, hours, landings)
+        except sa_exc.IntegrityError:
+            QtWidgets.QMessageBox.warning(self.w, "Duplicado", "Ya existe un intervalo con ese nombre")
+            return
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo agregar el intervalo.\n{e}")
+            return
+        self.w.cat_iv_name.clear(); self.w.cat_iv_hours.setValue(0); self.w.cat_iv_landings.setValue(0)
+        self._load_inspection_intervals()
+        if "aircraft" in self.w.pages:
+            self._load_maintenance()
 
     def _on_add_concept(self):
         name = self.w.cat_con_name.text().strip()
@@ -611,15 +938,14 @@ class Controller:
         except Exception as e:
             QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo agregar el concepto.\n{e}")
             return
-        self.w.cat_con_name.clear(); self._load_catalogs(); self._load_combo_boxes()
+        self.w.cat_con_name.clear()
 
     def _on_add_flight_supply(self):
         # needs a selected flight row
-        row = self.w.flights_table.currentRow()
-        if row < 0:
+        flight_id = self._selected_id(self.w.flights_table)
+        if flight_id is None:
             QtWidgets.QMessageBox.warning(self.w, "Selección requerida", "Seleccione un vuelo en la tabla")
             return
-        flight_id = int(self.w.flights_table.item(row, 0).text())
         supply_id = self.w.flight_supply_cb.currentData()
         qty = float(self.w.flight_supply_qty.value())
         price = float(self.w.flight_supply_price.value())
@@ -632,59 +958,226 @@ class Controller:
             return
         QtWidgets.QMessageBox.information(self.w, "OK", "Insumo asociado al vuelo")
 
+    def _on_import_flights(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self.w, "Importar bitácoras", "", "Hojas de cálculo (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)"
+        )
+        if not path:
+            return
+        create_missing = self.w.flight_import_create.isChecked()
+
+        def work(job: JobContext):
+            from app.importer import import_flights
+
+            return import_flights(Path(path), create_missing=create_missing, progress=job.progress)
+
+        self._submit_report(f"Importación {Path(path).name}", work, on_done=self._on_import_done)
+
+    def _on_import_done(self, result):
+        from app.importer import KIND_LABELS, write_errors
+
+        self._load_flights_table()
+        lines = [
+            f"Filas leídas: {result.rows:,}",
+            f"Vuelos importados: {result.flights:,}",
+            f"Insumos importados: {result.supplies:,}",
+            f"Tiempo: {result.seconds:.1f} s",
+        ]
+        if result.created:
+            lines.append("Catálogos creados: " + ", ".join(f"{KIND_LABELS[k]} {n}" for k, n in result.created.items()))
+        if not result.errors:
+            QtWidgets.QMessageBox.information(self.w, "Importación", "\n".join(lines))
+            return
+        lines.append(f"\nFilas con error: {len(result.errors):,}")
+        lines += [f"Línea {e.line}: {e.message}" for e in result.errors[:15]]
+        if len(result.errors) > 15:
+            lines.append("…")
+        lines.append("\n¿Guardar la lista completa de errores?")
+        answer = QtWidgets.QMessageBox.question(self.w, "Importación", "\n".join(lines))
+        if answer != QtWidgets.QMessageBox.Yes:
+            return
+        out, _ = QtWidgets.QFileDialog.getSaveFileName(self.w, "Guardar errores", "errores_importacion.csv", "CSV (*.csv)")
+        if out:
+            write_errors(Path(out), result.errors)
+
+    # Background report jobs
+    def _submit_report(self, label: str, work, on_done=None) -> None:
+        job_id = self.jobs.submit(label, work)
+        if on_done:
+            self._job_callbacks[job_id] = on_done
+        self._set_job_status(f"En cola: {label}")
+
+    def _set_job_status(self, text: str) -> None:
+        pending = self.jobs.pending()
+        if pending > 1:
+            text = f"{text}  (reportes pendientes: {pending})"
+        self.w.statusBar().showMessage(text)
+        if "reports" in self.w.pages:
+            self.w.report_status.setText(text)
+            self.w.report_cancel_btn.setEnabled(pending > 0)
+
+    def _on_job_started(self, job_id: int, label: str):
+        self._set_job_status(f"Generando {label}…")
+
+    def _on_job_progress(self, job_id: int, label: str, done: int, total: int):
+        pct = int(done * 100 / total) if total else 100
+        self._set_job_status(f"Generando {label}… {pct}% ({done}/{total})")
+
+    def _on_job_finished(self, job_id: int, label: str, result):
+        on_done = self._job_callbacks.pop(job_id, None)
+        if on_done:
+            self._set_job_status(f"{label}: terminado")
+            on_done(result)
+        else:
+            self._set_job_status(f"{label}: {result}")
+
+    def _on_job_failed(self, job_id: int, label: str, error: str):
+        self._job_callbacks.pop(job_id, None)
+        self._set_job_status(f"Error en {label}")
+        QtWidgets.QMessageBox.critical(self.w, "Error", f"No se pudo completar {label}.\n{error}")
+
+    def _on_job_cancelled(self, job_id: int, label: str):
+        self._job_callbacks.pop(job_id, None)
+        self._set_job_status(f"Cancelado: {label}")
+
+    def _on_cancel_reports(self):
+        self.jobs.cancel()
+
     def _on_generate_report(self):
         start = self.w.report_start.date().toPython()
         end = self.w.report_end.date().toPython()
         if start > end:
             QtWidgets.QMessageBox.warning(self.w, "Validación", "La fecha inicial debe ser <= a la final")
             return
-        with get_session() as s:
-            flights = list_flights_in_range(s, start, end)
-        path = generate_flights_summary_pdf(flights, start, end)
-        self.w.report_status.setText(f"Reporte generado: {path}")
+
+        def work(job: JobContext):
+            from app.reporting import generate_flights_summary_pdf
+
+            with get_session() as s:
+                # The stamps are read first and the rows by later statements (pysqlite opens no read
+                # transaction), so an edit in between is printed under the older key, which no later
+                # request computes again: at worst a cache miss, never stale data
+                key = report_key("resumen", {"inicio": start, "fin": end}, data_stamps(s, start, end))
+                cached = fetch_report(key, REPORTS_DIR)
+                if cached:
+                    return cached
+                totals = flight_totals(s, start, end)
+                job.check_cancelled()
+                # Rows stream from the cursor onto the pages: memory doesn't grow with the range
+                flights = iter_flight_rows(s, start, end)
+                path = generate_flights_summary_pdf(flights, start, end, progress=job.progress, totals=totals)
+            store_report(key, path)
+            return path
+
+        self._submit_report("Reporte de vuelos", work)
 
     def _on_generate_report_prepost(self):
         # Use month/year from start date for the layout
         d = self.w.report_start.date().toPython()
         month, year = d.month, d.year
-        client_name = self.w.report_client.currentText()
-        if client_name == "(Todos)":
-            client_name = ""
-        matricula = self.w.report_aircraft.currentText()
-        if matricula == "(Todas)":
-            matricula = ""
-        # Pull flights for the month
-        start = date(year, month, 1)
-        end = date(year + (1 if month == 12 else 0), 1 if month == 12 else month + 1, 1)
-        with get_session() as s:
-            flights = list_flights_in_range(s, start, end)
-        # Apply filters if provided
-        if matricula:
-            flights = [f for f in flights if f.aircraft and f.aircraft.registration == matricula]
-        if client_name:
-            flights = [f for f in flights if f.client and f.client.name == client_name]
-        path = generate_bitacora_pre_post_pdf(flights, month, year, client_name, matricula)
-        self.w.report_status.setText(f"Bitácora PRE/POST: {path}")
+        filters = self._report_filters()
+        if filters is None:
+            return
+        aircraft_id, matricula, client_id, client_name = filters
+
+        def work(job: JobContext):
+            from app.reporting import generate_bitacora_pre_post_pdf
+
+            with get_session() as s:
+                stamps = month_stamps(s, year, month, aircraft_id=aircraft_id, client_id=client_id)
+                key = report_key("pre_post", month_report_params(month, year, client_name, matricula), stamps)
+                cached = fetch_report(key, REPORTS_DIR)
+                if cached:
+                    return cached
+                flights = list_month_rows(s, year, month, aircraft_id=aircraft_id, client_id=client_id)
+            job.check_cancelled()
+            path = generate_bitacora_pre_post_pdf(flights, month, year, client_name, matricula, progress=job.progress)
+            store_report(key, path)
+            return path
+
+        self._submit_report("Bitácora PRE/POST", work)
 
     def _on_generate_report_consumibles(self):
         d = self.w.report_start.date().toPython()
         month, year = d.month, d.year
-        client_name = self.w.report_client.currentText()
-        if client_name == "(Todos)":
-            client_name = ""
-        matricula = self.w.report_aircraft.currentText()
-        if matricula == "(Todas)":
-            matricula = ""
-        start = date(year, month, 1)
-        end = date(year + (1 if month == 12 else 0), 1 if month == 12 else month + 1, 1)
-        with get_session() as s:
-            flights = list_flights_in_range(s, start, end)
-        if matricula:
-            flights = [f for f in flights if f.aircraft and f.aircraft.registration == matricula]
-        if client_name:
-            flights = [f for f in flights if f.client and f.client.name == client_name]
-        path = generate_consumibles_servicios_pdf(flights, month, year, client_name, matricula)
-        self.w.report_status.setText(f"Consumibles y Servicios: {path}")
+        filters = self._report_filters()
+        if filters is None:
+            return
+        aircraft_id, matricula, client_id, client_name = filters
+
+        def work(job: JobContext):
+            from app.reporting import generate_consumibles_servicios_pdf
+
+            with get_session() as s:
+                stamps = month_stamps(s, year, month, aircraft_id=aircraft_id, client_id=client_id)
+                key = report_key("consumibles", month_report_params(month, year, client_name, matricula), stamps)
+                cached = fetch_report(key, REPORTS_DIR)
+                if cached:
+                    return cached
+                flights = list_month_rows(s, year, month, aircraft_id=aircraft_id, client_id=client_id, with_supplies=True)
+                # Footer totals cover the calendar month only, same rows the PDF prints
+                start, end = month_range(year, month)
+                totals = supply_totals(s, start, end - timedelta(days=1), aircraft_id=aircraft_id, client_id=client_id)
+            job.check_cancelled()
+            path = generate_consumibles_servicios_pdf(
+                flights, month, year, client_name, matricula, progress=job.progress, totals=totals
+            )
+            store_report(key, path)
+            return path
+
+        self._submit_report("Consumibles y Servicios", work)
+
+    def _on_generate_month_batch(self):
+        # Every aircraft x client pair of the start date's month, rendered across CPU cores
+        d = self.w.report_start.date().toPython()
+        month, year = d.month, d.year
+
+        def work(job: JobContext):
+            from app.batch import run_month_batch
+
+            return run_month_batch(year, month, progress=job.progress)
+
+        self._submit_report(f"Lote {month:02d}/{year}", work)
+
+    def _on_export_flights(self):
+        start = self.w.report_start.date().toPython()
+        end = self.w.report_end.date().toPython()
+        if start > end:
+            QtWidgets.QMessageBox.warning(self.w, "Validación", "La fecha inicial debe ser <= a la final")
+            return
+        filters = self._report_filters()
+        if filters is None:
+            return
+        aircraft_id, _, client_id, _ = filters
+        from app.exporter import COLUMNS, DEFAULT_COLUMNS, export_flights
+
+        dlg = ColumnPickerDialog(
+            "Columnas a exportar",
+            [(key, col.header) for key, col in COLUMNS.items()],
+            set(self._export_columns or DEFAULT_COLUMNS),
+            self.w,
+        )
+        if dlg.exec() != QtWidgets.QDialog.Accepted:
+            return
+        columns = dlg.selected_keys()
+        if not columns:
+            QtWidgets.QMessageBox.warning(self.w, "Validación", "Seleccione al menos una columna")
+            return
+        self._export_columns = columns
+        path, selected = QtWidgets.QFileDialog.getSaveFileName(
+            self.w, "Exportar vuelos", f"vuelos_{start.isoformat()}_a_{end.isoformat()}.csv", "CSV (*.csv);;Excel (*.xlsx)"
+        )
+        if not path:
+            return
+        if Path(path).suffix.lower() not in (".csv", ".xlsx"):
+            path += ".xlsx" if "xlsx" in selected else ".csv"
+
+        def work(job: JobContext):
+            return export_flights(
+                Path(path), start, end, columns, aircraft_id=aircraft_id, client_id=client_id, progress=job.progress
+            ).path
+
+        self._submit_report("Exportación", work)
 
 
 def main() -> int:
@@ -693,8 +1186,15 @@ def main() -> int:
     # Keep a strong reference to the controller to prevent GC disconnecting signals
     w.controller = Controller(w)
     w.show()
-    return app.exec()
+    code = app.exec()
+    # Don't tear down the DB engine under a half-written PDF
+    for runner in (w.controller.loader, w.controller.jobs):
+        runner.cancel()
+        runner.wait()
+    return code
 
 
 if __name__ == "__main__":
+    # Batch reports use a process pool; required for the frozen (PyInstaller) Windows build
+    multiprocessing.freeze_support()
     raise SystemExit(main())
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date
+
+from app.batch import run_month_batch
+from app.repository import init_db
+
+
+def main() -> None:
+    today = date.today()
+    parser = argparse.ArgumentParser(description="Genera las bitácoras PRE/POST y consumibles de todas las aeronaves/clientes de un mes.")
+    parser.add_argument("--year", type=int, default=today.year)
+    parser.add_argument("--month", type=int, default=today.month)
+    parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo (por omisión, núcleos de CPU)")
+    parser.add_argument("--sin-cache", action="store_true", help="Regenerar también los PDF sin cambios desde el último lote")
+    args = parser.parse_args()
+
+    init_db()
+    manifest = run_month_batch(args.year, args.month, workers=args.workers, use_cache=not args.sin_cache)
+    data = json.loads(manifest.read_text(encoding="utf-8"))
+    print(
+        f"{data['grupos']} grupos ({data['desde_cache']} sin cambios), {data['vuelos']} vuelos "
+        f"en {data['segundos_total']:.2f}s ({data['procesos']} procesos)"
+    )
+    for err in data["errores"]:
+        print(f"ERROR {err['matricula']} / {err['cliente']}: {err['error']}")
+    print(f"Manifiesto: {manifest}")
+
+
+if __name__ == "__main__":
+    main()
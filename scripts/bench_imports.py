@@ -0,0 +1,63 @@
+"""Import cost of starting the application, measured with ``python -X importtime``.
+
+Imports `main` (what launching the window imports before any page is shown) in fresh
+interpreters, then prints the median total and the modules with the largest cumulative time.
+Exits with status 1 if a module that should load on first use (reportlab, PDF generation,
+import/export engines) was imported at startup. The PyInstaller build loads the same import
+graph from its archive, so this is also what its cold start pays.
+
+Usage (from the project root):
+
+    python -m scripts.bench_imports --repeat 5 --top 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict
+
+# Loaded by the handlers/jobs that use them, never while starting up
+LAZY = ["reportlab", "PIL", "openpyxl", "app.reporting", "app.pdf_layout", "app.batch", "app.exporter", "app.importer"]
+
+
+def _importtime(module: str) -> Dict[str, float]:
+    # One process per run; returns module -> cumulative ms (first import of each name)
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    times: Dict[str, float] = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times.setdefault(name.strip(), int(cumulative) / 1000)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main", help="Módulo a importar (por defecto main)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20, help="Módulos más costosos a listar")
+    args = parser.parse_args()
+
+    runs = [_importtime(args.module) for _ in range(args.repeat)]
+    names = set().union(*runs)
+    median = {n: statistics.median(r.get(n, 0.0) for r in runs) for n in names}
+    print(f"import {args.module}: {median[args.module]:.1f} ms (mediana de {args.repeat})")
+    print(f"\n{'módulo':<50}{'acumulado ms':>14}")
+    for name in sorted(names - {args.module}, key=median.get, reverse=True)[: args.top]:
+        print(f"{name:<50}{median[name]:>14.1f}")
+
+    eager = [m for m in LAZY if m in names]
+    if eager:
+        print(f"\nImportados al arrancar (deberían cargarse al usarse): {', '.join(eager)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
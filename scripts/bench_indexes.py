@@ -0,0 +1,164 @@
+"""Range-query latency on flight_logs with and without the report indexes.
+
+Usage (from the project root):
+
+    python -m scripts.bench_indexes --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.models import FlightLog, FlightSupply
+from app.repository import list_flights_in_range
+
+
+INDEXES = {
+    "ix_flight_logs_flight_date": "flight_logs (flight_date)",
+    "ix_flight_logs_aircraft_date": "flight_logs (aircraft_id, flight_date)",
+    "ix_flight_logs_client_date": "flight_logs (client_id, flight_date)",
+    "ix_flight_supplies_flight_id": "flight_supplies (flight_id)",
+}
+
+N_AIRCRAFT = 50
+N_CLIENTS = 200
+N_SUPPLIES = 40
+YEARS = 10
+
+
+def _fill(engine, rows: int, seed: int = 1) -> None:
+    rnd = random.Random(seed)
+    first_day = date(date.today().year - YEARS + 1, 1, 1)
+    span = (date(date.today().year + 1, 1, 1) - first_day).days
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO aircraft (id, registration) VALUES (?, ?)",
+            [(i, f"XA-{i:03d}") for i in range(1, N_AIRCRAFT + 1)],
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO clients (id, name) VALUES (?, ?)",
+            [(i, f"CLIENTE {i:04d}") for i in range(1, N_CLIENTS + 1)],
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO supplies (id, name, unit, cost_per_unit) VALUES (?, ?, 'unidad', 100)",
+            [(i, f"INSUMO {i:03d}") for i in range(1, N_SUPPLIES + 1)],
+        )
+        batch = 50_000
+        supply_id = 1
+        for offset in range(0, rows, batch):
+            flights = []
+            supplies = []
+            for fid in range(offset + 1, min(offset + batch, rows) + 1):
+                d = first_day + timedelta(days=rnd.randrange(span))
+                flights.append((
+                    fid, d.isoformat(), rnd.randint(1, N_AIRCRAFT), rnd.randint(1, N_CLIENTS),
+                    "PILOTO", "MTY", "MEX", rnd.randint(20, 300), rnd.randint(1, 3),
+                ))
+                if rnd.random() < 0.5:
+                    supplies.append((supply_id, fid, rnd.randint(1, N_SUPPLIES), 1, 100, 0))
+                    supply_id += 1
+            conn.exec_driver_sql(
+                "INSERT INTO flight_logs (id, flight_date, aircraft_id, client_id, pilot, origin, destination, flight_minutes, landings) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                flights,
+            )
+            conn.exec_driver_sql(
+                "INSERT INTO flight_supplies (id, flight_id, supply_id, quantity, unit_cost, viaticos) VALUES (?, ?, ?, ?, ?, ?)",
+                supplies,
+            )
+        conn.exec_driver_sql("ANALYZE")
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def _queries(engine):
+    today = date.today()
+    start = date(today.year, today.month, 1)
+    end = date(today.year + (1 if today.month == 12 else 0), 1 if today.month == 12 else today.month + 1, 1)
+
+    def month_orm():
+        with Session(engine) as s:
+            list_flights_in_range(s, start, end)
+
+    def month_ids():
+        with Session(engine) as s:
+            s.scalars(select(FlightLog.id).where(FlightLog.flight_date.between(start, end))).all()
+
+    def aircraft_month():
+        with Session(engine) as s:
+            s.scalars(
+                select(FlightLog.id).where(FlightLog.aircraft_id == 7, FlightLog.flight_date.between(start, end))
+            ).all()
+
+    def client_month():
+        with Session(engine) as s:
+            s.scalars(
+                select(FlightLog.id).where(FlightLog.client_id == 7, FlightLog.flight_date.between(start, end))
+            ).all()
+
+    def supplies_of_month():
+        with Session(engine) as s:
+            ids = select(FlightLog.id).where(FlightLog.flight_date.between(start, end))
+            s.scalars(select(FlightSupply).where(FlightSupply.flight_id.in_(ids))).all()
+
+    return {
+        "mes_orm": month_orm,
+        "mes_ids": month_ids,
+        "aeronave_mes": aircraft_month,
+        "cliente_mes": client_month,
+        "insumos_mes": supplies_of_month,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            path = Path(tmp) / f"bench_{rows}.db"
+            engine = create_engine(f"sqlite:///{path.as_posix()}")
+            Base.metadata.create_all(engine)
+            _fill(engine, rows)
+            queries = _queries(engine)
+
+            with engine.begin() as conn:
+                for name in INDEXES:
+                    conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+            before = {name: _time(fn, args.repeat) for name, fn in queries.items()}
+
+            with engine.begin() as conn:
+                for name, target in INDEXES.items():
+                    conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+                conn.exec_driver_sql("ANALYZE")
+            after = {name: _time(fn, args.repeat) for name, fn in queries.items()}
+            engine.dispose()
+
+            print(f"\n{rows:,} vuelos (mediana de {args.repeat}, ms)")
+            print(f"{'consulta':<14}{'sin índices':>14}{'con índices':>14}{'mejora':>10}")
+            for name in queries:
+                b, a = before[name], after[name]
+                print(f"{name:<14}{b:>14.2f}{a:>14.2f}{b / a if a else 0:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
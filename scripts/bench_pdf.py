@@ -0,0 +1,97 @@
+"""PDF throughput of the three reports, in pages and rows per second.
+
+Renders each report from synthetic in-memory rows of one month (no database), so only the
+layout engine and reportlab are measured. With --perfil, prints the functions with the most
+own time across all the renders.
+
+Usage (from the project root):
+
+    python -m scripts.bench_pdf --vuelos 2000 --repeat 5
+    python -m scripts.bench_pdf --vuelos 500 --perfil
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import pstats
+import random
+import re
+import statistics
+import tempfile
+import time
+from datetime import date, time as dtime
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+from app.reporting import (
+    generate_bitacora_pre_post_pdf,
+    generate_consumibles_servicios_pdf,
+    generate_flights_summary_pdf,
+)
+from app.repository import FlightRow, SupplyRow
+from scripts.synthetic_data import AIRPORTS, CONCEPTS, NOTES, SERVICE_TYPES, SUPPLIES
+
+YEAR, MONTH = 2024, 3
+_PAGE = re.compile(rb"/Type /Page[^s]")
+
+
+def _rows(n: int, seed: int = 7) -> List[FlightRow]:
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(1, n + 1):
+        supplies = tuple(
+            SupplyRow(i, name, Decimal(rnd.randint(1, 300)), Decimal(str(cost)), Decimal(rnd.choice(["0", "0", "350", "800"])))
+            for name, _, cost in rnd.sample(SUPPLIES, rnd.choice([0, 1, 2, 3]))
+        )
+        rows.append(FlightRow(
+            i, date(YEAR, MONTH, 1 + (i * 28) // (n + 1)), 1, "XA-BENCH", 1, "CLIENTE DE PRUEBA, S.A. DE C.V.",
+            "PILOTO PRUEBA", rnd.choice(AIRPORTS), rnd.choice(AIRPORTS), rnd.choice(SERVICE_TYPES),
+            dtime(rnd.randint(6, 20), rnd.choice([0, 15, 30, 45])), "MECÁNICO", rnd.choice(CONCEPTS),
+            rnd.randint(20, 300), rnd.randint(1, 4), rnd.choice(NOTES), supplies,
+        ))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vuelos", type=int, default=2000, help="Vuelos en el mes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--perfil", action="store_true", help="Perfilar con cProfile y listar las funciones más costosas")
+    args = parser.parse_args()
+
+    rows = _rows(args.vuelos)
+    start, end = date(YEAR, MONTH, 1), date(YEAR, MONTH, 31)
+    reports = {
+        "resumen": lambda out: generate_flights_summary_pdf(rows, start, end, out_dir=out),
+        "pre_post": lambda out: generate_bitacora_pre_post_pdf(rows, MONTH, YEAR, "CLIENTE", "XA-BENCH", out_dir=out),
+        "consumibles": lambda out: generate_consumibles_servicios_pdf(rows, MONTH, YEAR, "CLIENTE", "XA-BENCH", out_dir=out),
+    }
+    profiler = cProfile.Profile() if args.perfil else None
+    print(f"{args.vuelos:,} vuelos, {sum(len(r.supplies) for r in rows):,} líneas de insumos\n")
+    print(f"{'reporte':<14}{'págs':>6}{'KB':>7}{'mediana ms':>12}{'págs/s':>10}{'vuelos/s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        for name, render in reports.items():
+            render(out)  # fonts and module state warm
+            times = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                if profiler:
+                    profiler.enable()
+                path = render(out)
+                if profiler:
+                    profiler.disable()
+                times.append(time.perf_counter() - t0)
+            data = path.read_bytes()
+            pages = len(_PAGE.findall(data))
+            median = statistics.median(times)
+            print(f"{name:<14}{pages:>6}{len(data) // 1024:>7}{median * 1000:>12.1f}{pages / median:>10.0f}{len(rows) / median:>11.0f}")
+    if profiler:
+        print()
+        pstats.Stats(profiler).sort_stats("tottime").print_stats(15)
+
+
+if __name__ == "__main__":
+    main()
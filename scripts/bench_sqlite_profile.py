@@ -0,0 +1,63 @@
+"""Insert and commit throughput for each SQLite connection profile.
+
+Usage (from the project root):
+
+    python -m scripts.bench_sqlite_profile --commits 500 --bulk 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base, SQLITE_PROFILES, create_app_engine
+from app.repository import add_aircraft, add_flight, add_flight_supply, add_supply
+
+
+def _run(profile: str, path: Path, commits: int, bulk: int) -> dict[str, float]:
+    engine = create_app_engine(f"sqlite:///{path.as_posix()}", profile)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    with Session.begin() as s:
+        aircraft_id = add_aircraft(s, registration="XA-JMA").id
+        supply_id = add_supply(s, name="ACEITE", unit="litro", cost_per_unit=150).id
+
+    # One flight + one supply per transaction, like the "Guardar vuelo" button
+    t0 = time.perf_counter()
+    for i in range(commits):
+        with Session.begin() as s:
+            f = add_flight(s, date(2024, 1, 1) + timedelta(days=i % 365), aircraft_id, None, "PILOTO", None, "MTY", "MEX", 60, 1)
+            add_flight_supply(s, f.id, supply_id, 1, 150)
+    commit_secs = time.perf_counter() - t0
+
+    # Many flights in a single transaction
+    t0 = time.perf_counter()
+    with Session.begin() as s:
+        for i in range(bulk):
+            add_flight(s, date(2024, 1, 1) + timedelta(days=i % 365), aircraft_id, None, "PILOTO", None, "MTY", "MEX", 60, 1)
+    bulk_secs = time.perf_counter() - t0
+    engine.dispose()
+    return {"commits_per_s": commits / commit_secs, "bulk_rows_per_s": bulk / bulk_secs}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=500)
+    parser.add_argument("--bulk", type=int, default=50_000)
+    parser.add_argument("--dir", type=Path, default=None, help="Directorio para la BD temporal (disco a medir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        print(f"{'perfil':<10}{'commits/s':>14}{'filas/s (lote)':>18}")
+        for name in SQLITE_PROFILES:
+            res = _run(name, Path(tmp) / f"{name}.db", args.commits, args.bulk)
+            print(f"{name:<10}{res['commits_per_s']:>14,.0f}{res['bulk_rows_per_s']:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Time from launching the application to its first paint and to the landing page's rows.
+
+Builds a synthetic database (the scales of scripts.benchmark) and starts the application on it
+several times in a child process through BITACORAS_DB. Each run reports milliseconds since the
+process was spawned for: imports done, window built, controller built, first paint event and
+Clientes table filled. Without a display, run with QT_QPA_PLATFORM=offscreen.
+
+Usage (from the project root):
+
+    python -m scripts.bench_startup --scale large --repeat 5
+    python -m scripts.bench_startup --db data/bitacoras.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+MARKS = [
+    ("importado", "imports"),
+    ("ventana", "ventana construida"),
+    ("controlador", "controlador construido"),
+    ("pintado", "primer pintado"),
+    ("datos", "clientes en la tabla"),
+]
+TIMEOUT_MS = 60_000
+
+
+def _child(spawned: float) -> None:
+    from PySide6 import QtCore, QtWidgets
+
+    import main as app_main
+
+    marks = {"importado": time.time()}
+    app = QtWidgets.QApplication(sys.argv[:1])
+
+    class FirstPaint(QtCore.QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QtCore.QEvent.Paint and "pintado" not in marks:
+                marks["pintado"] = time.time()
+            return False
+
+    first_paint = FirstPaint()
+    app.installEventFilter(first_paint)
+    w = app_main.MainWindow()
+    marks["ventana"] = time.time()
+    w.controller = app_main.Controller(w)
+    marks["controlador"] = time.time()
+
+    def check():
+        if "datos" not in marks and w.clients_table.model().rowCount():
+            marks["datos"] = time.time()
+        if "pintado" in marks and "datos" in marks:
+            app.quit()
+
+    check()
+    w.show()
+    poll = QtCore.QTimer()
+    poll.timeout.connect(check)
+    poll.start(1)
+    QtCore.QTimer.singleShot(TIMEOUT_MS, app.quit)
+    app.exec()
+    for runner in (w.controller.loader, w.controller.jobs):
+        runner.cancel()
+        runner.wait()
+    print(json.dumps({k: round((v - spawned) * 1000, 1) for k, v in marks.items()}))
+
+
+def _build_db(path: Path, scale: str) -> None:
+    from app.db import create_app_engine
+    from app.repository import init_db
+    from scripts.benchmark import END, SCALES
+    from scripts.synthetic_data import populate
+
+    engine = create_app_engine(f"sqlite:///{path.as_posix()}")
+    init_db(engine)
+    counts = populate(engine, *SCALES[scale], end=END)
+    engine.dispose()
+    print(f"{scale}: {counts['flights']:,} vuelos, {counts['clients']:,} clientes")
+
+
+def main() -> None:
+    from scripts.benchmark import SCALES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=list(SCALES), default="large")
+    parser.add_argument("--db", type=Path, default=None, help="Usar esta base en lugar de generar una")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dir", type=Path, default=None, help="Directorio para la BD temporal")
+    parser.add_argument("--hijo", type=float, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.hijo is not None:
+        _child(args.hijo)
+        return
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = args.db
+        if path is None:
+            path = Path(tmp) / f"arranque_{args.scale}.db"
+            _build_db(path, args.scale)
+        elif not path.exists():
+            parser.error(f"{path} no existe")
+        env = dict(os.environ, BITACORAS_DB=str(path.resolve()))
+        runs = []
+        for _ in range(args.repeat):
+            spawned = time.time()
+            out = subprocess.run(
+                [sys.executable, "-m", "scripts.bench_startup", "--hijo", repr(spawned)],
+                env=env, capture_output=True, text=True, check=True,
+            )
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{'':<26}{'mediana ms':>12}{'mín ms':>10}")
+    for key, label in MARKS:
+        samples = [r[key] for r in runs if key in r]
+        if samples:
+            print(f"{label:<26}{statistics.median(samples):>12.1f}{min(samples):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Time the repository and reporting hot paths on synthetic databases of several sizes.
+
+Usage (from the project root):
+
+    python -m scripts.benchmark --scales small medium --out reports/bench.json
+    python -m scripts.benchmark --scales small --compare reports/bench.json
+
+Each scale gets a fresh scratch database. The results are written as JSON so runs from
+different versions can be compared with --compare.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from app.aggregates import breakdown, flight_totals, monthly_trend, supply_totals
+from app.db import create_app_engine
+from app.maintenance import add_inspection_interval, due_soon, record_inspection
+from app.reporting import (
+    generate_bitacora_pre_post_pdf,
+    generate_consumibles_servicios_pdf,
+    generate_flights_summary_pdf,
+)
+from app.repository import (
+    add_flight,
+    add_flight_supply,
+    date_page_key,
+    init_db,
+    list_flight_page,
+    list_flight_rows,
+    list_month_rows,
+    month_range,
+    list_flights_in_range,
+)
+from app.rollups import rebuild_rollups
+from scripts.synthetic_data import populate
+
+
+# name -> (aircraft, clients, years, flights per aircraft per day)
+SCALES = {
+    "small": (5, 20, 1, 0.8),
+    "medium": (20, 80, 3, 0.8),
+    "large": (60, 250, 5, 1.0),
+}
+
+END = date(2024, 12, 31)
+
+
+def _time(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {"median_ms": round(statistics.median(samples) * 1000, 3), "min_ms": round(min(samples) * 1000, 3)}
+
+
+def _git_rev() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scale(name: str, tmp: Path, repeat: int, bulk: int) -> dict:
+    aircraft, clients, years, per_day = SCALES[name]
+    path = tmp / f"bench_{name}.db"
+    engine = create_app_engine(f"sqlite:///{path.as_posix()}")
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    timings: Dict[str, Dict[str, float]] = {}
+
+    t0 = time.perf_counter()
+    init_db(engine)
+    timings["init_db_vacia"] = {"median_ms": round((time.perf_counter() - t0) * 1000, 3)}
+    t0 = time.perf_counter()
+    counts = populate(engine, aircraft, clients, years, per_day, end=END)
+    fill_secs = time.perf_counter() - t0
+    # Second run on a populated, up-to-date database: only reads PRAGMA user_version
+    timings["init_db_existente"] = _time(lambda: init_db(engine), repeat)
+
+    start, end = month_range(END.year, END.month)
+    year_start, year_end = date(END.year, 1, 1), date(END.year + 1, 1, 1)
+
+    def orm_month():
+        with Session() as s:
+            return list_flights_in_range(s, start, end)
+
+    def orm_year():
+        with Session() as s:
+            return list_flights_in_range(s, year_start, year_end)
+
+    def rows_month():
+        with Session() as s:
+            return list_flight_rows(s, start, end, with_supplies=True)
+
+    def rows_year():
+        with Session() as s:
+            return list_flight_rows(s, year_start, year_end, with_supplies=True)
+
+    timings["list_flights_in_range_mes"] = _time(orm_month, repeat)
+    timings["list_flights_in_range_anio"] = _time(orm_year, repeat)
+    timings["list_flight_rows_mes"] = _time(rows_month, repeat)
+    timings["list_flight_rows_anio"] = _time(rows_year, repeat)
+
+    # Keyset pages should cost the same at every scale
+    def page_newest():
+        with Session() as s:
+            return list_flight_page(s)
+
+    def page_jump():
+        with Session() as s:
+            return list_flight_page(s, older_than=date_page_key(date(END.year, 6, 15)), aircraft_id=1)
+
+    timings["pagina_recientes"] = _time(page_newest, repeat)
+    timings["pagina_salto_aeronave"] = _time(page_jump, repeat)
+
+    # Whole months come from monthly_rollups; only partial-month edges touch flight_logs
+    def dashboard_year():
+        with Session() as s:
+            last = year_end - timedelta(days=1)
+            flight_totals(s, year_start, last)
+            supply_totals(s, year_start, last)
+            breakdown(s, "aircraft", year_start, last)
+            return breakdown(s, "client", year_start, last)
+
+    def trend_all():
+        with Session() as s:
+            return monthly_trend(s, date(END.year - years + 1, 1, 1), END)
+
+    def rollups_rebuild():
+        with engine.begin() as conn:
+            return rebuild_rollups(conn)
+
+    timings["tablero_anio"] = _time(dashboard_year, repeat)
+    timings["tendencia_mensual"] = _time(trend_all, repeat)
+    timings["reconstruir_rollups"] = _time(rollups_rebuild, 1)
+
+    # Fleet inspection check reads one counter row per aircraft and interval
+    with Session.begin() as s:
+        intervals = [add_inspection_interval(s, "100 horas", 100).id, add_inspection_interval(s, "Tren", landings=500).id]
+        for aircraft_id in range(1, aircraft + 1):
+            for interval_id in intervals:
+                record_inspection(s, aircraft_id, interval_id, date(END.year, 11, 1))
+
+    def fleet_due():
+        with Session() as s:
+            return due_soon(s)
+
+    timings["mantenimiento_flota"] = _time(fleet_due, repeat)
+
+    def bulk_insert():
+        # Same path as the flight form: one add_flight (+ supply) per row, a single commit
+        with Session.begin() as s:
+            for i in range(bulk):
+                f = add_flight(s, year_start + timedelta(days=i % 365), 1, 1, "PILOTO", None, "MTY", "MEX", 60, 1)
+                add_flight_supply(s, f.id, 1, 10, 24.5)
+
+    timings["add_flight_lote"] = _time(bulk_insert, 1)
+    timings["add_flight_lote"]["filas_por_s"] = round(bulk / (timings["add_flight_lote"]["median_ms"] / 1000), 1)
+
+    month_rows = rows_month()
+    with Session() as s:
+        group = list_month_rows(s, END.year, END.month, aircraft_id=1, with_supplies=True)
+    client_name = group[0].client_name if group else ""
+    out = tmp / f"pdf_{name}"
+    timings["pdf_resumen_mes"] = _time(lambda: generate_flights_summary_pdf(month_rows, start, end, out_dir=out), repeat)
+    timings["pdf_pre_post"] = _time(
+        lambda: generate_bitacora_pre_post_pdf(group, END.month, END.year, client_name, "XA-BENCH", out_dir=out), repeat
+    )
+    timings["pdf_consumibles"] = _time(
+        lambda: generate_consumibles_servicios_pdf(group, END.month, END.year, client_name, "XA-BENCH", out_dir=out), repeat
+    )
+    engine.dispose()
+    return {
+        "datos": {**counts, "vuelos_mes": len(month_rows), "vuelos_grupo": len(group), "segundos_llenado": round(fill_secs, 3)},
+        "tiempos": timings,
+    }
+
+
+def _compare(current: dict, previous: dict) -> None:
+    print(f"\nComparación contra {previous.get('git') or previous.get('fecha')} (mediana, ms)")
+    print(f"{'escala':<8}{'medición':<30}{'antes':>12}{'ahora':>12}{'cambio':>10}")
+    for scale, res in current["escalas"].items():
+        old = previous.get("escalas", {}).get(scale)
+        if not old:
+            continue
+        for key, t in res["tiempos"].items():
+            before = old["tiempos"].get(key, {}).get("median_ms")
+            if before is None:
+                continue
+            now = t["median_ms"]
+            print(f"{scale:<8}{key:<30}{before:>12.2f}{now:>12.2f}{(now - before) / before * 100 if before else 0:>+9.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--bulk", type=int, default=2_000, help="Vuelos para la inserción en lote con add_flight")
+    parser.add_argument("--out", type=Path, default=None, help="Archivo JSON de resultados")
+    parser.add_argument("--compare", type=Path, default=None, help="JSON de una corrida anterior")
+    parser.add_argument("--dir", type=Path, default=None, help="Directorio para las BD temporales")
+    args = parser.parse_args()
+
+    result = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "git": _git_rev(),
+        "python": sys.version.split()[0],
+        "sqlalchemy": sqlalchemy.__version__,
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "repeticiones": args.repeat,
+        "escalas": {},
+    }
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for name in args.scales:
+            res = run_scale(name, Path(tmp), args.repeat, args.bulk)
+            result["escalas"][name] = res
+            print(f"\n{name}: {res['datos']['flights']:,} vuelos, {res['datos']['supplies']:,} insumos")
+            for key, t in res["tiempos"].items():
+                print(f"  {key:<30}{t['median_ms']:>12.2f} ms")
+
+    if args.compare:
+        _compare(result, json.loads(args.compare.read_text(encoding="utf-8")))
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nResultados: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
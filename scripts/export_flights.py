@@ -0,0 +1,52 @@
+"""Export flights and their supplies for a date range to CSV or XLSX.
+
+Usage (from the project root):
+
+    python -m scripts.export_flights vuelos_2023.xlsx --desde 2023-01-01 --hasta 2023-12-31
+    python -m scripts.export_flights vuelos.csv --desde 2024-01-01 --hasta 2024-06-30 --matricula XA-JMA \\
+        --columnas fecha matricula cliente minutos insumo importe
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import select
+
+from app.db import get_session
+from app.exporter import COLUMNS, DEFAULT_COLUMNS, export_flights
+from app.models import Aircraft, Client
+
+
+def _lookup_id(model, attr: str, value: str | None) -> int | None:
+    if not value:
+        return None
+    with get_session() as s:
+        found = s.scalar(select(model.id).where(getattr(model, attr) == value))
+    if found is None:
+        sys.exit(f"No existe: {value}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="Archivo .csv o .xlsx")
+    parser.add_argument("--desde", type=date.fromisoformat, required=True)
+    parser.add_argument("--hasta", type=date.fromisoformat, required=True)
+    parser.add_argument("--matricula", default=None)
+    parser.add_argument("--cliente", default=None)
+    parser.add_argument("--columnas", nargs="+", choices=list(COLUMNS), default=DEFAULT_COLUMNS)
+    args = parser.parse_args()
+
+    aircraft_id = _lookup_id(Aircraft, "registration", args.matricula)
+    client_id = _lookup_id(Client, "name", args.cliente)
+    result = export_flights(args.path, args.desde, args.hasta, args.columnas, aircraft_id=aircraft_id, client_id=client_id)
+    rate = result.rows / result.seconds if result.seconds else 0
+    print(f"{result.rows:,} filas en {result.seconds:.2f} s ({rate:,.0f} filas/s): {result.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Import flight logs from a CSV or XLSX file into the application database.
+
+Usage (from the project root):
+
+    python -m scripts.import_flights bitacoras_2023.xlsx --crear-catalogos --errores errores.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from app.importer import KIND_LABELS, ImportFileError, import_flights, write_errors
+from app.repository import init_db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--crear-catalogos", action="store_true", help="Dar de alta aeronaves, clientes, etc. que no existan")
+    parser.add_argument("--errores", type=Path, default=None, help="CSV donde escribir las filas rechazadas")
+    parser.add_argument("--lote", type=int, default=5_000, help="Vuelos por transacción")
+    args = parser.parse_args()
+
+    init_db()
+    try:
+        result = import_flights(args.path, create_missing=args.crear_catalogos, batch_size=args.lote)
+    except ImportFileError as exc:
+        sys.exit(str(exc))
+    rate = result.flights / result.seconds if result.seconds else 0
+    print(f"{result.rows:,} filas, {result.flights:,} vuelos, {result.supplies:,} insumos en {result.seconds:.2f} s ({rate:,.0f} vuelos/s)")
+    for kind, n in result.created.items():
+        print(f"  {KIND_LABELS[kind]} creados: {n}")
+    if result.errors:
+        print(f"{len(result.errors):,} filas con error")
+        for e in result.errors[:10]:
+            print(f"  línea {e.line}: {e.message}")
+        if args.errores:
+            print(f"Lista completa: {write_errors(args.errores, result.errors)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Recompute the trigger-maintained totals (monthly rollups, aircraft counters) from every flight.
+
+These tables are kept current by triggers; run this after restoring a backup, editing the DB by
+hand with triggers disabled, or to check that the incremental totals still match.
+
+Usage (from the project root):
+
+    python -m scripts.rebuild_rollups [--db data/otra.db] [--verificar]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from app.db import create_app_engine, engine as default_engine
+from app.maintenance import rebuild_counters
+from app.repository import init_db
+from app.rollups import ROLLUP_TABLE, rebuild_rollups
+
+# label, tables whose contents are compared with --verificar, rebuild function
+TARGETS = [
+    ("meses/aeronave/cliente", [ROLLUP_TABLE], rebuild_rollups),
+    ("contadores de aeronave", ["aircraft_counters", "aircraft_inspections"], rebuild_counters),
+]
+
+
+def _snapshot(conn, tables) -> set:
+    return {(t, *row) for t in tables for row in conn.exec_driver_sql(f"SELECT * FROM {t}")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=None, help="Archivo SQLite (por defecto la base de la aplicación)")
+    parser.add_argument("--verificar", action="store_true", help="Comparar con los totales actuales antes de reemplazarlos")
+    args = parser.parse_args()
+
+    if args.db and not args.db.exists():
+        parser.error(f"{args.db} no existe")
+    engine = create_app_engine(f"sqlite:///{args.db.as_posix()}") if args.db else default_engine
+    init_db(engine)
+    mismatches = 0
+    with engine.begin() as conn:
+        for label, tables, rebuild in TARGETS:
+            before = _snapshot(conn, tables) if args.verificar else set()
+            t0 = time.perf_counter()
+            n = rebuild(conn)
+            print(f"{n:,} {label} recalculados en {time.perf_counter() - t0:.2f} s")
+            if not args.verificar:
+                continue
+            after = _snapshot(conn, tables)
+            diff = before ^ after
+            mismatches += len(diff)
+            if diff:
+                print(f"  {len(diff)} filas diferían de los totales incrementales:", file=sys.stderr)
+                for row in sorted(diff, key=repr)[:20]:
+                    print(f"    {'nuevo' if row in after else 'anterior'}: {row}", file=sys.stderr)
+            else:
+                print("  Los totales incrementales coincidían")
+    engine.dispose()
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from datetime import date
 
 from app.db import get_session
 from app.models import Aircraft
-from app.repository import init_db, list_aircraft, list_flights_in_range, add_aircraft
+from app.repository import init_db, list_aircraft, list_flight_rows, add_aircraft
 from app.reporting import generate_flights_summary_pdf
 
 
@@ -20,7 +20,7 @@ def main() -> None:
     start = date(today.year, today.month, 1)
     end = date(today.year + (1 if today.month == 12 else 0), 1 if today.month == 12 else today.month + 1, 1)
     with get_session() as s:
-        flights = list_flights_in_range(s, start, end)
+        flights = list_flight_rows(s, start, end)
     pdf_path = generate_flights_summary_pdf(flights, start, end)
     print(f"Smoke test OK. PDF: {pdf_path}")
 
@@ -0,0 +1,171 @@
+"""Fill a SQLite database with a synthetic fleet: catalogs, years of flights and their supplies.
+
+Usage (from the project root):
+
+    python -m scripts.synthetic_data data/sintetica.db --aircraft 20 --clients 80 --years 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from datetime import date, time, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy import Engine, insert
+
+from app.db import create_app_engine
+from app.models import Aircraft, Client, Concept, FlightLog, FlightSupply, Mechanic, ServiceType, Supply
+from app.repository import init_db
+
+
+MODELS = ["Cessna 206", "Cessna 208 Caravan", "Beechcraft King Air 350", "Piper PA-31", "Bell 407", "Airbus H125"]
+AIRPORTS = ["MTY", "MEX", "GDL", "TLC", "QRO", "SLP", "TRC", "CUU", "HMO", "CUN", "MID", "OAX", "VER", "TAM", "REX"]
+SUPPLIES = [
+    ("TURBOSINA", "litro", 24.5),
+    ("GASAVIÓN 100LL", "litro", 38.9),
+    ("ACEITE AEROSHELL W100", "litro", 310.0),
+    ("ACEITE TURBINA 560", "litro", 720.0),
+    ("FILTRO DE ACEITE", "pieza", 1450.0),
+    ("FILTRO DE COMBUSTIBLE", "pieza", 980.0),
+    ("LÍQUIDO HIDRÁULICO", "litro", 420.0),
+    ("NITRÓGENO", "carga", 650.0),
+    ("OXÍGENO", "carga", 900.0),
+    ("LIMPIEZA DE CABINA", "servicio", 1200.0),
+]
+SERVICE_TYPES = ["VUELO PRIVADO", "TAXI AÉREO", "AMBULANCIA", "FUMIGACIÓN", "PATRULLAJE", "ENTRENAMIENTO"]
+CONCEPTS = ["RENTA POR HORA", "TRASLADO", "PERNOCTA", "ESPERA", "POSICIONAMIENTO"]
+NOTES = [
+    "Fuga hidráulica en tren principal, se reporta a mantenimiento",
+    "Cambio de aceite y filtro",
+    "Vibración en hélice durante ascenso",
+    "Luz de advertencia de generador intermitente",
+    "Sin novedad",
+    "Turbulencia moderada en ruta",
+    "Inspección de 50 horas realizada",
+    "Neumático de nariz con desgaste",
+    "Demora por meteorología en destino",
+    "Reabastecimiento de oxígeno",
+]
+NAMES = ["JUAN", "MARÍA", "CARLOS", "ANA", "LUIS", "SOFÍA", "JORGE", "LAURA", "PEDRO", "ELENA", "MIGUEL", "ROSA"]
+SURNAMES = ["GARCÍA", "MARTÍNEZ", "LÓPEZ", "HERNÁNDEZ", "GONZÁLEZ", "PÉREZ", "RODRÍGUEZ", "SÁNCHEZ", "RAMÍREZ", "TORRES"]
+
+BATCH = 20_000
+
+
+def _person(rnd: random.Random) -> str:
+    return f"{rnd.choice(NAMES)} {rnd.choice(SURNAMES)} {rnd.choice(SURNAMES)}"
+
+
+def populate(
+    engine: Engine,
+    aircraft: int = 20,
+    clients: int = 80,
+    years: int = 3,
+    flights_per_day: float = 0.8,
+    end: Optional[date] = None,
+    seed: int = 1,
+) -> Dict[str, int]:
+    """Insert catalogs and `years` of flights ending at `end` into an initialised database.
+
+    `flights_per_day` is per aircraft. Each aircraft flies mostly for a handful of regular
+    clients, and about 60% of the flights carry one to three supply lines.
+    """
+    rnd = random.Random(seed)
+    end = end or date.today()
+    first_day = date(end.year - years + 1, 1, 1)
+    days = (end - first_day).days + 1
+
+    mechanics = [_person(rnd) for _ in range(max(3, aircraft // 3))]
+    pilots = [_person(rnd) for _ in range(max(4, aircraft))]
+    with engine.begin() as conn:
+        conn.execute(insert(Aircraft), [
+            {"id": i, "registration": f"XA-{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}{i % 10}",
+             "model": rnd.choice(MODELS), "serial_number": f"SN{rnd.randint(1000, 99999)}"}
+            for i in range(1, aircraft + 1)
+        ])
+        conn.execute(insert(Client), [
+            {"id": i, "name": f"{rnd.choice(SURNAMES)} AVIACIÓN {i:04d} SA DE CV", "rfc": f"AAA{rnd.randint(100000, 999999)}XX{i % 10}"}
+            for i in range(1, clients + 1)
+        ])
+        conn.execute(insert(Supply), [
+            {"id": i, "name": name, "unit": unit, "cost_per_unit": cost}
+            for i, (name, unit, cost) in enumerate(SUPPLIES, 1)
+        ])
+        conn.execute(insert(Mechanic), [{"id": i, "name": f"{n} ({i})"} for i, n in enumerate(mechanics, 1)])
+        conn.execute(insert(ServiceType), [{"id": i, "name": n} for i, n in enumerate(SERVICE_TYPES, 1)])
+        conn.execute(insert(Concept), [{"id": i, "name": n} for i, n in enumerate(CONCEPTS, 1)])
+
+        regulars = {a: rnd.sample(range(1, clients + 1), min(clients, 4)) for a in range(1, aircraft + 1)}
+        total = int(days * aircraft * flights_per_day)
+        flight_id = supply_id = 0
+        for offset in range(0, total, BATCH):
+            flights, supplies = [], []
+            for _ in range(min(BATCH, total - offset)):
+                flight_id += 1
+                aircraft_id = rnd.randint(1, aircraft)
+                client_id = rnd.choice(regulars[aircraft_id]) if rnd.random() < 0.85 else rnd.randint(1, clients)
+                origin, destination = rnd.sample(AIRPORTS, 2)
+                service_type_id = rnd.randint(1, len(SERVICE_TYPES))
+                flights.append({
+                    "id": flight_id,
+                    "flight_date": first_day + timedelta(days=rnd.randrange(days)),
+                    "aircraft_id": aircraft_id,
+                    "client_id": client_id if rnd.random() < 0.97 else None,
+                    "pilot": rnd.choice(pilots),
+                    "copilot": rnd.choice(pilots) if rnd.random() < 0.3 else None,
+                    "origin": origin,
+                    "destination": destination,
+                    "service_type": SERVICE_TYPES[service_type_id - 1],
+                    "service_time": time(rnd.randint(6, 20), rnd.choice((0, 15, 30, 45))),
+                    "mechanic_id": rnd.randint(1, len(mechanics)),
+                    "service_type_id": service_type_id,
+                    "concept_id": rnd.randint(1, len(CONCEPTS)),
+                    "flight_minutes": rnd.randint(20, 300),
+                    "landings": rnd.choices((1, 2, 3, 4), weights=(70, 20, 7, 3))[0],
+                    "notes": (
+                        f"{rnd.choice(NOTES)}. Pernocta en {destination}" if rnd.random() < 0.1
+                        else rnd.choice(NOTES) if rnd.random() < 0.25 else None
+                    ),
+                })
+                if rnd.random() < 0.6:
+                    for sid in rnd.sample(range(1, len(SUPPLIES) + 1), rnd.randint(1, 3)):
+                        supply_id += 1
+                        supplies.append({
+                            "id": supply_id,
+                            "flight_id": flight_id,
+                            "supply_id": sid,
+                            "quantity": round(rnd.uniform(0.5, 400 if SUPPLIES[sid - 1][1] == "litro" else 3), 2),
+                            "unit_cost": SUPPLIES[sid - 1][2],
+                            "viaticos": rnd.choice((0, 0, 0, 350, 800)),
+                        })
+            conn.execute(insert(FlightLog), flights)
+            if supplies:
+                conn.execute(insert(FlightSupply), supplies)
+        conn.exec_driver_sql("ANALYZE")
+    return {"aircraft": aircraft, "clients": clients, "flights": flight_id, "supplies": supply_id}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="Archivo SQLite a crear (no debe existir)")
+    parser.add_argument("--aircraft", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=80)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--per-day", type=float, default=0.8, help="Vuelos por aeronave por día")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.path.exists():
+        parser.error(f"{args.path} ya existe")
+    args.path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_app_engine(f"sqlite:///{args.path.as_posix()}")
+    init_db(engine)
+    counts = populate(engine, args.aircraft, args.clients, args.years, args.per_day, seed=args.seed)
+    engine.dispose()
+    print(", ".join(f"{k}: {v:,}" for k, v in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
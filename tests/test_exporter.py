@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import csv
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy.orm import Session
+
+from app.aggregates import CENT, supply_totals
+from app.db import create_app_engine
+from app.exporter import export_flights
+from app.repository import add_aircraft, add_client, add_flight, add_flight_supply, add_supply, init_db
+
+START, END = date(2024, 3, 1), date(2024, 3, 31)
+# (quantity, unit cost, viáticos) of the supply lines of one flight
+LINES = [("2.50", "33.33", "350.00"), ("3", "120.00", "0"), ("1", "0.55", "800.00")]
+
+
+def test_export_importe_matches_consumibles_report(tmp_path):
+    engine = create_app_engine(f"sqlite:///{tmp_path / 'bitacoras.db'}", "safe")
+    init_db(engine)
+    with Session(engine) as s:
+        aircraft = add_aircraft(s, "XA-TST")
+        client = add_client(s, "CLIENTE DE PRUEBA")
+        supply = add_supply(s, "ACEITE", "L", 0)
+        flight = add_flight(s, date(2024, 3, 15), aircraft.id, client.id, "PILOTO", None, "MTY", "MEX", 60, 1)
+        for qty, cost, viaticos in LINES:
+            add_flight_supply(s, flight.id, supply.id, Decimal(qty), Decimal(cost), Decimal(viaticos))
+        s.commit()
+
+    path = tmp_path / "vuelos.csv"
+    export_flights(path, START, END, columns=["fecha", "insumo", "importe"], bind=engine)
+    with path.open(encoding="utf-8-sig", newline="") as fh:
+        exported = [Decimal(row["Importe"]) for row in csv.DictReader(fh)]
+
+    # IMPORTE column of the consumibles PDF: line subtotal rounded to the cent, plus viáticos
+    printed = [
+        (Decimal(qty) * Decimal(cost)).quantize(CENT, rounding=ROUND_HALF_UP) + Decimal(viaticos)
+        for qty, cost, viaticos in LINES
+    ]
+    assert exported == printed
+    with Session(engine) as s:
+        assert sum(exported) == supply_totals(s, START, END).importe
+    engine.dispose()